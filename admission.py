@@ -0,0 +1,151 @@
+"""Admission control for tool calls.
+
+Each tool category (read, write, dev) gets its own concurrency limit and a
+bounded wait queue. When the queue is full, or a call waits longer than
+ADMISSION_QUEUE_TIMEOUT, the call is rejected immediately with a
+retry-after hint instead of piling up on the connection pool.
+"""
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List
+
+from config import MCPConfig
+from tool_registry import READ, WRITE, DEV, tool_category
+
+# Cheap probes that must keep answering while the server is saturated
+UNLIMITED_TOOLS = {
+    "health_check", "get_environment_info", "get_diagnostics",
+    "get_job", "list_jobs", "cancel_job",
+}
+
+
+class Overloaded(Exception):
+    """A tool call was shed because its category is saturated."""
+
+    def __init__(self, tool: str, category: str, reason: str, retry_after: float):
+        super().__init__(f"{category} tools saturated ({reason})")
+        self.tool = tool
+        self.category = category
+        self.reason = reason
+        self.retry_after = retry_after
+
+    def response(self) -> Dict[str, Any]:
+        return {
+            "success": False,
+            "overloaded": True,
+            "retry_after": self.retry_after,
+            "error": str(self),
+            "message": f"Server busy, retry {self.tool} in {self.retry_after}s"
+        }
+
+
+class CategoryLimiter:
+    """Concurrency limit plus bounded wait queue for one tool category."""
+
+    def __init__(self, category: str, limit: int):
+        self.category = category
+        self.limit = limit
+        self.semaphore = asyncio.Semaphore(limit)
+        self.active = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.rejected: Dict[str, int] = {"queue_full": 0, "queue_timeout": 0}
+        # Exponential moving average of how long a call holds its slot
+        self.avg_hold_seconds = 0.0
+
+    def retry_after(self) -> float:
+        """Rough time until a slot frees up for a newly queued call."""
+        estimate = self.avg_hold_seconds * (self.waiting + 1) / self.limit
+        return round(max(estimate, 1.0), 1)
+
+    def _reject(self, tool: str, reason: str) -> Overloaded:
+        self.rejected[reason] += 1
+        return Overloaded(tool, self.category, reason, self.retry_after())
+
+    @asynccontextmanager
+    async def slot(self, tool: str) -> AsyncIterator[None]:
+        if self.semaphore.locked() and self.waiting >= MCPConfig.ADMISSION_QUEUE_SIZE:
+            raise self._reject(tool, "queue_full")
+
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(
+                self.semaphore.acquire(), timeout=MCPConfig.ADMISSION_QUEUE_TIMEOUT
+            )
+        except asyncio.TimeoutError:
+            raise self._reject(tool, "queue_timeout") from None
+        finally:
+            self.waiting -= 1
+
+        self.active += 1
+        self.admitted += 1
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            held = time.perf_counter() - started
+            self.avg_hold_seconds = 0.8 * self.avg_hold_seconds + 0.2 * held
+            self.active -= 1
+            self.semaphore.release()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "limit": self.limit,
+            "active": self.active,
+            "queue_depth": self.waiting,
+            "admitted": self.admitted,
+            "rejected": dict(self.rejected),
+        }
+
+
+limiters: Dict[str, CategoryLimiter] = {
+    READ: CategoryLimiter(READ, MCPConfig.ADMISSION_READ_LIMIT),
+    WRITE: CategoryLimiter(WRITE, MCPConfig.ADMISSION_WRITE_LIMIT),
+    DEV: CategoryLimiter(DEV, MCPConfig.ADMISSION_DEV_LIMIT),
+}
+
+
+@asynccontextmanager
+async def admit(tool: str) -> AsyncIterator[None]:
+    """Hold a concurrency slot for a tool call, or raise Overloaded."""
+    if not MCPConfig.ADMISSION_CONTROL or tool in UNLIMITED_TOOLS:
+        yield
+        return
+
+    async with limiters[tool_category(tool)].slot(tool):
+        yield
+
+
+def get_admission_stats() -> Dict[str, Any]:
+    """Report per-category concurrency, queue depth and rejections."""
+    return {
+        "enabled": MCPConfig.ADMISSION_CONTROL,
+        "queue_size": MCPConfig.ADMISSION_QUEUE_SIZE,
+        "queue_timeout": MCPConfig.ADMISSION_QUEUE_TIMEOUT,
+        "categories": {category: limiter.snapshot() for category, limiter in limiters.items()},
+    }
+
+
+def render_metrics() -> List[str]:
+    """Admission gauges and counters in the Prometheus text format."""
+    lines = [
+        "# HELP mcp_admission_active Tool calls holding a concurrency slot",
+        "# TYPE mcp_admission_active gauge",
+    ]
+    lines += [f'mcp_admission_active{{category="{c}"}} {l.active}' for c, l in limiters.items()]
+    lines += [
+        "# HELP mcp_admission_queue_depth Tool calls waiting for a slot",
+        "# TYPE mcp_admission_queue_depth gauge",
+    ]
+    lines += [f'mcp_admission_queue_depth{{category="{c}"}} {l.waiting}' for c, l in limiters.items()]
+    lines += [
+        "# HELP mcp_admission_rejected_total Tool calls shed by admission control",
+        "# TYPE mcp_admission_rejected_total counter",
+    ]
+    for category, limiter in limiters.items():
+        lines += [
+            f'mcp_admission_rejected_total{{category="{category}",reason="{reason}"}} {count}'
+            for reason, count in limiter.rejected.items()
+        ]
+    return lines
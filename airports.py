@@ -0,0 +1,213 @@
+"""In-memory airport reference index with precomputed great-circle distances.
+
+The airport dataset (AIRPORTS_FILE, a CSV of iata, name, city, country,
+latitude, longitude) is loaded once at startup into parallel NumPy arrays
+indexed by position, with a dict from IATA code to position. The full
+great-circle distance matrix is computed in one vectorized haversine pass,
+so a route distance is an array lookup and distances for many claims are a
+single fancy-indexing operation - no per-call DB or network lookup.
+
+Distance bands follow EU261: up to 1500 km, up to 3500 km (and every longer
+flight within the EU261 area), and beyond.
+"""
+import csv
+import logging
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from config import MCPConfig
+
+logger = logging.getLogger(__name__)
+
+EARTH_RADIUS_KM = 6371.0088
+
+# EU member states, and the countries where EU261 applies (EU plus EEA and Switzerland)
+EU_COUNTRIES = frozenset({
+    "AT", "BE", "BG", "HR", "CY", "CZ", "DK", "EE", "FI", "FR", "DE", "GR", "HU", "IE",
+    "IT", "LV", "LT", "LU", "MT", "NL", "PL", "PT", "RO", "SK", "SI", "ES", "SE",
+})
+EU261_COUNTRIES = EU_COUNTRIES | {"IS", "LI", "NO", "CH"}
+
+# (upper bound in km, band name, EU261 amount in EUR)
+DISTANCE_BANDS = (
+    (1500.0, "short", 250.0),
+    (3500.0, "medium", 400.0),
+    (float("inf"), "long", 600.0),
+)
+_BAND_LIMITS = np.array([limit for limit, _, _ in DISTANCE_BANDS[:-1]])
+_BAND_NAMES = np.array([name for _, name, _ in DISTANCE_BANDS])
+_BAND_AMOUNTS = np.array([amount for _, _, amount in DISTANCE_BANDS])
+
+
+def _haversine_matrix(lat: np.ndarray, lon: np.ndarray) -> np.ndarray:
+    """Pairwise great-circle distances in km for coordinates in radians."""
+    dlat = lat[:, None] - lat[None, :]
+    dlon = lon[:, None] - lon[None, :]
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat)[:, None] * np.cos(lat)[None, :] * np.sin(dlon / 2) ** 2
+    return (2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))).astype(np.float32)
+
+
+class AirportIndex:
+    """IATA code -> position index over column arrays and a distance matrix."""
+
+    def __init__(self):
+        self.positions: Dict[str, int] = {}
+        self.codes = np.empty(0, dtype="<U3")
+        self.names: List[str] = []
+        self.cities: List[str] = []
+        self.countries = np.empty(0, dtype="<U2")
+        self.latitudes = np.empty(0)
+        self.longitudes = np.empty(0)
+        self.eu = np.empty(0, dtype=bool)
+        self.eu261 = np.empty(0, dtype=bool)
+        self.distances = np.empty((0, 0), dtype=np.float32)
+        self.source: Optional[str] = None
+        self.load_ms: Optional[float] = None
+
+    @property
+    def loaded(self) -> bool:
+        return self.source is not None
+
+    def load(self, path: Optional[str] = None) -> Dict[str, Any]:
+        """(Re)load the dataset and rebuild the distance matrix."""
+        path = path or MCPConfig.AIRPORTS_FILE
+        started = time.perf_counter()
+        with open(path, encoding="utf-8") as f:
+            records = [
+                row for row in csv.DictReader(f)
+                if len((row.get("iata") or "").strip()) == 3
+            ]
+
+        codes = [row["iata"].strip().upper() for row in records]
+        countries = [row["country"].strip().upper() for row in records]
+        latitudes = np.radians(np.array([float(row["latitude"]) for row in records]))
+        longitudes = np.radians(np.array([float(row["longitude"]) for row in records]))
+
+        self.positions = {code: position for position, code in enumerate(codes)}
+        self.codes = np.array(codes, dtype="<U3")
+        self.names = [row["name"] for row in records]
+        self.cities = [row["city"] for row in records]
+        self.countries = np.array(countries, dtype="<U2")
+        self.latitudes = latitudes
+        self.longitudes = longitudes
+        self.eu = np.isin(self.countries, list(EU_COUNTRIES))
+        self.eu261 = np.isin(self.countries, list(EU261_COUNTRIES))
+        self.distances = _haversine_matrix(latitudes, longitudes)
+        self.source = path
+        self.load_ms = round((time.perf_counter() - started) * 1000, 2)
+
+        logger.info("Loaded %d airports from %s (%s ms)", len(codes), path, self.load_ms)
+        return self.snapshot()
+
+    def ensure_loaded(self) -> "AirportIndex":
+        """Load on first use when the server lifespan did not (scripts, tests)."""
+        if not self.loaded:
+            self.load()
+        return self
+
+    def get(self, code: str) -> Optional[Dict[str, Any]]:
+        position = self.positions.get((code or "").strip().upper())
+        if position is None:
+            return None
+        return {
+            "iata": str(self.codes[position]),
+            "name": self.names[position],
+            "city": self.cities[position],
+            "country": str(self.countries[position]),
+            "latitude": round(float(np.degrees(self.latitudes[position])), 4),
+            "longitude": round(float(np.degrees(self.longitudes[position])), 4),
+            "eu": bool(self.eu[position]),
+            "eu261": bool(self.eu261[position]),
+        }
+
+    def lookup(self, codes: Iterable[str]) -> np.ndarray:
+        """Positions of many IATA codes (-1 for unknown codes)."""
+        get = self.positions.get
+        return np.fromiter(
+            (get((code or "").strip().upper(), -1) for code in codes), dtype=np.int64
+        )
+
+    def route_distances(self, departures: Iterable[str], arrivals: Iterable[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """Distances in km (NaN if an airport is unknown) and whether each
+        route lies entirely within the EU261 area."""
+        origin = self.lookup(departures)
+        destination = self.lookup(arrivals)
+        known = (origin >= 0) & (destination >= 0)
+        distances = np.full(origin.shape, np.nan)
+        distances[known] = self.distances[origin[known], destination[known]]
+        within = np.zeros(origin.shape, dtype=bool)
+        within[known] = self.eu261[origin[known]] & self.eu261[destination[known]]
+        return distances, within
+
+    def distance_km(self, departure: str, arrival: str) -> Optional[float]:
+        distances, _ = self.route_distances([departure], [arrival])
+        return None if np.isnan(distances[0]) else round(float(distances[0]), 1)
+
+    def eu261_codes(self) -> List[str]:
+        """IATA codes of airports where EU261 applies to departing flights."""
+        return self.codes[self.eu261].tolist()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "airports": len(self.positions),
+            "eu261_airports": int(self.eu261.sum()),
+            "source": self.source,
+            "load_ms": self.load_ms,
+            "matrix_bytes": int(self.distances.nbytes),
+        }
+
+
+def distance_bands(distances: np.ndarray, within_eu261: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """EU261 band names and amounts for arrays of route distances.
+
+    Flights longer than 3500 km within the EU261 area stay in the middle
+    band. Unknown distances (NaN) get band "unknown" and amount NaN.
+    """
+    band = np.searchsorted(_BAND_LIMITS, distances, side="left")
+    band = np.where(within_eu261, np.minimum(band, 1), band)
+    unknown = np.isnan(distances)
+    band = np.where(unknown, 0, band)
+    names = np.where(unknown, "unknown", _BAND_NAMES[band])
+    amounts = np.where(unknown, np.nan, _BAND_AMOUNTS[band])
+    return names, amounts
+
+
+def route_band(departure: str, arrival: str) -> Optional[Dict[str, Any]]:
+    """Distance and EU261 band of one route, or None if an airport is unknown."""
+    index = airport_index.ensure_loaded()
+    distances, within = index.route_distances([departure], [arrival])
+    if np.isnan(distances[0]):
+        return None
+    names, amounts = distance_bands(distances, within)
+    return {
+        "distance_km": round(float(distances[0]), 1),
+        "distance_band": str(names[0]),
+        "within_eu261": bool(within[0]),
+        "band_amount": float(amounts[0]),
+    }
+
+
+def validate_route(departure: str, arrival: str) -> Tuple[List[str], List[str]]:
+    """Check a claim route: (errors, unknown airport codes).
+
+    Errors are malformed codes or identical airports; codes missing from
+    the reference data are returned separately so the caller can decide
+    (see AIRPORT_VALIDATION).
+    """
+    index = airport_index.ensure_loaded()
+    errors = []
+    unknown = []
+    for label, code in (("departure_airport", departure), ("arrival_airport", arrival)):
+        code = (code or "").strip().upper()
+        if len(code) != 3 or not code.isalpha():
+            errors.append(f"{label} must be a 3-letter IATA code")
+        elif code not in index.positions:
+            unknown.append(code)
+    if not errors and departure.strip().upper() == arrival.strip().upper():
+        errors.append("departure_airport and arrival_airport must differ")
+    return errors, unknown
+
+
+airport_index = AirportIndex()
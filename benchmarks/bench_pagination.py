@@ -0,0 +1,113 @@
+"""Benchmark OFFSET vs keyset (cursor) pagination on a large table.
+
+Creates a scratch table shaped like claims (uuid id, submitted_at, status)
+with an index on (submitted_at, id), seeds it with generate_series, then
+times fetching page N both ways using the same query builder as the list
+tools (tools.pagination.keyset_query). OFFSET latency grows with N; keyset
+latency stays flat.
+
+Usage:
+    python benchmarks/bench_pagination.py [rows] [page_size] [--keep]
+
+Uses DATABASE_URL. The scratch table is dropped afterwards unless --keep.
+"""
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import Column, DateTime, MetaData, String, Table, select, text  # noqa: E402
+from sqlalchemy.dialects.postgresql import UUID  # noqa: E402
+from sqlalchemy.ext.asyncio import create_async_engine  # noqa: E402
+
+from config import MCPConfig  # noqa: E402
+from tools.pagination import encode_cursor, keyset_query  # noqa: E402
+
+TABLE = "bench_keyset_claims"
+
+metadata = MetaData()
+claims = Table(
+    TABLE, metadata,
+    Column("id", UUID(as_uuid=True), primary_key=True),
+    Column("submitted_at", DateTime(timezone=True)),
+    Column("status", String(20)),
+)
+
+PAGES = (1, 10, 100, 1000, 10000)
+REPEATS = 5
+
+
+async def seed(conn, rows: int):
+    await conn.execute(text(f"DROP TABLE IF EXISTS {TABLE}"))
+    await conn.run_sync(metadata.create_all)
+    await conn.execute(text(f"""
+        INSERT INTO {TABLE} (id, submitted_at, status)
+        SELECT gen_random_uuid(),
+               now() - (g * interval '1 second') - (random() * interval '1 second'),
+               (ARRAY['submitted','under_review','approved','rejected','paid'])[1 + g % 5]
+        FROM generate_series(1, :rows) AS g
+    """), {"rows": rows})
+    await conn.execute(text(f"CREATE INDEX ON {TABLE} (submitted_at, id)"))
+    await conn.execute(text(f"ANALYZE {TABLE}"))
+
+
+async def best_ms(conn, query) -> float:
+    best = float("inf")
+    for _ in range(REPEATS):
+        started = time.perf_counter()
+        (await conn.execute(query)).all()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+async def main():
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    rows = int(args[0]) if args else 1_000_000
+    page_size = int(args[1]) if len(args) > 1 else 50
+    keep = "--keep" in sys.argv
+
+    engine = create_async_engine(MCPConfig.DATABASE_URL)
+    try:
+        async with engine.begin() as conn:
+            started = time.perf_counter()
+            await seed(conn, rows)
+            print(f"Seeded {rows} rows in {time.perf_counter() - started:.1f}s")
+
+        async with engine.connect() as conn:
+            print(f"page_size={page_size}, best of {REPEATS}")
+            print(f"{'page':>8}{'offset ms':>14}{'keyset ms':>14}")
+            for page in PAGES:
+                offset = (page - 1) * page_size
+                if offset >= rows:
+                    break
+
+                offset_query = keyset_query(
+                    select(claims), TABLE, claims.c.submitted_at, claims.c.id, page_size, offset
+                )
+
+                # Cursor of the row just before the page, as the previous page would return it
+                cursor = None
+                if offset:
+                    before = (await conn.execute(
+                        select(claims.c.submitted_at, claims.c.id)
+                        .order_by(claims.c.submitted_at.desc(), claims.c.id.desc())
+                        .offset(offset - 1).limit(1)
+                    )).one()
+                    cursor = encode_cursor(TABLE, before.submitted_at, before.id)
+                keyset = keyset_query(
+                    select(claims), TABLE, claims.c.submitted_at, claims.c.id, page_size,
+                    cursor=cursor
+                )
+
+                print(f"{page:>8}{await best_ms(conn, offset_query):>14.2f}{await best_ms(conn, keyset):>14.2f}")
+    finally:
+        if not keep:
+            async with engine.begin() as conn:
+                await conn.execute(text(f"DROP TABLE IF EXISTS {TABLE}"))
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
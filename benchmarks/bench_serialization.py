@@ -0,0 +1,93 @@
+"""Benchmark tool result encoding: formatted strings + json vs raw values + orjson.
+
+Builds a list_claims-shaped payload and compares the old path (tools call
+isoformat()/str()/float() per field, result encoded with the stdlib
+encoder, indented as FastMCP's text content was) with the new path (raw
+values encoded by serialization.dumps), plus gzip/zstd compressed sizes.
+
+Usage:
+    python benchmarks/bench_serialization.py [rows] [repeats]
+"""
+import gzip
+import json
+import os
+import sys
+import time
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from compression import zstandard  # noqa: E402
+from serialization import dumps  # noqa: E402
+
+
+def make_rows(count):
+    now = datetime.now(timezone.utc)
+    return [
+        {
+            "id": uuid.uuid4(),
+            "customer_id": uuid.uuid4(),
+            "flight_number": f"LH{100 + i % 900}",
+            "flight_date": date.today() - timedelta(days=i % 90),
+            "status": "submitted",
+            "compensation_amount": Decimal("250.00") if i % 3 else None,
+            "submitted_at": now - timedelta(minutes=i),
+        }
+        for i in range(count)
+    ]
+
+
+def format_rows(rows):
+    """What the tools did before: stringify every field in Python."""
+    return [
+        {
+            "id": str(r["id"]),
+            "customer_id": str(r["customer_id"]),
+            "flight_number": r["flight_number"],
+            "flight_date": r["flight_date"].isoformat() if r["flight_date"] else None,
+            "status": r["status"],
+            "compensation_amount": float(r["compensation_amount"]) if r["compensation_amount"] else None,
+            "submitted_at": r["submitted_at"].isoformat() if r["submitted_at"] else None,
+        }
+        for r in rows
+    ]
+
+
+def timed(fn, repeats):
+    best = float("inf")
+    for _ in range(repeats):
+        started = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - started)
+    return out, best * 1000
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    rows = make_rows(count)
+
+    before, before_ms = timed(
+        lambda: json.dumps({"success": True, "claims": format_rows(rows)}, indent=2).encode(),
+        repeats
+    )
+    after, after_ms = timed(lambda: dumps({"success": True, "claims": rows}), repeats)
+
+    print(f"rows={count} repeats={repeats} (best of)")
+    print(f"{'path':<28}{'bytes':>12}{'encode ms':>12}")
+    print(f"{'before (str + json, indent)':<28}{len(before):>12}{before_ms:>12.2f}")
+    print(f"{'after (raw + orjson)':<28}{len(after):>12}{after_ms:>12.2f}")
+
+    for label, body in (("before", before), ("after", after)):
+        gz, gz_ms = timed(lambda: gzip.compress(body, compresslevel=6), repeats)
+        print(f"{label + ' + gzip':<28}{len(gz):>12}{gz_ms:>12.2f}")
+        if zstandard is not None:
+            compressor = zstandard.ZstdCompressor(level=3)
+            zs, zs_ms = timed(lambda: compressor.compress(body), repeats)
+            print(f"{label + ' + zstd':<28}{len(zs):>12}{zs_ms:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+"""Read-through result cache for single-entity get_* tools.
+
+Successful results are kept per (entity, id) with a TTL, evicted least
+recently used first once RESULT_CACHE_MAX_ENTRIES or RESULT_CACHE_MAX_BYTES
+(JSON-encoded size) is exceeded. Write tools invalidate the entries they
+touch. The cache lives in process memory, so with MCP_WORKERS > 1 each
+worker has its own copy and a write only invalidates the worker that ran it
+(entries still expire after RESULT_CACHE_TTL).
+"""
+import functools
+import inspect
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from config import MCPConfig
+from serialization import dumps
+
+# Entities with a cached get_* tool
+CLAIM = "claim"
+CUSTOMER = "customer"
+USER = "user"
+FILE = "file"
+
+
+class _Entry(NamedTuple):
+    expires_at: float
+    size: int
+    value: Dict[str, Any]
+
+
+def _key(entity: str, entity_id: Any) -> Tuple[str, str]:
+    return entity, str(entity_id).strip().lower()
+
+
+class ResultCache:
+    """TTL + LRU cache of tool results keyed by entity and ID."""
+
+    def __init__(self, ttl: float, max_entries: int, max_bytes: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries: "OrderedDict[Tuple[str, str], _Entry]" = OrderedDict()
+        self.bytes = 0
+        # Bumped on every invalidation; a load that overlaps one is not stored
+        self.generation = 0
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def _remove(self, key: Tuple[str, str]):
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            self.bytes -= entry.size
+
+    def get(self, entity: str, entity_id: Any) -> Optional[Dict[str, Any]]:
+        key = _key(entity, entity_id)
+        entry = self.entries.get(key)
+        if entry is not None and entry.expires_at <= time.monotonic():
+            self._remove(key)
+            self.expirations += 1
+            entry = None
+        if entry is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry.value
+
+    def put(self, entity: str, entity_id: Any, value: Dict[str, Any], generation: int):
+        """Store a result loaded while the cache was at `generation`."""
+        if generation != self.generation:
+            return
+        size = len(dumps(value))
+        if size > self.max_bytes:
+            return
+
+        key = _key(entity, entity_id)
+        self._remove(key)
+        self.entries[key] = _Entry(time.monotonic() + self.ttl, size, value)
+        self.bytes += size
+        while len(self.entries) > self.max_entries or self.bytes > self.max_bytes:
+            self._remove(next(iter(self.entries)))
+            self.evictions += 1
+
+    def invalidate(self, entity: str, entity_id: Any):
+        """Drop one cached entity."""
+        self.generation += 1
+        self.invalidations += 1
+        self._remove(_key(entity, entity_id))
+
+    def invalidate_entity(self, entity: str):
+        """Drop every cached result of one entity type."""
+        self.generation += 1
+        self.invalidations += 1
+        for key in [key for key in self.entries if key[0] == entity]:
+            self._remove(key)
+
+    def clear(self):
+        """Drop everything (e.g. after reset_database)."""
+        self.generation += 1
+        self.invalidations += 1
+        self.entries.clear()
+        self.bytes = 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": MCPConfig.RESULT_CACHE,
+            "ttl_seconds": self.ttl,
+            "entries": len(self.entries),
+            "max_entries": self.max_entries,
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
+
+
+result_cache = ResultCache(
+    ttl=MCPConfig.RESULT_CACHE_TTL,
+    max_entries=MCPConfig.RESULT_CACHE_MAX_ENTRIES,
+    max_bytes=MCPConfig.RESULT_CACHE_MAX_BYTES,
+)
+
+
+def cached(entity: str, id_arg: str) -> Callable:
+    """Serve a get_* tool from the result cache.
+
+    Only successful results are cached. Calls with use_primary=True bypass
+    the cache, since the caller explicitly asked for a fresh read.
+    """
+    def decorator(fn: Callable) -> Callable:
+        signature = inspect.signature(fn)
+
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs) -> Dict[str, Any]:
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            if not MCPConfig.RESULT_CACHE or bound.arguments.get("use_primary"):
+                return await fn(*args, **kwargs)
+
+            entity_id = bound.arguments[id_arg]
+            result = result_cache.get(entity, entity_id)
+            if result is not None:
+                return result
+
+            generation = result_cache.generation
+            result = await fn(*args, **kwargs)
+            if result.get("success"):
+                result_cache.put(entity, entity_id, result, generation)
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+def render_metrics() -> List[str]:
+    """Result cache counters in the Prometheus text format."""
+    stats = result_cache.snapshot()
+    lines = [
+        "# HELP mcp_result_cache_events_total Result cache lookups, evictions and invalidations",
+        "# TYPE mcp_result_cache_events_total counter",
+    ]
+    lines += [
+        f'mcp_result_cache_events_total{{event="{event}"}} {stats[event]}'
+        for event in ("hits", "misses", "evictions", "expirations", "invalidations")
+    ]
+    lines += [
+        "# HELP mcp_result_cache_size Result cache entries and encoded bytes",
+        "# TYPE mcp_result_cache_size gauge",
+        f'mcp_result_cache_size{{unit="entries"}} {stats["entries"]}',
+        f'mcp_result_cache_size{{unit="bytes"}} {stats["bytes"]}',
+    ]
+    return lines
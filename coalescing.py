@@ -0,0 +1,113 @@
+"""Single-flight coalescing of identical concurrent read tool calls.
+
+While a read tool call is running, further calls with the same tool name
+and arguments wait for its result instead of executing again. The shared
+execution runs in its own task: a caller that disconnects stops waiting,
+and the execution is cancelled only once every caller has gone.
+"""
+import asyncio
+import inspect
+from collections import defaultdict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import orjson
+
+from config import MCPConfig
+from tool_registry import READ, tool_category
+
+# Read tools with side effects (get_diagnostics can reset statistics)
+NOT_COALESCED = {"get_diagnostics"}
+
+
+class _Flight:
+    """One shared in-flight execution and the number of callers awaiting it."""
+
+    def __init__(self, task: "asyncio.Task"):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Registry of in-flight read calls keyed by tool name and arguments."""
+
+    def __init__(self):
+        self.flights: Dict[Tuple[str, bytes], _Flight] = {}
+        self.executions: Dict[str, int] = defaultdict(int)
+        self.coalesced: Dict[str, int] = defaultdict(int)
+
+    def key(self, name: str, fn: Callable, args, kwargs) -> Optional[Tuple[str, bytes]]:
+        """Coalescing key for a call, or None if the call must run on its own."""
+        if (
+            not MCPConfig.COALESCE_READS
+            or name in NOT_COALESCED
+            or tool_category(name) != READ
+        ):
+            return None
+        bound = inspect.signature(fn).bind(*args, **kwargs)
+        bound.apply_defaults()
+        arguments = orjson.dumps(bound.arguments, default=str, option=orjson.OPT_SORT_KEYS)
+        return name, arguments
+
+    async def join(
+        self,
+        key: Tuple[str, bytes],
+        execute: Callable[[], Awaitable[Dict[str, Any]]]
+    ) -> Dict[str, Any]:
+        """Await the in-flight execution for `key`, starting one if needed."""
+        name = key[0]
+        flight = self.flights.get(key)
+        if flight is None:
+            flight = _Flight(asyncio.ensure_future(execute()))
+            self.flights[key] = flight
+            flight.task.add_done_callback(lambda _: self._finish(key, flight))
+            self.executions[name] += 1
+        else:
+            self.coalesced[name] += 1
+
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        except asyncio.CancelledError:
+            if flight.waiters == 1:
+                flight.task.cancel()
+            raise
+        finally:
+            flight.waiters -= 1
+
+    def _finish(self, key: Tuple[str, bytes], flight: _Flight):
+        if self.flights.get(key) is flight:
+            del self.flights[key]
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "enabled": MCPConfig.COALESCE_READS,
+            "in_flight": len(self.flights),
+            "tools": {
+                name: {
+                    "executions": self.executions[name],
+                    "coalesced": self.coalesced.get(name, 0),
+                }
+                for name in sorted(self.executions)
+            },
+        }
+
+
+single_flight = SingleFlight()
+
+
+def get_coalescing_stats() -> Dict[str, Any]:
+    """Report shared executions and coalesced calls per read tool."""
+    return single_flight.snapshot()
+
+
+def render_metrics() -> List[str]:
+    """Coalescing counters in the Prometheus text format."""
+    lines = [
+        "# HELP mcp_tool_coalesced_total Read tool calls served by an identical in-flight call",
+        "# TYPE mcp_tool_coalesced_total counter",
+    ]
+    lines += [
+        f'mcp_tool_coalesced_total{{tool="{tool}"}} {count}'
+        for tool, count in sorted(single_flight.coalesced.items())
+    ]
+    return lines
@@ -0,0 +1,186 @@
+"""Shared compensation calculation with an LRU cache of results.
+
+create_claim and import_claims used to build a new CompensationService per
+call. They now share one instance, and its results are cached per
+(departure, arrival, incident type, delay bucket): EU261 amounts depend on
+the route distance band and delay thresholds only, so claims on the same
+route with similar delays get the same amount without recomputing it.
+
+Delays are rounded down to COMPENSATION_DELAY_BUCKET_MINUTES and the bucket
+start is what the service sees, so every delay in a bucket gets exactly the
+same amount. Keep the bucket a divisor of the thresholds (the 15 minute
+default divides 2, 3 and 4 hours); 1 disables bucketing. Failed
+calculations are not cached.
+
+calculate_many does the same for whole arrays of claims (bulk
+recalculation), calling the service once per distinct key.
+"""
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from config import MCPConfig
+
+
+class CompensationCalculator:
+    """One CompensationService instance behind an LRU result cache."""
+
+    def __init__(self, max_entries: int, bucket_minutes: int):
+        self.max_entries = max_entries
+        self.bucket_minutes = max(1, bucket_minutes)
+        self.entries: "OrderedDict[Tuple[str, str, str, int], Any]" = OrderedDict()
+        self._service = None
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self.evictions = 0
+
+    @property
+    def service(self):
+        if self._service is None:
+            from app.services.compensation_service import CompensationService
+
+            self._service = CompensationService()
+        return self._service
+
+    def bucket(self, delay_minutes: int) -> int:
+        """Start of the delay bucket a delay falls into."""
+        return delay_minutes - delay_minutes % self.bucket_minutes
+
+    async def calculate(
+        self,
+        departure_iata: str,
+        arrival_iata: str,
+        delay_minutes: int,
+        incident_type: str
+    ) -> Any:
+        """Compensation amount for a claim (raises if the service fails)."""
+        delay = self.bucket(delay_minutes)
+        key = (departure_iata.upper(), arrival_iata.upper(), incident_type, delay)
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return self.entries[key]
+
+        self.misses += 1
+        try:
+            amount = await self.service.calculate_compensation(
+                departure_iata=key[0],
+                arrival_iata=key[1],
+                delay_minutes=delay,
+                incident_type=incident_type
+            )
+        except Exception:
+            self.errors += 1
+            raise
+
+        self.entries[key] = amount
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+        return amount
+
+    def clear(self):
+        """Drop cached amounts (e.g. after the compensation rules changed)."""
+        self.entries.clear()
+
+    def snapshot(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self.entries),
+            "max_entries": self.max_entries,
+            "delay_bucket_minutes": self.bucket_minutes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+            "errors": self.errors,
+            "evictions": self.evictions,
+        }
+
+
+compensation_calculator = CompensationCalculator(
+    max_entries=MCPConfig.COMPENSATION_CACHE_MAX_ENTRIES,
+    bucket_minutes=MCPConfig.COMPENSATION_DELAY_BUCKET_MINUTES,
+)
+
+
+async def calculate_many(
+    departures: Sequence[Optional[str]],
+    arrivals: Sequence[Optional[str]],
+    delay_minutes: np.ndarray,
+    incident_types: Sequence[Optional[str]]
+) -> Tuple[np.ndarray, np.ndarray, int]:
+    """Compensation for arrays of claims, by the same rules as create_claim.
+
+    The claims are grouped by (departure, arrival, delay bucket, incident
+    type) with np.unique and each distinct key goes through the calculator
+    once, so bulk results are exactly what CompensationService returns for a
+    single claim. As in create_claim and import_claims, claims without a
+    delay or an airport get no amount. delay_minutes may contain NaN.
+
+    Returns:
+        Amounts (NaN where there is none), a mask of claims whose
+        calculation failed, and the number of distinct keys calculated
+    """
+    delays = np.nan_to_num(np.asarray(delay_minutes, dtype=float), nan=0.0).astype(np.int64)
+    buckets = delays - delays % compensation_calculator.bucket_minutes
+    amounts = np.full(len(delays), np.nan)
+    failed = np.zeros(len(delays), dtype=bool)
+
+    eligible = np.flatnonzero(
+        (delays > 0)
+        & np.array([bool(code) for code in departures], dtype=bool)
+        & np.array([bool(code) for code in arrivals], dtype=bool)
+    )
+    if not len(eligible):
+        return amounts, failed, 0
+
+    keys = np.array([
+        (departures[i].upper(), arrivals[i].upper(), str(incident_types[i]), str(buckets[i]))
+        for i in eligible
+    ])
+    _, first, inverse = np.unique(keys, axis=0, return_index=True, return_inverse=True)
+    inverse = inverse.reshape(-1)
+
+    key_amounts = np.full(len(first), np.nan)
+    key_failed = np.zeros(len(first), dtype=bool)
+    for number, position in enumerate(eligible[first]):
+        try:
+            amount = await compensation_calculator.calculate(
+                departure_iata=departures[position],
+                arrival_iata=arrivals[position],
+                delay_minutes=int(buckets[position]),
+                incident_type=incident_types[position]
+            )
+        except Exception:
+            key_failed[number] = True
+            continue
+        if amount is not None:
+            key_amounts[number] = float(amount)
+
+    amounts[eligible] = key_amounts[inverse]
+    failed[eligible] = key_failed[inverse]
+    return amounts, failed, len(first)
+
+
+def render_metrics() -> List[str]:
+    """Compensation cache counters in the Prometheus text format."""
+    stats = compensation_calculator.snapshot()
+    lines = [
+        "# HELP mcp_compensation_cache_events_total Compensation cache lookups, errors and evictions",
+        "# TYPE mcp_compensation_cache_events_total counter",
+    ]
+    lines += [
+        f'mcp_compensation_cache_events_total{{event="{event}"}} {stats[event]}'
+        for event in ("hits", "misses", "errors", "evictions")
+    ]
+    lines += [
+        "# HELP mcp_compensation_cache_entries Cached compensation amounts",
+        "# TYPE mcp_compensation_cache_entries gauge",
+        f"mcp_compensation_cache_entries {stats['entries']}",
+    ]
+    return lines
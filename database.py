@@ -1,25 +1,49 @@
 """Database connection and session management for MCP server."""
+import asyncio
+import logging
 import sys
-from contextlib import asynccontextmanager
-from typing import AsyncGenerator
+import time
+from collections import Counter
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from typing import AsyncGenerator, Dict, Any, Iterator, Optional
 
-from sqlalchemy import text
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
-from sqlalchemy.pool import NullPool
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import (
+    AsyncConnection, AsyncSession, create_async_engine, async_sessionmaker
+)
+from sqlalchemy.pool import NullPool, QueuePool
 
 from config import MCPConfig
+from tool_registry import READ, WRITE, DEV, tool_category
+
+logger = logging.getLogger(__name__)
+
+
+def _engine_options() -> Dict[str, Any]:
+    """Build engine keyword arguments from the configured pool mode."""
+    options: Dict[str, Any] = {
+        "echo": False,
+        "connect_args": {"timeout": MCPConfig.DB_CONNECT_TIMEOUT},
+    }
+
+    if MCPConfig.DB_POOL_MODE == "null":
+        # Fresh connection (connect + auth) for every session
+        options["poolclass"] = NullPool
+    else:
+        options.update(
+            pool_size=MCPConfig.DB_POOL_SIZE,
+            max_overflow=MCPConfig.DB_MAX_OVERFLOW,
+            pool_timeout=MCPConfig.DB_POOL_TIMEOUT,
+            pool_recycle=MCPConfig.DB_POOL_RECYCLE,
+            pool_pre_ping=MCPConfig.DB_POOL_PRE_PING,
+        )
+
+    return options
 
-# Import base models from main app
-from app.database import Base
-from app.models import Customer, Claim, ClaimFile, ClaimNote, ClaimStatusHistory
-from app.repositories import CustomerRepository, ClaimRepository
 
 # Create async engine for MCP server
-engine = create_async_engine(
-    MCPConfig.DATABASE_URL,
-    echo=False,
-    poolclass=NullPool,  # No connection pooling for MCP server
-)
+engine = create_async_engine(MCPConfig.DATABASE_URL, **_engine_options())
 
 # Create session factory
 async_session_maker = async_sessionmaker(
@@ -28,29 +52,507 @@ async_session_maker = async_sessionmaker(
     expire_on_commit=False,
 )
 
+# Optional read replica with its own engine and pool
+read_engine = (
+    create_async_engine(MCPConfig.DATABASE_READ_URL, **_engine_options())
+    if MCPConfig.DATABASE_READ_URL
+    else None
+)
+
+read_session_maker = (
+    async_sessionmaker(read_engine, class_=AsyncSession, expire_on_commit=False)
+    if read_engine is not None
+    else None
+)
+
+# Set by primary_reads() to pin reads in the current task to the primary
+_force_primary: ContextVar[bool] = ContextVar("force_primary", default=False)
+
+
+@contextmanager
+def primary_reads() -> Iterator[None]:
+    """Route read sessions opened inside this block to the primary."""
+    token = _force_primary.set(True)
+    try:
+        yield
+    finally:
+        _force_primary.reset(token)
+
+
+class ReplicaRouter:
+    """Decide whether a read session goes to the replica or the primary."""
+
+    def __init__(self):
+        self.down_until = 0.0
+        self.last_write_at = 0.0
+        self.last_error = None
+        self.routed = {"replica": 0, "primary": 0, "fallback": 0}
+
+    def use_replica(self, use_primary: bool = False) -> bool:
+        if read_session_maker is None or use_primary or _force_primary.get():
+            return False
+        now = time.monotonic()
+        if now < self.down_until:
+            return False
+        # Read-your-writes: the replica may not have replayed a recent commit yet
+        return now - self.last_write_at >= MCPConfig.READ_AFTER_WRITE_SECONDS
+
+    def note_write(self):
+        self.last_write_at = time.monotonic()
+
+    def mark_down(self, error: Exception):
+        self.down_until = time.monotonic() + MCPConfig.READ_REPLICA_RETRY_SECONDS
+        self.last_error = str(error)
+        logger.warning(
+            "Read replica unavailable, using primary for %ss: %s",
+            MCPConfig.READ_REPLICA_RETRY_SECONDS, error
+        )
+
+    def record(self, route: str):
+        self.routed[route] += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "available": time.monotonic() >= self.down_until,
+            "last_error": self.last_error,
+            "routed": dict(self.routed),
+        }
+
+
+replica_router = ReplicaRouter()
+
+
+class PoolWaitStats:
+    """Time spent waiting for a connection when a session starts."""
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.last_ms = 0.0
+
+    def record(self, elapsed_ms: float):
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.last_ms = elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "acquisitions": self.count,
+            "avg_ms": round(self.total_ms / self.count, 2) if self.count else 0.0,
+            "max_ms": round(self.max_ms, 2),
+            "last_ms": round(self.last_ms, 2),
+        }
+
+
+pool_wait_stats = PoolWaitStats()
+
+
+def _pool_snapshot(pool) -> Dict[str, Any]:
+    """Describe the live state of one engine pool."""
+    snapshot: Dict[str, Any] = {"pool_class": type(pool).__name__}
+
+    if isinstance(pool, QueuePool):
+        snapshot.update({
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "idle": pool.checkedin(),
+            # overflow() is negative until the pool is fully populated
+            "overflow": max(pool.overflow(), 0),
+            "max_overflow": MCPConfig.DB_MAX_OVERFLOW,
+        })
+
+    return snapshot
+
+
+def get_pool_status() -> Dict[str, Any]:
+    """Report live connection pool state for health checks."""
+    status: Dict[str, Any] = {"mode": MCPConfig.DB_POOL_MODE}
+    status.update(_pool_snapshot(engine.pool))
+    status["wait"] = pool_wait_stats.snapshot()
+
+    if read_engine is not None:
+        status["replica"] = {
+            **_pool_snapshot(read_engine.pool),
+            **replica_router.snapshot(),
+        }
+
+    return status
+
+
+class ReadSessionStats:
+    """Per-tool count of read-only sessions, i.e. commits avoided."""
+
+    def __init__(self):
+        self.by_tool: Dict[str, int] = {}
+
+    def record(self, tool: str):
+        self.by_tool[tool] = self.by_tool.get(tool, 0) + 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "commits_avoided": sum(self.by_tool.values()),
+            "by_tool": dict(sorted(self.by_tool.items())),
+        }
+
+
+read_session_stats = ReadSessionStats()
+
+
+def get_session_stats() -> Dict[str, Any]:
+    """Report read-only session usage for diagnostics."""
+    return {"read_only": read_session_stats.snapshot()}
+
+
+# Tool whose statements are being executed (set by the server dispatch layer)
+current_tool: ContextVar[Optional[str]] = ContextVar("current_tool", default=None)
+
+# Statements issued during the current tool call, for N+1 detection
+_call_statements: ContextVar[Optional[Counter]] = ContextVar("call_statements", default=None)
+
+
+class ToolQueryStats:
+    """SQL statement aggregates for one tool."""
+
+    def __init__(self):
+        self.calls = 0
+        self.statements = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.rows = 0
+        self.n_plus_one_calls = 0
+        # statement -> highest number of repeats seen within a single call
+        self.repeated: Dict[str, int] = {}
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "statements": self.statements,
+            "statements_per_call": round(self.statements / self.calls, 2) if self.calls else None,
+            "total_ms": round(self.total_ms, 2),
+            "avg_ms": round(self.total_ms / self.statements, 2) if self.statements else 0.0,
+            "max_ms": round(self.max_ms, 2),
+            "rows": self.rows,
+            "n_plus_one_calls": self.n_plus_one_calls,
+            "repeated_statements": [
+                {"statement": statement[:200], "max_repeats": repeats}
+                for statement, repeats in sorted(
+                    self.repeated.items(), key=lambda item: item[1], reverse=True
+                )
+            ],
+        }
+
+
+class QueryStats:
+    """Per-tool SQL statement statistics collected from engine events."""
+
+    def __init__(self):
+        self.by_tool: Dict[str, ToolQueryStats] = {}
+
+    def _tool(self, tool: str) -> ToolQueryStats:
+        if tool not in self.by_tool:
+            self.by_tool[tool] = ToolQueryStats()
+        return self.by_tool[tool]
+
+    def record_statement(self, tool: str, elapsed_ms: float, rows: int):
+        stats = self._tool(tool)
+        stats.statements += 1
+        stats.total_ms += elapsed_ms
+        stats.max_ms = max(stats.max_ms, elapsed_ms)
+        stats.rows += rows
+
+    def record_call(self, tool: str, statements: Counter):
+        stats = self._tool(tool)
+        stats.calls += 1
+        repeated = {
+            statement: count for statement, count in statements.items()
+            if count >= MCPConfig.N_PLUS_ONE_THRESHOLD
+        }
+        if repeated:
+            stats.n_plus_one_calls += 1
+            for statement, count in repeated.items():
+                stats.repeated[statement] = max(stats.repeated.get(statement, 0), count)
+            logger.warning(
+                "Possible N+1 in %s: %d statement(s) repeated >= %d times",
+                tool, len(repeated), MCPConfig.N_PLUS_ONE_THRESHOLD
+            )
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            tool: stats.snapshot()
+            for tool, stats in sorted(
+                self.by_tool.items(), key=lambda item: item[1].total_ms, reverse=True
+            )
+        }
+
+    def reset(self):
+        self.by_tool.clear()
+
+
+query_stats = QueryStats()
+
+
+@contextmanager
+def track_tool_queries(tool: str) -> Iterator[None]:
+    """Attribute statements executed inside this block to an MCP tool."""
+    statements: Counter = Counter()
+    tool_token = current_tool.set(tool)
+    statements_token = _call_statements.set(statements)
+    try:
+        yield
+    finally:
+        _call_statements.reset(statements_token)
+        current_tool.reset(tool_token)
+        query_stats.record_call(tool, statements)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._mcp_query_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed_ms = (time.perf_counter() - context._mcp_query_started) * 1000
+    rows = cursor.rowcount if cursor.rowcount and cursor.rowcount > 0 else 0
+    query_stats.record_statement(current_tool.get() or "unattributed", elapsed_ms, rows)
+    statements = _call_statements.get()
+    if statements is not None:
+        statements[statement] += 1
+
+
+def _instrument(async_engine):
+    """Attach query instrumentation hooks to an engine."""
+    event.listen(async_engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(async_engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+if MCPConfig.QUERY_INSTRUMENTATION:
+    _instrument(engine)
+    if read_engine is not None:
+        _instrument(read_engine)
+
+
+class StatementTimeoutError(Exception):
+    """A tool's query was cancelled by its statement timeout."""
+
+    def __init__(self, tool: str, timeout_ms: int):
+        super().__init__(f"{tool} exceeded its {timeout_ms} ms statement timeout")
+        self.tool = tool
+        self.timeout_ms = timeout_ms
+
+
+def statement_timeout_ms(tool: Optional[str]) -> int:
+    """Statement timeout budget for a tool (per-tool override, else its category)."""
+    if tool in MCPConfig.STATEMENT_TIMEOUT_OVERRIDES:
+        return MCPConfig.STATEMENT_TIMEOUT_OVERRIDES[tool]
+    return {
+        READ: MCPConfig.STATEMENT_TIMEOUT_READ_MS,
+        WRITE: MCPConfig.STATEMENT_TIMEOUT_WRITE_MS,
+        DEV: MCPConfig.STATEMENT_TIMEOUT_DEV_MS,
+    }[tool_category(tool)]
+
+
+def _is_query_canceled(error: Exception) -> bool:
+    """True if Postgres cancelled the statement (SQLSTATE 57014)."""
+    orig = getattr(error, "orig", None)
+    for candidate in (orig, getattr(orig, "__cause__", None)):
+        if getattr(candidate, "sqlstate", None) == "57014":
+            return True
+    return False
+
+
+async def _apply_statement_timeout(session: AsyncSession, tool: Optional[str]) -> int:
+    """Bound every statement in the current transaction with SET LOCAL."""
+    timeout_ms = statement_timeout_ms(tool)
+    if timeout_ms > 0:
+        await session.execute(text(f"SET LOCAL statement_timeout = {int(timeout_ms)}"))
+    return timeout_ms
+
+
+async def _checkout(session: AsyncSession, **execution_options):
+    """Check out the session connection up front so pool wait time is measurable."""
+    started = time.perf_counter()
+    await session.connection(execution_options=execution_options or None)
+    pool_wait_stats.record((time.perf_counter() - started) * 1000)
+
+
+async def _open_session(maker: async_sessionmaker, **execution_options) -> AsyncSession:
+    """Create a session and check out its connection, closing it on failure."""
+    session = maker()
+    try:
+        await _checkout(session, **execution_options)
+    except BaseException:
+        await session.close()
+        raise
+    return session
+
 
 @asynccontextmanager
-async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
-    """Get database session for MCP tools."""
+async def get_db_session(tool: Optional[str] = None) -> AsyncGenerator[AsyncSession, None]:
+    """Get database session for MCP tools.
+    
+    Args:
+        tool: Name of the calling tool (selects the statement timeout budget)
+    """
     async with async_session_maker() as session:
+        timeout_ms = 0
         try:
+            await _checkout(session)
+            timeout_ms = await _apply_statement_timeout(session, tool)
             yield session
             await session.commit()
-        except Exception:
+            replica_router.note_write()
+        except asyncio.CancelledError:
+            # asyncpg already sent a cancel request for the running query;
+            # don't hand a connection in an unknown state back to the pool
+            await session.invalidate()
+            raise
+        except Exception as e:
             await session.rollback()
+            if _is_query_canceled(e):
+                raise StatementTimeoutError(tool or "unknown", timeout_ms) from e
             raise
         finally:
             await session.close()
 
 
+@asynccontextmanager
+async def get_read_session(
+    tool: str,
+    deferrable: bool = False,
+    use_primary: bool = False
+) -> AsyncGenerator[AsyncSession, None]:
+    """Get a read-only database session for get/list tools.
+    
+    The transaction is opened as READ ONLY and is rolled back on exit instead
+    of committed. deferrable=True is for multi-query reports that need one
+    consistent snapshot: SERIALIZABLE READ ONLY DEFERRABLE on the primary, and
+    REPEATABLE READ READ ONLY on the replica, since a hot standby rejects
+    serializable transactions (and has no concurrent writers to wait out).
+    
+    When DATABASE_READ_URL is set the session is served by the replica, unless
+    the caller asks for the primary, a write committed within
+    READ_AFTER_WRITE_SECONDS, or the replica recently failed to connect.
+    
+    Args:
+        tool: Name of the calling tool (statistics and statement timeout budget)
+        deferrable: Wait for a safe snapshot instead of risking serialization checks
+        use_primary: Read from the primary even when a replica is configured
+    """
+    execution_options = {"postgresql_readonly": True}
+    replica_options = dict(execution_options)
+    if deferrable:
+        execution_options.update(
+            isolation_level="SERIALIZABLE",
+            postgresql_deferrable=True,
+        )
+        replica_options.update(isolation_level="REPEATABLE READ")
+    
+    session = None
+    route = "primary"
+    if replica_router.use_replica(use_primary):
+        try:
+            session = await _open_session(read_session_maker, **replica_options)
+            route = "replica"
+        except Exception as e:
+            # Replica data is allowed to be stale, but not missing - use the primary
+            replica_router.mark_down(e)
+            route = "fallback"
+    
+    if session is None:
+        session = await _open_session(async_session_maker, **execution_options)
+    replica_router.record(route)
+    
+    timeout_ms = 0
+    try:
+        timeout_ms = await _apply_statement_timeout(session, tool)
+        yield session
+        read_session_stats.record(tool)
+    except asyncio.CancelledError:
+        await session.invalidate()
+        raise
+    except Exception as e:
+        if _is_query_canceled(e):
+            raise StatementTimeoutError(tool, timeout_ms) from e
+        raise
+    finally:
+        # Nothing to commit - closing rolls back the read-only transaction
+        await session.close()
+
+
+@asynccontextmanager
+async def get_autocommit_connection(tool: str) -> AsyncGenerator[AsyncConnection, None]:
+    """Get a primary connection in autocommit mode for statements that cannot
+    run inside a transaction (CREATE INDEX CONCURRENTLY, REFRESH ... CONCURRENTLY).
+    
+    The tool's statement timeout is set for the session and reset before the
+    connection goes back to the pool.
+    
+    Args:
+        tool: Name of the calling tool (statement timeout budget)
+    """
+    timeout_ms = statement_timeout_ms(tool)
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await conn.execute(text(f"SET statement_timeout = {int(timeout_ms)}"))
+        try:
+            yield conn
+            replica_router.note_write()
+        except asyncio.CancelledError:
+            await conn.invalidate()
+            raise
+        except Exception as e:
+            if _is_query_canceled(e):
+                raise StatementTimeoutError(tool, timeout_ms) from e
+            raise
+        finally:
+            if not conn.invalidated:
+                await conn.execute(text("RESET statement_timeout"))
+
+
 async def init_database():
     """Initialize database connection (verify connectivity)."""
     async with engine.begin() as conn:
         # Just test the connection
         await conn.execute(text("SELECT 1"))
+    
+    if read_engine is not None:
+        try:
+            async with read_engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+        except Exception as e:
+            # Replica is optional - reads fall back to the primary
+            replica_router.mark_down(e)
     return True
 
 
+async def warm_pool(count: int) -> int:
+    """Open pooled connections ahead of time so early tool calls skip the connect handshake.
+    
+    Args:
+        count: Number of connections to open (capped at DB_POOL_SIZE)
+    
+    Returns:
+        Number of connections left idle in the pool
+    """
+    if count <= 0 or not isinstance(engine.pool, QueuePool):
+        return 0
+    
+    results = await asyncio.gather(
+        *(engine.connect().start() for _ in range(min(count, MCPConfig.DB_POOL_SIZE))),
+        return_exceptions=True,
+    )
+    connections = [conn for conn in results if not isinstance(conn, BaseException)]
+    if len(connections) < len(results):
+        logger.warning("Warmed %d of %d pool connections", len(connections), len(results))
+    
+    # Closing returns them to the pool as idle connections
+    await asyncio.gather(*(conn.close() for conn in connections))
+    return len(connections)
+
+
 async def close_database():
     """Close database connections."""
     await engine.dispose()
+    if read_engine is not None:
+        await read_engine.dispose()
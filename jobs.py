@@ -0,0 +1,238 @@
+"""In-process background jobs for long-running dev tools.
+
+seed_realistic_data, reset_database and validate_data_integrity accept
+background=True: the call returns a job ID at once and the work runs in a
+task here, at most JOB_WORKERS at a time. Jobs live in process memory, so
+with MCP_WORKERS > 1 a job can only be polled on the worker that runs it,
+and unfinished jobs are cancelled on shutdown.
+"""
+import asyncio
+import contextlib
+import logging
+import uuid
+from collections import OrderedDict
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from config import MCPConfig
+from database import track_tool_queries
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+FINISHED = {SUCCEEDED, FAILED, CANCELLED}
+
+ProgressSink = Callable[[float, Optional[float], Optional[str]], Awaitable[None]]
+
+# Job being executed by the current task (None for inline tool calls)
+current_job: ContextVar[Optional["Job"]] = ContextVar("current_job", default=None)
+
+# Sends MCP progress notifications for the current request, if any
+progress_sink: ContextVar[Optional[ProgressSink]] = ContextVar("progress_sink", default=None)
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+@dataclass
+class Job:
+    """A tool call running in the background."""
+    id: str
+    tool: str
+    arguments: Dict[str, Any]
+    status: str = QUEUED
+    created_at: datetime = field(default_factory=_now)
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    progress: float = 0
+    total: Optional[float] = None
+    progress_message: Optional[str] = None
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    task: Optional[asyncio.Task] = field(default=None, repr=False)
+    # Set whenever status or progress changes (wakes get_job waiters)
+    changed: asyncio.Event = field(default_factory=asyncio.Event, repr=False)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED
+
+    def snapshot(self, include_result: bool = True) -> Dict[str, Any]:
+        data = {
+            "job_id": self.id,
+            "tool": self.tool,
+            "arguments": self.arguments,
+            "status": self.status,
+            "progress": self.progress,
+            "total": self.total,
+            "progress_message": self.progress_message,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "error": self.error,
+        }
+        if include_result:
+            data["result"] = self.result
+        return data
+
+
+async def report_progress(progress: float, total: Optional[float] = None, message: Optional[str] = None):
+    """Report progress of the running tool call.
+
+    Updates the current job (if running in the background) and sends an MCP
+    progress notification when the client asked for them.
+    """
+    job = current_job.get()
+    if job is not None:
+        job.progress, job.total, job.progress_message = progress, total, message
+        job.changed.set()
+
+    sink = progress_sink.get()
+    if sink is not None:
+        try:
+            await sink(progress, total, message)
+        except Exception as e:
+            logger.debug("Progress notification failed: %s", e)
+
+
+class JobQueueFull(Exception):
+    """Too many jobs are waiting for a worker."""
+
+
+class JobRunner:
+    """Runs submitted jobs with bounded concurrency and keeps recent history."""
+
+    def __init__(self, workers: int, queue_size: int, history: int):
+        self.semaphore = asyncio.Semaphore(workers)
+        self.queue_size = queue_size
+        self.history = history
+        self.jobs: "OrderedDict[str, Job]" = OrderedDict()
+
+    def submit(self, tool: str, arguments: Dict[str, Any], run: Callable[[], Awaitable[Dict[str, Any]]]) -> Job:
+        queued = sum(1 for job in self.jobs.values() if job.status == QUEUED)
+        if queued >= self.queue_size:
+            raise JobQueueFull(f"{queued} jobs already queued")
+
+        job = Job(id=str(uuid.uuid4()), tool=tool, arguments=arguments)
+        self.jobs[job.id] = job
+        job.task = asyncio.create_task(self._run(job, run))
+        self._prune()
+        return job
+
+    async def _run(self, job: Job, run: Callable[[], Awaitable[Dict[str, Any]]]):
+        current_job.set(job)
+        # The submitting request has already been answered
+        progress_sink.set(None)
+        try:
+            async with self.semaphore:
+                job.status, job.started_at = RUNNING, _now()
+                job.changed.set()
+                with track_tool_queries(job.tool):
+                    result = await run()
+            job.result = result
+            if result.get("success"):
+                job.status = SUCCEEDED
+            else:
+                job.status = FAILED
+                job.error = result.get("error") or result.get("message")
+        except asyncio.CancelledError:
+            job.status = CANCELLED
+        except Exception as e:
+            logger.exception("Job %s (%s) failed", job.id, job.tool)
+            job.status, job.error = FAILED, str(e)
+        finally:
+            job.finished_at = _now()
+            job.changed.set()
+
+    def _prune(self):
+        finished = [job_id for job_id, job in self.jobs.items() if job.finished]
+        for job_id in finished[:max(len(finished) - self.history, 0)]:
+            del self.jobs[job_id]
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self.jobs.get(job_id)
+
+    def list(self, status: Optional[str] = None, limit: int = 20) -> List[Job]:
+        """Most recent jobs first, optionally filtered by status."""
+        jobs = [job for job in reversed(self.jobs.values()) if status is None or job.status == status]
+        return jobs[:limit]
+
+    def cancel(self, job: Job) -> bool:
+        """Cancel a queued or running job. Returns False if it already finished."""
+        if job.finished:
+            return False
+        job.task.cancel()
+        return True
+
+    async def wait(self, job: Job, timeout: float):
+        """Wait until the job finishes or `timeout` passes, forwarding its progress."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while not job.finished:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return
+            job.changed.clear()
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(job.changed.wait(), timeout=remaining)
+            if job.status == RUNNING:
+                sink = progress_sink.get()
+                if sink is not None:
+                    with contextlib.suppress(Exception):
+                        await sink(job.progress, job.total, job.progress_message)
+
+    async def shutdown(self):
+        """Cancel unfinished jobs."""
+        tasks = [job.task for job in self.jobs.values() if not job.finished]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def counts(self) -> Dict[str, int]:
+        counts = {status: 0 for status in (QUEUED, RUNNING, SUCCEEDED, FAILED, CANCELLED)}
+        for job in self.jobs.values():
+            counts[job.status] += 1
+        return counts
+
+
+job_runner = JobRunner(
+    workers=MCPConfig.JOB_WORKERS,
+    queue_size=MCPConfig.JOB_QUEUE_SIZE,
+    history=MCPConfig.JOB_HISTORY,
+)
+
+
+def submit_job(
+    tool: str,
+    fn: Callable[..., Awaitable[Dict[str, Any]]],
+    display_arguments: Optional[Dict[str, Any]] = None,
+    **kwargs
+) -> Dict[str, Any]:
+    """Run a tool function as a background job and return its job ID.
+
+    The job records kwargs as its arguments (returned by get_job/list_jobs)
+    unless display_arguments is given, e.g. a summary of a large payload.
+    """
+    arguments = kwargs if display_arguments is None else display_arguments
+    try:
+        job = job_runner.submit(tool, arguments, lambda: fn(**kwargs))
+    except JobQueueFull as e:
+        return {
+            "success": False,
+            "error": str(e),
+            "message": f"Job queue is full, retry {tool} later"
+        }
+    return {
+        "success": True,
+        "job_id": job.id,
+        "status": job.status,
+        "message": f"{tool} submitted as job {job.id}; poll it with get_job"
+    }
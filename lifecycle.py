@@ -0,0 +1,213 @@
+"""Application lifecycle: one owner for database startup and shutdown.
+
+The Starlette app and FastMCP both have lifespans. In stateless HTTP mode
+FastMCP enters its lifespan for every request, so it must not connect or
+dispose on its own; it shares the context initialized here instead.
+
+Readiness is answered from a background database probe, so /readyz and
+/health never open a session per request.
+"""
+import asyncio
+import contextlib
+import importlib
+import logging
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+from sqlalchemy import text
+
+from airports import airport_index
+from config import MCPConfig
+from database import init_database, close_database, warm_pool, get_read_session
+from jobs import job_runner
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class AppContext:
+    """Application context with database connection status."""
+    db_ready: bool = False
+    startup_ms: Optional[float] = None
+    warmed_connections: int = 0
+    reference: Dict[str, Any] = field(default_factory=dict)
+    # Main-app module -> import time in ms (None if it was already loaded)
+    import_report: Dict[str, Optional[float]] = field(default_factory=dict)
+
+
+# Shared by the Starlette lifespan, the FastMCP lifespan and the tools
+app_context = AppContext()
+
+# Main-app modules the tools import on first use, in dependency order
+MAIN_APP_MODULES = (
+    "app.models",
+    "app.repositories",
+    "app.repositories.file_repository",
+    "app.services.compensation_service",
+)
+
+_prewarm_task: Optional[asyncio.Task] = None
+
+
+class ReadinessProbe:
+    """Periodically checks the database and keeps the latest result."""
+
+    def __init__(self):
+        self.ok = False
+        self.error: Optional[str] = None
+        self.latency_ms: Optional[float] = None
+        self.checked_at: Optional[float] = None
+        self.task: Optional[asyncio.Task] = None
+
+    async def check(self):
+        """Run one probe query and record the outcome."""
+        started = time.perf_counter()
+        try:
+            async with get_read_session("readiness_probe", use_primary=True) as session:
+                await asyncio.wait_for(
+                    session.execute(text("SELECT 1")),
+                    timeout=MCPConfig.READINESS_PROBE_TIMEOUT
+                )
+            self.ok, self.error = True, None
+        except Exception as e:
+            if self.ok:
+                logger.warning("Readiness probe failed: %s", e)
+            self.ok, self.error = False, str(e) or type(e).__name__
+        self.latency_ms = round((time.perf_counter() - started) * 1000, 2)
+        self.checked_at = time.monotonic()
+
+    async def run(self):
+        while True:
+            await self.check()
+            await asyncio.sleep(MCPConfig.READINESS_PROBE_INTERVAL)
+
+    def start(self):
+        if self.task is None:
+            self.task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        if self.task is not None:
+            self.task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self.task
+            self.task = None
+        self.ok = False
+
+    def age(self) -> Optional[float]:
+        """Seconds since the last probe finished."""
+        if self.checked_at is None:
+            return None
+        return time.monotonic() - self.checked_at
+
+    def status(self) -> Dict[str, Any]:
+        """Readiness from the latest probe, without touching the database."""
+        age = self.age()
+        fresh = age is not None and age <= MCPConfig.READINESS_MAX_AGE
+        ready = app_context.db_ready and self.ok and fresh
+        if not app_context.db_ready:
+            reason = "starting"
+        elif age is None:
+            reason = "not probed yet"
+        elif not fresh:
+            reason = f"probe result is stale ({age:.1f}s old)"
+        else:
+            reason = self.error
+        return {
+            "success": ready,
+            "status": "ready" if ready else "not_ready",
+            "database": {
+                "connected": self.ok,
+                "version": app_context.reference.get("db_version"),
+                "probe_latency_ms": self.latency_ms,
+                "probe_age_seconds": None if age is None else round(age, 2),
+            },
+            "message": "MCP server is ready" if ready else f"Not ready: {reason}"
+        }
+
+
+readiness = ReadinessProbe()
+
+
+def _timed_imports(names) -> Dict[str, Optional[float]]:
+    """Import modules one by one, recording the marginal cost of each."""
+    report: Dict[str, Optional[float]] = {}
+    for name in names:
+        if name in sys.modules:
+            report[name] = None
+            continue
+        started = time.perf_counter()
+        importlib.import_module(name)
+        report[name] = round((time.perf_counter() - started) * 1000, 2)
+    return report
+
+
+async def prewarm_imports():
+    """Import the main-app modules in a worker thread so the first tool call doesn't pay for it."""
+    # Let the server start accepting connections first
+    await asyncio.sleep(0)
+    try:
+        app_context.import_report = await asyncio.to_thread(_timed_imports, MAIN_APP_MODULES)
+    except Exception as e:
+        logger.warning("Main app import pre-warm failed: %s", e)
+        return
+    
+    logger.info(
+        "Main app imports pre-warmed: %s",
+        ", ".join(
+            f"{name}={'loaded' if ms is None else f'{ms}ms'}"
+            for name, ms in app_context.import_report.items()
+        )
+    )
+
+
+async def load_reference_data() -> Dict[str, Any]:
+    """Load data that does not change while the server runs."""
+    async with get_read_session("startup", use_primary=True) as session:
+        db_version = await session.scalar(text("SELECT version()"))
+    return {"db_version": db_version}
+
+
+async def startup() -> AppContext:
+    """Connect, warm the pool and preload reference data (once)."""
+    global _prewarm_task
+    if app_context.db_ready:
+        return app_context
+    
+    logger.warning("=" * 60)
+    logger.warning("  EasyAirClaim MCP Server - DEVELOPMENT MODE ONLY")
+    logger.warning("  Full database access - NO authentication!")
+    logger.warning("=" * 60)
+    
+    started = time.perf_counter()
+    await init_database()
+    app_context.warmed_connections = await warm_pool(MCPConfig.DB_WARM_CONNECTIONS)
+    app_context.reference = await load_reference_data()
+    app_context.reference["airports"] = await asyncio.to_thread(airport_index.load)
+    app_context.startup_ms = round((time.perf_counter() - started) * 1000, 2)
+    app_context.db_ready = True
+    
+    await readiness.check()
+    readiness.start()
+    
+    if MCPConfig.PREWARM_IMPORTS:
+        _prewarm_task = asyncio.create_task(prewarm_imports())
+    
+    logger.info(
+        "Database connection established (%s ms, %d pooled connections warmed)",
+        app_context.startup_ms, app_context.warmed_connections
+    )
+    return app_context
+
+
+async def shutdown():
+    """Cancel background jobs and dispose database engines (once)."""
+    if not app_context.db_ready:
+        return
+    
+    app_context.db_ready = False
+    await job_runner.shutdown()
+    await readiness.stop()
+    await close_database()
+    logger.info("Database connection closed")
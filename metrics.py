@@ -0,0 +1,141 @@
+"""Prometheus-style metrics for MCP tool calls.
+
+Metrics are kept in process memory, so with MCP_WORKERS > 1 each worker
+reports its own values (scrape every worker or run a single one).
+"""
+import time
+from collections import defaultdict
+from typing import Any, Awaitable, Dict, Iterable, List, Tuple
+
+from admission import render_metrics as render_admission_metrics
+from cache import render_metrics as render_cache_metrics
+from coalescing import render_metrics as render_coalescing_metrics
+from compensation import render_metrics as render_compensation_metrics
+from database import get_pool_status
+
+# Tool latency buckets in seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Response size buckets in bytes (JSON-encoded result)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus exposition format."""
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.count += 1
+        self.sum += value
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+
+    def render(self, name: str, labels: str) -> List[str]:
+        lines = [
+            f'{name}_bucket{{{labels},le="{bound}"}} {count}'
+            for bound, count in zip(self.buckets, self.counts)
+        ]
+        lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {self.count}')
+        lines.append(f"{name}_sum{{{labels}}} {self.sum}")
+        lines.append(f"{name}_count{{{labels}}} {self.count}")
+        return lines
+
+
+class ToolMetrics:
+    """Per-tool call counters, latency/size histograms and in-flight gauges."""
+
+    def __init__(self):
+        self.calls: Dict[str, int] = defaultdict(int)
+        self.results: Dict[Tuple[str, str], int] = defaultdict(int)
+        self.in_flight: Dict[str, int] = defaultdict(int)
+        self.latency: Dict[str, Histogram] = {}
+        self.response_bytes: Dict[str, Histogram] = {}
+
+    async def observe(self, tool: str, call: Awaitable[Dict[str, Any]]) -> Dict[str, Any]:
+        """Await a tool call and record its outcome.
+
+        A call counts as successful when it returns {"success": True, ...};
+        raised exceptions and cancellations count as failures.
+        """
+        self.calls[tool] += 1
+        self.in_flight[tool] += 1
+        started = time.perf_counter()
+        result = None
+        try:
+            result = await call
+            return result
+        finally:
+            self.in_flight[tool] -= 1
+            elapsed = time.perf_counter() - started
+            success = isinstance(result, dict) and bool(result.get("success"))
+            self.results[(tool, "success" if success else "failure")] += 1
+            self.latency.setdefault(tool, Histogram(LATENCY_BUCKETS)).observe(elapsed)
+
+    def observe_response_size(self, tool: str, size: int):
+        """Record the encoded size of a tool result."""
+        self.response_bytes.setdefault(tool, Histogram(SIZE_BUCKETS)).observe(size)
+
+    def render(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        lines: List[str] = []
+
+        lines += _header("mcp_tool_calls_total", "counter", "Tool calls started")
+        lines += [f'mcp_tool_calls_total{{tool="{t}"}} {n}' for t, n in sorted(self.calls.items())]
+
+        lines += _header("mcp_tool_results_total", "counter", "Tool calls by success field")
+        lines += [
+            f'mcp_tool_results_total{{tool="{t}",result="{r}"}} {n}'
+            for (t, r), n in sorted(self.results.items())
+        ]
+
+        lines += _header("mcp_tool_in_flight", "gauge", "Tool calls currently running")
+        lines += [f'mcp_tool_in_flight{{tool="{t}"}} {n}' for t, n in sorted(self.in_flight.items())]
+
+        lines += _header("mcp_tool_latency_seconds", "histogram", "Tool call latency")
+        for tool, histogram in sorted(self.latency.items()):
+            lines += histogram.render("mcp_tool_latency_seconds", f'tool="{tool}"')
+
+        lines += _header("mcp_tool_response_bytes", "histogram", "JSON size of tool results")
+        for tool, histogram in sorted(self.response_bytes.items()):
+            lines += histogram.render("mcp_tool_response_bytes", f'tool="{tool}"')
+
+        lines += _render_pool_gauges(get_pool_status())
+        lines += render_admission_metrics()
+        lines += render_cache_metrics()
+        lines += render_coalescing_metrics()
+        lines += render_compensation_metrics()
+        return "\n".join(lines) + "\n"
+
+
+def _header(name: str, kind: str, help_text: str) -> List[str]:
+    return [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+
+
+def _pool_lines(pool: str, status: Dict[str, Any]) -> Iterable[str]:
+    for key in ("size", "checked_out", "idle", "overflow"):
+        if key in status:
+            yield f'mcp_db_pool_connections{{pool="{pool}",state="{key}"}} {status[key]}'
+
+
+def _render_pool_gauges(status: Dict[str, Any]) -> List[str]:
+    lines = _header("mcp_db_pool_connections", "gauge", "Database pool connections by state")
+    lines += list(_pool_lines("primary", status))
+    if "replica" in status:
+        lines += list(_pool_lines("replica", status["replica"]))
+
+    wait = status["wait"]
+    lines += _header("mcp_db_pool_wait_ms", "gauge", "Connection checkout wait time")
+    lines += [
+        f'mcp_db_pool_wait_ms{{stat="avg"}} {wait["avg_ms"]}',
+        f'mcp_db_pool_wait_ms{{stat="max"}} {wait["max_ms"]}',
+    ]
+    return lines
+
+
+tool_metrics = ToolMetrics()
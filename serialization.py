@@ -0,0 +1,53 @@
+"""Fast JSON encoding for tool results and HTTP responses.
+
+orjson serializes datetime, date, UUID natively (and Decimal through
+_default), so tools can return raw column values instead of building
+isoformat()/str() strings field by field.
+"""
+from decimal import Decimal
+from typing import Any, Dict
+
+import orjson
+from mcp.types import CallToolResult, TextContent
+from starlette.responses import JSONResponse
+
+_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+def _default(value: Any) -> Any:
+    """Encode types orjson does not handle natively."""
+    if isinstance(value, Decimal):
+        return float(value)
+    # Same fallback FastMCP uses for anything else
+    return str(value)
+
+
+def dumps(value: Any) -> bytes:
+    """Encode a value as compact JSON bytes."""
+    return orjson.dumps(value, default=_default, option=_OPTIONS)
+
+
+def tool_result(result: Dict[str, Any], payload: bytes) -> CallToolResult:
+    """Build the MCP tool result from an already-encoded payload.
+
+    Returning a CallToolResult bypasses FastMCP's own conversion, which
+    would encode the dict twice (indented text content plus a separately
+    dumped structured copy).
+
+    Args:
+        result: Raw dict returned by the tool
+        payload: dumps(result)
+    """
+    return CallToolResult(
+        content=[TextContent(type="text", text=payload.decode())],
+        # Tools are annotated Dict[str, Any], so FastMCP wraps structured output in "result"
+        structuredContent={"result": orjson.loads(payload)},
+        isError=False,
+    )
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
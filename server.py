@@ -3,20 +3,29 @@
 This server provides tools for interacting with the EasyAirClaim database
 for development and testing purposes.
 """
+import asyncio
 import contextlib
+import functools
 import logging
 from collections.abc import AsyncIterator
-from dataclasses import dataclass
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 
 from starlette.applications import Starlette
+from starlette.middleware import Middleware
 from starlette.routing import Mount, Route
-from starlette.responses import JSONResponse
+from starlette.responses import PlainTextResponse
 
 from mcp.server.fastmcp import FastMCP
 
+from admission import Overloaded, admit
+from coalescing import single_flight
+from compression import CompressionMiddleware
 from config import MCPConfig
-from database import init_database, close_database
+from database import track_tool_queries
+from jobs import progress_sink, submit_job
+from lifecycle import AppContext, app_context, readiness, startup, shutdown
+from metrics import tool_metrics
+from serialization import FastJSONResponse, dumps, tool_result
 import tools
 
 # Configure logging
@@ -31,27 +40,21 @@ logger = logging.getLogger(__name__)
 # Lifespan Context for Database Management
 # =============================================================================
 
-@dataclass
-class AppContext:
-    """Application context with database connection status."""
-    db_ready: bool
-
-
 @contextlib.asynccontextmanager
 async def mcp_lifespan(server: FastMCP) -> AsyncIterator[AppContext]:
-    """Manage database lifecycle for FastMCP server."""
-    logger.warning("=" * 60)
-    logger.warning("  EasyAirClaim MCP Server - DEVELOPMENT MODE ONLY")
-    logger.warning("  Full database access - NO authentication!")
-    logger.warning("=" * 60)
+    """Share the application context with FastMCP.
     
+    The Starlette app lifespan owns database startup/shutdown. Only when
+    FastMCP runs standalone (nothing initialized yet) does it take ownership.
+    """
+    owner = not app_context.db_ready
+    if owner:
+        await startup()
     try:
-        await init_database()
-        logger.info("Database connection established")
-        yield AppContext(db_ready=True)
+        yield app_context
     finally:
-        await close_database()
-        logger.info("Database connection closed")
+        if owner:
+            await shutdown()
 
 
 # =============================================================================
@@ -78,11 +81,116 @@ mcp = FastMCP(
 )
 
 
+# =============================================================================
+# Tool Dispatch
+# =============================================================================
+
+# How often a running tool call checks whether its HTTP client went away
+DISCONNECT_POLL_SECONDS = 0.5
+
+
+def _current_request():
+    """Return the Starlette request of the MCP call being served, if any."""
+    try:
+        return mcp.get_context().request_context.request
+    except (LookupError, ValueError, AttributeError):
+        return None
+
+
+async def _run_until_disconnect(name: str, call) -> Dict[str, Any]:
+    """Run a tool call, cancelling it if the HTTP client disconnects.
+    
+    Cancelling the task raises CancelledError inside the pending asyncpg
+    query, which makes asyncpg send a cancel request to Postgres.
+    """
+    request = _current_request()
+    if request is None:
+        return await call
+    
+    task = asyncio.ensure_future(call)
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=DISCONNECT_POLL_SECONDS)
+            if done:
+                return task.result()
+            if await request.is_disconnected():
+                break
+    except asyncio.CancelledError:
+        # MCP request cancelled by the client - stop the query as well
+        task.cancel()
+        raise
+    
+    task.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+        await task
+    logger.info("Client disconnected, cancelled tool call: %s", name)
+    return {
+        "success": False,
+        "cancelled": True,
+        "message": f"Client disconnected, {name} was cancelled"
+    }
+
+
+def _progress_sink():
+    """Return the MCP progress reporter of the request being served, if any."""
+    context = mcp.get_context()
+    try:
+        context.request_context
+    except ValueError:
+        return None
+    return context.report_progress
+
+
+async def _admitted(name: str, fn, args, kwargs) -> Dict[str, Any]:
+    """Admit a tool call through its category limiter and run it."""
+    try:
+        async with admit(name):
+            return await fn(*args, **kwargs)
+    except Overloaded as e:
+        logger.warning("Shed %s call: %s", name, e)
+        return e.response()
+
+
+async def _dispatch(name: str, fn, args, kwargs) -> Dict[str, Any]:
+    """Run a tool call, sharing the execution of identical in-flight reads."""
+    key = single_flight.key(name, fn, args, kwargs)
+    if key is None:
+        call = _admitted(name, fn, args, kwargs)
+    else:
+        call = single_flight.join(key, lambda: _admitted(name, fn, args, kwargs))
+    return await _run_until_disconnect(name, call)
+
+
+def tool():
+    """Register an MCP tool through the shared dispatch wrapper.
+    
+    Every tool call is attributed for query statistics, recorded in the
+    /metrics counters and histograms, subject to per-category admission
+    control, coalesced with identical in-flight read calls, and cancelled on
+    client disconnect. Tools can send MCP progress notifications through
+    jobs.report_progress. The result is encoded once with orjson, so tools
+    may return raw datetime/UUID/Decimal values.
+    """
+    def decorator(fn):
+        name = fn.__name__
+        
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            progress_sink.set(_progress_sink())
+            with track_tool_queries(name):
+                result = await tool_metrics.observe(name, _dispatch(name, fn, args, kwargs))
+            payload = dumps(result)
+            tool_metrics.observe_response_size(name, len(payload))
+            return tool_result(result, payload)
+        return mcp.tool()(wrapper)
+    return decorator
+
+
 # =============================================================================
 # Health & System Tools
 # =============================================================================
 
-@mcp.tool()
+@tool()
 async def health_check() -> Dict[str, Any]:
     """Check MCP server and database connectivity.
     
@@ -91,16 +199,67 @@ async def health_check() -> Dict[str, Any]:
     return await tools.health_check()
 
 
-@mcp.tool()
-async def get_database_stats() -> Dict[str, Any]:
+@tool()
+async def get_database_stats(use_primary: bool = False) -> Dict[str, Any]:
     """Get database statistics (counts of various entities).
     
     Returns counts of customers, claims, and files.
+    
+    Args:
+        use_primary: Read from the primary instead of the read replica (optional)
     """
-    return await tools.get_database_stats()
+    return await tools.get_database_stats(use_primary=use_primary)
 
 
-@mcp.tool()
+@tool()
+async def claim_analytics(
+    group_by: Optional[List[str]] = None,
+    time_bucket: Optional[str] = None,
+    time_field: str = "submitted_at",
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    status: Optional[str] = None,
+    airline: Optional[str] = None,
+    percentiles: Optional[List[float]] = None,
+    use_materialized: bool = False,
+    limit: int = 100,
+    use_primary: bool = False
+) -> Dict[str, Any]:
+    """Aggregate claim compensation and delay hours, computed in the database.
+    
+    Returns overall totals plus one row per group with the claim count and
+    count, total, average, min, max and percentiles of compensation_amount
+    and delay_hours.
+    
+    Args:
+        group_by: Any of airline, route, departure_airport, arrival_airport, incident_type, status (optional)
+        time_bucket: Also group by day, week, month, quarter or year (optional)
+        time_field: Date for buckets and date filters: submitted_at or flight_date (default: submitted_at)
+        date_from: Only claims on or after this date, YYYY-MM-DD (optional)
+        date_to: Only claims on or before this date, YYYY-MM-DD (optional)
+        status: Only claims in this status (optional)
+        airline: Only claims of this airline (optional)
+        percentiles: Fractions between 0 and 1 (default: [0.5, 0.9])
+        use_materialized: Read the pre-aggregated view from refresh_claim_analytics (faster, no percentiles)
+        limit: Maximum number of groups (default: 100)
+        use_primary: Read from the primary instead of the read replica (optional)
+    """
+    return await tools.claim_analytics(
+        group_by=group_by,
+        time_bucket=time_bucket,
+        time_field=time_field,
+        date_from=date_from,
+        date_to=date_to,
+        status=status,
+        airline=airline,
+        percentiles=percentiles,
+        use_materialized=use_materialized,
+        limit=limit,
+        use_primary=use_primary
+    )
+
+
+@tool()
 async def get_environment_info() -> Dict[str, Any]:
     """Get environment and configuration information.
     
@@ -109,11 +268,22 @@ async def get_environment_info() -> Dict[str, Any]:
     return await tools.get_environment_info()
 
 
+@tool()
+async def get_diagnostics(reset: bool = False) -> Dict[str, Any]:
+    """Get runtime statistics (pool, sessions, caches, jobs) and, with
+    QUERY_INSTRUMENTATION, per-tool SQL query statistics (counts, timings, rows, N+1 patterns).
+    
+    Args:
+        reset: Clear the query and cache statistics after reading them (default: False)
+    """
+    return await tools.get_diagnostics(reset=reset)
+
+
 # =============================================================================
 # Customer Management Tools
 # =============================================================================
 
-@mcp.tool()
+@tool()
 async def create_customer(
     email: str,
     first_name: str,
@@ -148,38 +318,60 @@ async def create_customer(
     )
 
 
-@mcp.tool()
-async def get_customer(customer_id: str) -> Dict[str, Any]:
+@tool()
+async def get_customer(customer_id: str, use_primary: bool = False) -> Dict[str, Any]:
     """Get customer details by ID.
     
     Args:
         customer_id: Customer ID (UUID)
+        use_primary: Read from the primary instead of the read replica (optional)
     """
-    return await tools.get_customer(customer_id=customer_id)
+    return await tools.get_customer(customer_id=customer_id, use_primary=use_primary)
 
 
-@mcp.tool()
-async def get_customer_by_email(email: str) -> Dict[str, Any]:
+@tool()
+async def get_customers(customer_ids: List[str], use_primary: bool = False) -> Dict[str, Any]:
+    """Get many customers by ID with one query (same fields as get_customer).
+    
+    Args:
+        customer_ids: Customer IDs (UUIDs, up to BATCH_GET_MAX_IDS)
+        use_primary: Read from the primary instead of the read replica (optional)
+    """
+    return await tools.get_customers(customer_ids=customer_ids, use_primary=use_primary)
+
+
+@tool()
+async def get_customer_by_email(email: str, use_primary: bool = False) -> Dict[str, Any]:
     """Find customer by email address.
     
     Args:
         email: Customer email address
+        use_primary: Read from the primary instead of the read replica (optional)
     """
-    return await tools.get_customer_by_email(email=email)
+    return await tools.get_customer_by_email(email=email, use_primary=use_primary)
 
 
-@mcp.tool()
-async def list_customers(limit: int = 10, offset: int = 0) -> Dict[str, Any]:
+@tool()
+async def list_customers(
+    limit: int = 10,
+    offset: int = 0,
+    cursor: Optional[str] = None,
+    use_primary: bool = False
+) -> Dict[str, Any]:
     """List customers with pagination.
     
     Args:
         limit: Number of results to return (default: 10)
         offset: Number of results to skip (default: 0)
+        cursor: next_cursor from the previous page (optional, replaces offset)
+        use_primary: Read from the primary instead of the read replica (optional)
     """
-    return await tools.list_customers(limit=limit, offset=offset)
+    return await tools.list_customers(
+        limit=limit, offset=offset, cursor=cursor, use_primary=use_primary
+    )
 
 
-@mcp.tool()
+@tool()
 async def delete_customer(customer_id: str) -> Dict[str, Any]:
     """Delete a customer by ID.
     
@@ -193,7 +385,7 @@ async def delete_customer(customer_id: str) -> Dict[str, Any]:
 # Claim Management Tools
 # =============================================================================
 
-@mcp.tool()
+@tool()
 async def create_claim(
     customer_id: str,
     flight_number: str,
@@ -240,22 +432,70 @@ async def create_claim(
     )
 
 
-@mcp.tool()
-async def get_claim(claim_id: str) -> Dict[str, Any]:
+@tool()
+async def get_claim(claim_id: str, use_primary: bool = False) -> Dict[str, Any]:
     """Get complete claim details by ID.
     
     Args:
         claim_id: Claim ID (UUID)
+        use_primary: Read from the primary instead of the read replica (optional)
     """
-    return await tools.get_claim(claim_id=claim_id)
+    return await tools.get_claim(claim_id=claim_id, use_primary=use_primary)
+
+
+@tool()
+async def get_claims(claim_ids: List[str], use_primary: bool = False) -> Dict[str, Any]:
+    """Get many claims by ID with one query (same fields as get_claim).
+    
+    Args:
+        claim_ids: Claim IDs (UUIDs, up to BATCH_GET_MAX_IDS)
+        use_primary: Read from the primary instead of the read replica (optional)
+    """
+    return await tools.get_claims(claim_ids=claim_ids, use_primary=use_primary)
+
+
+@tool()
+async def get_claim_bundle(
+    claim_id: str,
+    include_customer: bool = True,
+    include_notes: bool = True,
+    include_history: bool = True,
+    include_files: bool = True,
+    section_limit: int = 50,
+    use_primary: bool = False
+) -> Dict[str, Any]:
+    """Get a claim with its customer, admin notes, status history and files in one call.
+    
+    Turn sections off to keep the response small.
+    
+    Args:
+        claim_id: Claim ID (UUID)
+        include_customer: Include the customer summary (default: true)
+        include_notes: Include admin notes (default: true)
+        include_history: Include the status history (default: true)
+        include_files: Include file summaries (default: true)
+        section_limit: Newest items returned per section (default: 50)
+        use_primary: Read from the primary instead of the read replica (optional)
+    """
+    return await tools.get_claim_bundle(
+        claim_id=claim_id,
+        include_customer=include_customer,
+        include_notes=include_notes,
+        include_history=include_history,
+        include_files=include_files,
+        section_limit=section_limit,
+        use_primary=use_primary
+    )
 
 
-@mcp.tool()
+@tool()
 async def list_claims(
     customer_id: Optional[str] = None,
     status: Optional[str] = None,
     limit: int = 10,
-    offset: int = 0
+    offset: int = 0,
+    cursor: Optional[str] = None,
+    use_primary: bool = False
 ) -> Dict[str, Any]:
     """List claims with optional filters.
     
@@ -264,16 +504,58 @@ async def list_claims(
         status: Filter by status (optional)
         limit: Number of results (default: 10)
         offset: Number to skip (default: 0)
+        cursor: next_cursor from the previous page (optional, replaces offset)
+        use_primary: Read from the primary instead of the read replica (optional)
     """
     return await tools.list_claims(
         customer_id=customer_id,
         status=status,
         limit=limit,
-        offset=offset
+        offset=offset,
+        cursor=cursor,
+        use_primary=use_primary
     )
 
 
-@mcp.tool()
+@tool()
+async def search_claims(
+    query: Optional[str] = None,
+    flight_number: Optional[str] = None,
+    airline: Optional[str] = None,
+    departure_airport: Optional[str] = None,
+    arrival_airport: Optional[str] = None,
+    status: Optional[str] = None,
+    limit: int = 20,
+    use_primary: bool = False
+) -> Dict[str, Any]:
+    """Search claims by flight number, route, airline and words in the description or notes.
+    
+    Results are ranked by relevance (score) and report the query latency.
+    At least one of query, flight_number, airline or an airport is required.
+    
+    Args:
+        query: Free text, web search syntax ("exact phrase", -exclude, or) (optional)
+        flight_number: Flight number prefix, or approximate match if fuzzy search is available (optional)
+        airline: Airline code, e.g. "LH" (optional)
+        departure_airport: Departure airport IATA code (optional)
+        arrival_airport: Arrival airport IATA code (optional)
+        status: Filter by status (optional)
+        limit: Number of results (default: 20)
+        use_primary: Read from the primary instead of the read replica (optional)
+    """
+    return await tools.search_claims(
+        query=query,
+        flight_number=flight_number,
+        airline=airline,
+        departure_airport=departure_airport,
+        arrival_airport=arrival_airport,
+        status=status,
+        limit=limit,
+        use_primary=use_primary
+    )
+
+
+@tool()
 async def transition_claim_status(
     claim_id: str,
     new_status: str,
@@ -296,7 +578,44 @@ async def transition_claim_status(
     )
 
 
-@mcp.tool()
+@tool()
+async def bulk_transition_claim_status(
+    new_status: str,
+    claim_ids: Optional[List[str]] = None,
+    status: Optional[str] = None,
+    customer_id: Optional[str] = None,
+    submitted_from: Optional[str] = None,
+    submitted_to: Optional[str] = None,
+    admin_id: Optional[str] = None,
+    note: Optional[str] = None
+) -> Dict[str, Any]:
+    """Transition many claims to a new status in one transaction.
+    
+    Select claims by ID list and/or filters; at least one is required.
+    
+    Args:
+        new_status: New status (submitted, under_review, approved, rejected, paid)
+        claim_ids: Claim IDs (optional)
+        status: Only claims currently in this status (optional)
+        customer_id: Only claims of this customer (optional)
+        submitted_from: Only claims submitted on or after this date, YYYY-MM-DD (optional)
+        submitted_to: Only claims submitted on or before this date, YYYY-MM-DD (optional)
+        admin_id: Admin user ID performing transition (optional)
+        note: Note about the transition (optional)
+    """
+    return await tools.bulk_transition_claim_status(
+        new_status=new_status,
+        claim_ids=claim_ids,
+        status=status,
+        customer_id=customer_id,
+        submitted_from=submitted_from,
+        submitted_to=submitted_to,
+        admin_id=admin_id,
+        note=note
+    )
+
+
+@tool()
 async def add_claim_note(
     claim_id: str,
     note: str,
@@ -320,37 +639,51 @@ async def add_claim_note(
 # File Management Tools
 # =============================================================================
 
-@mcp.tool()
-async def list_claim_files(claim_id: str) -> Dict[str, Any]:
+@tool()
+async def list_claim_files(claim_id: str, use_primary: bool = False) -> Dict[str, Any]:
     """List all files for a specific claim.
     
     Args:
         claim_id: Claim ID (UUID)
+        use_primary: Read from the primary instead of the read replica (optional)
     """
-    return await tools.list_claim_files(claim_id=claim_id)
+    return await tools.list_claim_files(claim_id=claim_id, use_primary=use_primary)
 
 
-@mcp.tool()
-async def get_file_metadata(file_id: str) -> Dict[str, Any]:
+@tool()
+async def get_file_metadata(file_id: str, use_primary: bool = False) -> Dict[str, Any]:
     """Get detailed file metadata and validation status.
     
     Args:
         file_id: File ID (UUID)
+        use_primary: Read from the primary instead of the read replica (optional)
+    """
+    return await tools.get_file_metadata(file_id=file_id, use_primary=use_primary)
+
+
+@tool()
+async def get_files_metadata(file_ids: List[str], use_primary: bool = False) -> Dict[str, Any]:
+    """Get metadata of many files by ID with one query (same fields as get_file_metadata).
+    
+    Args:
+        file_ids: File IDs (UUIDs, up to BATCH_GET_MAX_IDS)
+        use_primary: Read from the primary instead of the read replica (optional)
     """
-    return await tools.get_file_metadata(file_id=file_id)
+    return await tools.get_files_metadata(file_ids=file_ids, use_primary=use_primary)
 
 
-@mcp.tool()
-async def get_file_validation_status(file_id: str) -> Dict[str, Any]:
+@tool()
+async def get_file_validation_status(file_id: str, use_primary: bool = False) -> Dict[str, Any]:
     """Get file validation and security scan status.
     
     Args:
         file_id: File ID (UUID)
+        use_primary: Read from the primary instead of the read replica (optional)
     """
-    return await tools.get_file_validation_status(file_id=file_id)
+    return await tools.get_file_validation_status(file_id=file_id, use_primary=use_primary)
 
 
-@mcp.tool()
+@tool()
 async def approve_file(file_id: str, admin_id: Optional[str] = None) -> Dict[str, Any]:
     """Approve a file (admin action).
     
@@ -361,7 +694,7 @@ async def approve_file(file_id: str, admin_id: Optional[str] = None) -> Dict[str
     return await tools.approve_file(file_id=file_id, admin_id=admin_id)
 
 
-@mcp.tool()
+@tool()
 async def reject_file(
     file_id: str,
     reason: str,
@@ -377,7 +710,7 @@ async def reject_file(
     return await tools.reject_file(file_id=file_id, reason=reason, admin_id=admin_id)
 
 
-@mcp.tool()
+@tool()
 async def delete_file(file_id: str) -> Dict[str, Any]:
     """Delete a file.
     
@@ -387,11 +720,13 @@ async def delete_file(file_id: str) -> Dict[str, Any]:
     return await tools.delete_file(file_id=file_id)
 
 
-@mcp.tool()
+@tool()
 async def get_files_by_status(
     validation_status: str,
     limit: int = 10,
-    offset: int = 0
+    offset: int = 0,
+    cursor: Optional[str] = None,
+    use_primary: bool = False
 ) -> Dict[str, Any]:
     """Get files by validation status.
     
@@ -399,11 +734,15 @@ async def get_files_by_status(
         validation_status: Status (pending, approved, rejected)
         limit: Number of results (default: 10)
         offset: Number to skip (default: 0)
+        cursor: next_cursor from the previous page (optional, replaces offset)
+        use_primary: Read from the primary instead of the read replica (optional)
     """
     return await tools.get_files_by_status(
         validation_status=validation_status,
         limit=limit,
-        offset=offset
+        offset=offset,
+        cursor=cursor,
+        use_primary=use_primary
     )
 
 
@@ -411,7 +750,7 @@ async def get_files_by_status(
 # User Management Tools
 # =============================================================================
 
-@mcp.tool()
+@tool()
 async def create_user(
     email: str,
     password: str,
@@ -437,7 +776,7 @@ async def create_user(
     )
 
 
-@mcp.tool()
+@tool()
 async def create_admin(
     email: str,
     password: str,
@@ -460,31 +799,46 @@ async def create_admin(
     )
 
 
-@mcp.tool()
-async def get_user(user_id: str) -> Dict[str, Any]:
+@tool()
+async def get_user(user_id: str, use_primary: bool = False) -> Dict[str, Any]:
     """Get user by ID.
     
     Args:
         user_id: User ID (UUID)
+        use_primary: Read from the primary instead of the read replica (optional)
     """
-    return await tools.get_user(user_id=user_id)
+    return await tools.get_user(user_id=user_id, use_primary=use_primary)
 
 
-@mcp.tool()
-async def get_user_by_email(email: str) -> Dict[str, Any]:
+@tool()
+async def get_users(user_ids: List[str], use_primary: bool = False) -> Dict[str, Any]:
+    """Get many users by ID with one query (same fields as get_user).
+    
+    Args:
+        user_ids: User IDs (UUIDs, up to BATCH_GET_MAX_IDS)
+        use_primary: Read from the primary instead of the read replica (optional)
+    """
+    return await tools.get_users(user_ids=user_ids, use_primary=use_primary)
+
+
+@tool()
+async def get_user_by_email(email: str, use_primary: bool = False) -> Dict[str, Any]:
     """Find user by email address.
     
     Args:
         email: User email address
+        use_primary: Read from the primary instead of the read replica (optional)
     """
-    return await tools.get_user_by_email(email=email)
+    return await tools.get_user_by_email(email=email, use_primary=use_primary)
 
 
-@mcp.tool()
+@tool()
 async def list_users(
     role: Optional[str] = None,
     limit: int = 10,
-    offset: int = 0
+    offset: int = 0,
+    cursor: Optional[str] = None,
+    use_primary: bool = False
 ) -> Dict[str, Any]:
     """List users with optional role filter.
     
@@ -492,11 +846,15 @@ async def list_users(
         role: Filter by role (customer, admin, support)
         limit: Number of results (default: 10)
         offset: Number to skip (default: 0)
+        cursor: next_cursor from the previous page (optional, replaces offset)
+        use_primary: Read from the primary instead of the read replica (optional)
     """
-    return await tools.list_users(role=role, limit=limit, offset=offset)
+    return await tools.list_users(
+        role=role, limit=limit, offset=offset, cursor=cursor, use_primary=use_primary
+    )
 
 
-@mcp.tool()
+@tool()
 async def update_user(
     user_id: str,
     email: Optional[str] = None,
@@ -528,7 +886,7 @@ async def update_user(
     )
 
 
-@mcp.tool()
+@tool()
 async def delete_user(user_id: str) -> Dict[str, Any]:
     """Delete a user.
     
@@ -538,7 +896,7 @@ async def delete_user(user_id: str) -> Dict[str, Any]:
     return await tools.delete_user(user_id=user_id)
 
 
-@mcp.tool()
+@tool()
 async def activate_user(user_id: str) -> Dict[str, Any]:
     """Activate a user account.
     
@@ -548,7 +906,7 @@ async def activate_user(user_id: str) -> Dict[str, Any]:
     return await tools.activate_user(user_id=user_id)
 
 
-@mcp.tool()
+@tool()
 async def deactivate_user(user_id: str) -> Dict[str, Any]:
     """Deactivate a user account.
     
@@ -558,7 +916,7 @@ async def deactivate_user(user_id: str) -> Dict[str, Any]:
     return await tools.deactivate_user(user_id=user_id)
 
 
-@mcp.tool()
+@tool()
 async def verify_user_email(user_id: str) -> Dict[str, Any]:
     """Mark user email as verified.
     
@@ -572,21 +930,27 @@ async def verify_user_email(user_id: str) -> Dict[str, Any]:
 # Development Tools
 # =============================================================================
 
-@mcp.tool()
+@tool()
 async def seed_realistic_data(
     scenario: str = "basic",
-    count: int = 5
+    count: int = 5,
+    background: bool = False
 ) -> Dict[str, Any]:
     """Populate database with realistic test data (customers and claims).
     
     Args:
         scenario: Type of scenario (basic, complex, mixed)
         count: Number of test entities to create
+        background: Run as a background job and return its job ID (optional)
     """
+    if background:
+        return submit_job(
+            "seed_realistic_data", tools.seed_realistic_data, scenario=scenario, count=count
+        )
     return await tools.seed_realistic_data(scenario=scenario, count=count)
 
 
-@mcp.tool()
+@tool()
 async def create_test_scenario(
     email: str = "test@example.com",
     scenario_type: str = "delayed_flight"
@@ -600,47 +964,198 @@ async def create_test_scenario(
     return await tools.create_test_scenario(email=email, scenario_type=scenario_type)
 
 
-@mcp.tool()
-async def reset_database() -> Dict[str, Any]:
+@tool()
+async def reset_database(background: bool = False) -> Dict[str, Any]:
     """WARNING: Delete all test data from database.
     
     This operation requires ENABLE_DESTRUCTIVE_OPS=true.
+    
+    Args:
+        background: Run as a background job and return its job ID (optional)
     """
+    if background:
+        return submit_job("reset_database", tools.reset_database)
     return await tools.reset_database()
 
 
-@mcp.tool()
-async def validate_data_integrity() -> Dict[str, Any]:
-    """Check for data integrity issues (orphaned records, etc)."""
+@tool()
+async def validate_data_integrity(background: bool = False) -> Dict[str, Any]:
+    """Check for data integrity issues (orphaned records, etc).
+    
+    Args:
+        background: Run as a background job and return its job ID (optional)
+    """
+    if background:
+        return submit_job("validate_data_integrity", tools.validate_data_integrity)
     return await tools.validate_data_integrity()
 
 
+@tool()
+async def import_claims(
+    data: Optional[str] = None,
+    file_path: Optional[str] = None,
+    data_format: Optional[str] = None,
+    method: str = "insert",
+    background: bool = False
+) -> Dict[str, Any]:
+    """Bulk import claims from JSONL or CSV (inline data or a local file).
+    
+    Rows use the create_claim fields (customer_id, flight_number, flight_date,
+    departure_airport, arrival_airport, incident_type, delay_minutes,
+    description, status). Invalid rows are skipped and reported per row.
+    
+    Args:
+        data: Inline JSONL or CSV content (optional if file_path is given)
+        file_path: Path of a local JSONL or CSV file on the server (optional)
+        data_format: "jsonl" or "csv" (default: detected)
+        method: "insert" (batched executemany) or "copy" (Postgres COPY)
+        background: Run as a background job and return its job ID (optional)
+    """
+    kwargs = dict(data=data, file_path=file_path, data_format=data_format, method=method)
+    if background:
+        # Keep the inline payload out of the job record that get_job/list_jobs return
+        summary = {
+            "data_bytes": len(data.encode()) if data is not None else None,
+            "file_path": file_path,
+            "data_format": data_format,
+            "method": method
+        }
+        return submit_job("import_claims", tools.import_claims, display_arguments=summary, **kwargs)
+    return await tools.import_claims(**kwargs)
+
+
+@tool()
+async def create_search_indexes(background: bool = False) -> Dict[str, Any]:
+    """Create the pg_trgm extension and GIN indexes used by search_claims.
+    
+    Indexes are built concurrently, so claims stay writable meanwhile.
+    
+    Args:
+        background: Run as a background job and return its job ID (optional)
+    """
+    if background:
+        return submit_job("create_search_indexes", tools.create_search_indexes)
+    return await tools.create_search_indexes()
+
+
+@tool()
+async def refresh_claim_analytics(background: bool = False) -> Dict[str, Any]:
+    """Create or refresh the materialized view used by claim_analytics(use_materialized=true).
+    
+    Refreshes run concurrently, so claim_analytics keeps reading the previous contents meanwhile.
+    
+    Args:
+        background: Run as a background job and return its job ID (optional)
+    """
+    if background:
+        return submit_job("refresh_claim_analytics", tools.refresh_claim_analytics)
+    return await tools.refresh_claim_analytics()
+
+
+@tool()
+async def recalculate_compensation(
+    dry_run: bool = True,
+    status: Optional[str] = None,
+    max_changes_listed: int = 50,
+    background: bool = False
+) -> Dict[str, Any]:
+    """Recompute compensation_amount for all claims with the compensation service.
+    
+    Run with dry_run=true (the default) to see which amounts would change;
+    dry_run=false writes the changes in one transaction.
+    
+    Args:
+        dry_run: Only report differences without writing (default: true)
+        status: Only claims in this status (optional)
+        max_changes_listed: Changed claims listed in the response (default: 50)
+        background: Run as a background job and return its job ID (optional)
+    """
+    kwargs = dict(
+        dry_run=dry_run,
+        status=status,
+        max_changes_listed=max_changes_listed
+    )
+    if background:
+        return submit_job("recalculate_compensation", tools.recalculate_compensation, **kwargs)
+    return await tools.recalculate_compensation(**kwargs)
+
+
 # =============================================================================
-# HTTP Health Check Endpoint (for Docker)
+# Background Job Tools
 # =============================================================================
 
-async def health_endpoint(request):
-    """HTTP health check endpoint for Docker/load balancers."""
-    try:
-        result = await tools.health_check()
-        status_code = 200 if result.get("success") else 503
-        return JSONResponse(result, status_code=status_code)
-    except Exception as e:
-        return JSONResponse(
-            {"success": False, "status": "unhealthy", "error": str(e)},
-            status_code=503
-        )
+@tool()
+async def get_job(job_id: str, wait_seconds: float = 0) -> Dict[str, Any]:
+    """Get the status, progress and result of a background job.
+    
+    Sends progress notifications while waiting.
+    
+    Args:
+        job_id: Job ID returned by a tool called with background=true
+        wait_seconds: Wait up to this long for the job to finish (default: 0)
+    """
+    return await tools.get_job(job_id=job_id, wait_seconds=wait_seconds)
+
+
+@tool()
+async def list_jobs(status: Optional[str] = None, limit: int = 20) -> Dict[str, Any]:
+    """List recent background jobs.
+    
+    Args:
+        status: Filter by status (queued, running, succeeded, failed, cancelled)
+        limit: Number of results (default: 20)
+    """
+    return await tools.list_jobs(status=status, limit=limit)
+
+
+@tool()
+async def cancel_job(job_id: str) -> Dict[str, Any]:
+    """Cancel a queued or running background job.
+    
+    Args:
+        job_id: Job ID
+    """
+    return await tools.cancel_job(job_id=job_id)
+
+
+# =============================================================================
+# HTTP Health Check Endpoints (for Docker/load balancers)
+# =============================================================================
+
+async def livez_endpoint(request):
+    """Liveness probe: the process is serving requests (no database access)."""
+    return FastJSONResponse({"success": True, "status": "alive"})
+
+
+async def readyz_endpoint(request):
+    """Readiness probe answered from the background database probe.
+    
+    Also served at /health for existing Docker/load balancer checks.
+    """
+    result = readiness.status()
+    return FastJSONResponse(result, status_code=200 if result["success"] else 503)
+
+
+async def metrics_endpoint(request):
+    """Prometheus-style metrics for tool calls and the database pool."""
+    return PlainTextResponse(
+        tool_metrics.render(),
+        media_type="text/plain; version=0.0.4"
+    )
 
 
 async def root_endpoint(request):
     """Root endpoint with server info."""
-    return JSONResponse({
+    return FastJSONResponse({
         "name": "easyairclaim-dev",
         "version": "2.0.0",
         "protocol": "MCP (Model Context Protocol)",
         "sdk": "FastMCP",
         "mcp_endpoint": "/mcp",
         "health_endpoint": "/health",
+        "liveness_endpoint": "/livez",
+        "readiness_endpoint": "/readyz",
+        "metrics_endpoint": "/metrics",
         "environment": MCPConfig.ENVIRONMENT,
         "message": "EasyAirClaim MCP Server running with official MCP SDK"
     })
@@ -654,29 +1169,33 @@ async def root_endpoint(request):
 async def app_lifespan(app: Starlette):
     """Combined lifespan for Starlette app with MCP session manager."""
     async with mcp.session_manager.run():
-        # Initialize database
-        logger.warning("=" * 60)
-        logger.warning("  EasyAirClaim MCP Server - DEVELOPMENT MODE ONLY")
-        logger.warning("  Full database access - NO authentication!")
-        logger.warning("=" * 60)
-        
         try:
-            await init_database()
-            logger.info("Database connection established")
+            await startup()
             yield
         finally:
-            await close_database()
-            logger.info("Database connection closed")
+            await shutdown()
 
 
 # Create combined app with health endpoint and MCP
 # Note: Set streamable_http_path to "/" so the actual endpoint is at /mcp (not /mcp/mcp)
 mcp.settings.streamable_http_path = "/"
 
+middleware = []
+if MCPConfig.COMPRESSION:
+    middleware.append(Middleware(
+        CompressionMiddleware,
+        paths=("/mcp", "/health", "/readyz"),
+        minimum_size=MCPConfig.COMPRESSION_MIN_SIZE
+    ))
+
 app = Starlette(
+    middleware=middleware,
     routes=[
         Route("/", root_endpoint),
-        Route("/health", health_endpoint),
+        Route("/health", readyz_endpoint),
+        Route("/livez", livez_endpoint),
+        Route("/readyz", readyz_endpoint),
+        Route("/metrics", metrics_endpoint),
         Mount("/mcp", app=mcp.streamable_http_app()),
     ],
     lifespan=app_lifespan,
@@ -687,13 +1206,41 @@ app = Starlette(
 # Main Entry Point
 # =============================================================================
 
+def _uvicorn_options() -> Dict[str, Any]:
+    """Build uvicorn settings from MCPConfig, preferring uvloop/httptools."""
+    from importlib.util import find_spec
+    
+    options: Dict[str, Any] = {
+        "host": MCPConfig.MCP_HOST,
+        "port": MCPConfig.MCP_PORT,
+        "loop": "uvloop" if find_spec("uvloop") else "asyncio",
+        "http": "httptools" if find_spec("httptools") else "h11",
+        "timeout_keep_alive": MCPConfig.MCP_KEEP_ALIVE,
+        "backlog": MCPConfig.MCP_BACKLOG,
+        "log_level": MCPConfig.LOG_LEVEL.lower(),
+    }
+    
+    if MCPConfig.MCP_RELOAD:
+        # File watcher restarts a single worker on code changes
+        options["reload"] = True
+    else:
+        options["workers"] = MCPConfig.MCP_WORKERS
+    
+    return options
+
+
 if __name__ == "__main__":
     import uvicorn
     
-    uvicorn.run(
-        "server:app",
-        host=MCPConfig.MCP_HOST,
-        port=MCPConfig.MCP_PORT,
-        reload=True,
-        log_level=MCPConfig.LOG_LEVEL.lower()
+    options = _uvicorn_options()
+    logger.info(
+        "Starting uvicorn: mode=%s workers=%s loop=%s http=%s keep_alive=%ss backlog=%s",
+        "reload" if options.get("reload") else "serve",
+        options.get("workers", 1),
+        options["loop"],
+        options["http"],
+        options["timeout_keep_alive"],
+        options["backlog"],
     )
+    
+    uvicorn.run("server:app", **options)
@@ -0,0 +1,56 @@
+"""Shared fixtures for tests against the main app's models and a live database.
+
+The tests need the main application on MAIN_APP_PATH and a database at
+DATABASE_URL with its schema; they are skipped when either is missing.
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import database  # noqa: E402
+
+
+def _database_available() -> bool:
+    try:
+        import app.models  # noqa: F401
+    except ImportError:
+        return False
+
+    async def check():
+        try:
+            await database.init_database()
+            return True
+        except Exception:
+            return False
+        finally:
+            await database.close_database()
+
+    return asyncio.run(check())
+
+
+@pytest.fixture(scope="session")
+def database_available() -> bool:
+    return _database_available()
+
+
+@pytest.fixture
+def run(database_available):
+    """Run a coroutine function against the database in a fresh event loop."""
+    if not database_available:
+        pytest.skip("main app models or database not available")
+
+    def runner(coroutine_function, *args, **kwargs):
+        async def wrapper():
+            await database.init_database()
+            try:
+                return await coroutine_function(*args, **kwargs)
+            finally:
+                await database.close_database()
+
+        return asyncio.run(wrapper())
+
+    return runner
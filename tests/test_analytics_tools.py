@@ -0,0 +1,21 @@
+import pytest
+
+from tools.analytics_tools import claim_analytics
+
+
+def test_truncated_when_one_group_more_than_limit(run):
+    everything = run(claim_analytics, group_by=["incident_type"], limit=1000)
+    assert everything["success"], everything
+    groups = everything["count"]
+    if groups < 2:
+        pytest.skip("needs claims with at least two incident types")
+
+    cut = run(claim_analytics, group_by=["incident_type"], limit=groups - 1)
+    assert cut["success"], cut
+    assert cut["count"] == groups - 1
+    assert cut["truncated"] is True
+    assert cut["totals"] == everything["totals"]
+
+    exact = run(claim_analytics, group_by=["incident_type"], limit=groups)
+    assert exact["count"] == groups
+    assert exact["truncated"] is False
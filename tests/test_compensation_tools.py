@@ -0,0 +1,88 @@
+import uuid
+
+import numpy as np
+import pytest
+from sqlalchemy import delete, select
+
+from compensation import calculate_many, compensation_calculator
+from database import get_db_session
+from tools.claim_tools import create_claim
+from tools.compensation_tools import recalculate_compensation
+
+# (departure, arrival, incident type, delay minutes)
+CLAIMS = [
+    ("FRA", "JFK", "delay", 200),
+    ("FRA", "JFK", "delay", 250),
+    ("FRA", "JFK", "delay", 90),
+    ("CDG", "LIS", "delay", 300),
+    ("MAD", "HEL", "missed_connection", 185),
+    ("LHR", "DXB", "cancellation", 30),
+    ("LHR", "DXB", "denied_boarding", 240),
+    ("JFK", "FRA", "cancellation", 0),
+    ("FRA", "CDG", "delay", None),
+]
+
+
+async def _per_claim(claims):
+    amounts = []
+    for departure, arrival, incident_type, delay_minutes in claims:
+        amount = None
+        if delay_minutes:
+            amount = await compensation_calculator.calculate(departure, arrival, delay_minutes, incident_type)
+        amounts.append(np.nan if amount is None else float(amount))
+    return np.array(amounts)
+
+
+async def _bulk(claims):
+    departures, arrivals, incident_types, delays = zip(*claims)
+    delays = np.array([np.nan if delay is None else delay for delay in delays], dtype=float)
+    amounts, failed, _ = await calculate_many(departures, arrivals, delays, incident_types)
+    return amounts, failed
+
+
+def test_bulk_amounts_match_per_claim_calculation(run):
+    compensation_calculator.clear()
+    expected = run(_per_claim, CLAIMS)
+    compensation_calculator.clear()
+    amounts, failed = run(_bulk, CLAIMS)
+    assert not failed.any()
+    np.testing.assert_array_equal(amounts, expected)
+
+
+async def _create_then_recalculate():
+    from app.models import Claim, Customer
+
+    async with get_db_session() as session:
+        customer = await session.scalar(select(Customer.id).limit(1))
+    if customer is None:
+        pytest.skip("needs at least one customer")
+
+    created = []
+    try:
+        for number, (departure, arrival, incident_type, delay_minutes) in enumerate(CLAIMS):
+            result = await create_claim(
+                customer_id=str(customer),
+                flight_number=f"ZZ{number:04d}",
+                flight_date="2026-01-15",
+                departure_airport=departure,
+                arrival_airport=arrival,
+                incident_type=incident_type,
+                delay_minutes=delay_minutes,
+                description=f"recalculation test {uuid.uuid4()}"
+            )
+            assert result["success"], result
+            created.append(uuid.UUID(str(result["claim_id"])))
+
+        report = await recalculate_compensation(dry_run=True, max_changes_listed=10 ** 6)
+        return created, report
+    finally:
+        if created:
+            async with get_db_session() as session:
+                await session.execute(delete(Claim).where(Claim.id.in_(created)))
+
+
+def test_recalculation_keeps_amounts_written_by_create_claim(run):
+    created, report = run(_create_then_recalculate)
+    assert report["success"], report
+    changed = {uuid.UUID(str(change["claim_id"])) for change in report["changes"]}
+    assert not changed & set(created)
@@ -0,0 +1,83 @@
+"""Classification of MCP tools by the kind of database work they do.
+
+Used by the database layer (statement timeouts) and the server dispatch
+layer to apply per-category policies.
+"""
+from typing import Dict, Optional
+
+READ = "read"
+WRITE = "write"
+DEV = "dev"
+
+TOOL_CATEGORIES: Dict[str, str] = {
+    # Health & System
+    "health_check": READ,
+    "get_database_stats": READ,
+    "claim_analytics": READ,
+    "get_environment_info": READ,
+
+    # Diagnostics
+    "get_diagnostics": READ,
+
+    # Customer
+    "create_customer": WRITE,
+    "get_customer": READ,
+    "get_customers": READ,
+    "get_customer_by_email": READ,
+    "list_customers": READ,
+    "delete_customer": WRITE,
+
+    # Claim
+    "create_claim": WRITE,
+    "get_claim": READ,
+    "get_claims": READ,
+    "get_claim_bundle": READ,
+    "list_claims": READ,
+    "transition_claim_status": WRITE,
+    "search_claims": READ,
+    "bulk_transition_claim_status": WRITE,
+    "add_claim_note": WRITE,
+
+    # File
+    "list_claim_files": READ,
+    "get_file_metadata": READ,
+    "get_files_metadata": READ,
+    "get_file_validation_status": READ,
+    "approve_file": WRITE,
+    "reject_file": WRITE,
+    "delete_file": WRITE,
+    "get_files_by_status": READ,
+
+    # User
+    "create_user": WRITE,
+    "create_admin": WRITE,
+    "get_user": READ,
+    "get_users": READ,
+    "get_user_by_email": READ,
+    "list_users": READ,
+    "update_user": WRITE,
+    "delete_user": WRITE,
+    "activate_user": WRITE,
+    "deactivate_user": WRITE,
+    "verify_user_email": WRITE,
+
+    # Jobs
+    "get_job": READ,
+    "list_jobs": READ,
+    "cancel_job": WRITE,
+
+    # Dev Tools
+    "seed_realistic_data": DEV,
+    "create_test_scenario": DEV,
+    "reset_database": DEV,
+    "validate_data_integrity": DEV,
+    "import_claims": DEV,
+    "create_search_indexes": DEV,
+    "refresh_claim_analytics": DEV,
+    "recalculate_compensation": DEV,
+}
+
+
+def tool_category(tool: Optional[str]) -> str:
+    """Return the category of a tool (unknown tools are treated as writes)."""
+    return TOOL_CATEGORIES.get(tool, WRITE)
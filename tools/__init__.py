@@ -6,9 +6,14 @@ from tools.health_tools import (
     get_environment_info
 )
 
+from tools.diagnostics_tools import (
+    get_diagnostics
+)
+
 from tools.customer_tools import (
     create_customer,
     get_customer,
+    get_customers,
     get_customer_by_email,
     list_customers,
     delete_customer
@@ -17,14 +22,18 @@ from tools.customer_tools import (
 from tools.claim_tools import (
     create_claim,
     get_claim,
+    get_claims,
+    get_claim_bundle,
     list_claims,
     transition_claim_status,
+    bulk_transition_claim_status,
     add_claim_note
 )
 
 from tools.file_tools import (
     list_claim_files,
     get_file_metadata,
+    get_files_metadata,
     get_file_validation_status,
     approve_file,
     reject_file,
@@ -36,6 +45,7 @@ from tools.user_tools import (
     create_user,
     create_admin,
     get_user,
+    get_users,
     get_user_by_email,
     list_users,
     update_user,
@@ -45,6 +55,12 @@ from tools.user_tools import (
     verify_user_email
 )
 
+from tools.job_tools import (
+    get_job,
+    list_jobs,
+    cancel_job
+)
+
 from tools.dev_tools import (
     seed_realistic_data,
     create_test_scenario,
@@ -52,15 +68,38 @@ from tools.dev_tools import (
     validate_data_integrity
 )
 
+from tools.import_tools import (
+    import_claims
+)
+
+from tools.search_tools import (
+    search_claims,
+    create_search_indexes
+)
+
+from tools.analytics_tools import (
+    claim_analytics,
+    refresh_claim_analytics
+)
+
+from tools.compensation_tools import (
+    recalculate_compensation
+)
+
 __all__ = [
     # Health
     "health_check",
     "get_database_stats",
     "get_environment_info",
+    "claim_analytics",
+    
+    # Diagnostics
+    "get_diagnostics",
     
     # Customer
     "create_customer",
     "get_customer",
+    "get_customers",
     "get_customer_by_email",
     "list_customers",
     "delete_customer",
@@ -68,13 +107,18 @@ __all__ = [
     # Claim
     "create_claim",
     "get_claim",
+    "get_claims",
+    "get_claim_bundle",
     "list_claims",
+    "search_claims",
     "transition_claim_status",
+    "bulk_transition_claim_status",
     "add_claim_note",
     
     # File
     "list_claim_files",
     "get_file_metadata",
+    "get_files_metadata",
     "get_file_validation_status",
     "approve_file",
     "reject_file",
@@ -85,6 +129,7 @@ __all__ = [
     "create_user",
     "create_admin",
     "get_user",
+    "get_users",
     "get_user_by_email",
     "list_users",
     "update_user",
@@ -93,9 +138,18 @@ __all__ = [
     "deactivate_user",
     "verify_user_email",
     
+    # Jobs
+    "get_job",
+    "list_jobs",
+    "cancel_job",
+    
     # Dev Tools
     "seed_realistic_data",
     "create_test_scenario",
     "reset_database",
     "validate_data_integrity",
+    "import_claims",
+    "create_search_indexes",
+    "refresh_claim_analytics",
+    "recalculate_compensation",
 ]
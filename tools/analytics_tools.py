@@ -0,0 +1,340 @@
+"""Claim analytics: compensation and delay aggregates computed in SQL.
+
+claim_analytics groups claims by any of airline, route, airports, incident
+type, status and a time bucket and returns counts, sums, averages and
+percentiles per group in one query (GROUPING SETS adds the overall totals).
+
+For large tables it can read from a materialized view pre-aggregated per
+day, airline, route, incident type and status instead. The view holds only
+mergeable aggregates (counts, sums, min/max), so percentiles are not
+available from it. refresh_claim_analytics creates the view and refreshes it
+with REFRESH MATERIALIZED VIEW CONCURRENTLY, which writes only the rows whose
+aggregates changed and does not block readers.
+"""
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Any, List, Optional
+from sqlalchemy import Date, Float, cast, column, func, literal, select, table, text, tuple_, type_coerce
+from sqlalchemy.dialects.postgresql import ARRAY
+from config import MCPConfig
+from database import get_autocommit_connection, get_read_session
+from tools.errors import error_response
+
+DIMENSIONS = ("airline", "route", "departure_airport", "arrival_airport", "incident_type", "status")
+TIME_BUCKETS = ("day", "week", "month", "quarter", "year")
+TIME_FIELDS = ("submitted_at", "flight_date")
+DEFAULT_PERCENTILES = (0.5, 0.9)
+
+VIEW_DIMENSIONS = ("airline", "departure_airport", "arrival_airport", "incident_type", "status")
+VIEW_MEASURES = (
+    "claims", "compensated", "compensation_total", "compensation_min", "compensation_max",
+    "delayed", "delay_hours_total", "delay_hours_min", "delay_hours_max",
+)
+
+
+def _view_name() -> str:
+    from app.models import Claim
+    
+    return f"{Claim.__table__.name}_daily_stats"
+
+
+def _view_definition() -> str:
+    """SELECT behind the materialized view (one row per day and dimension combination)."""
+    from app.models import Claim
+    
+    return f"""
+        SELECT date_trunc('day', submitted_at)::date AS day,
+               airline, departure_airport, arrival_airport, incident_type, status,
+               count(*) AS claims,
+               count(compensation_amount) AS compensated,
+               sum(compensation_amount) AS compensation_total,
+               min(compensation_amount) AS compensation_min,
+               max(compensation_amount) AS compensation_max,
+               count(delay_hours) AS delayed,
+               sum(delay_hours) AS delay_hours_total,
+               min(delay_hours) AS delay_hours_min,
+               max(delay_hours) AS delay_hours_max
+        FROM {Claim.__table__.fullname}
+        GROUP BY 1, 2, 3, 4, 5, 6
+    """
+
+
+def _view_table():
+    return table(
+        _view_name(), column("day", Date), *(column(name) for name in VIEW_DIMENSIONS + VIEW_MEASURES)
+    )
+
+
+def _live_source(time_field: str, percentiles: List[float]):
+    """Columns and aggregate expressions over the claims table."""
+    from app.models import Claim
+    
+    fractions = literal(percentiles, ARRAY(Float))
+    
+    def measure(value):
+        aggregates = {
+            "count": func.count(value),
+            "total": func.sum(value),
+            "min": func.min(value),
+            "max": func.max(value),
+        }
+        if percentiles:
+            # One ordered-set aggregate per column returns every requested percentile
+            aggregates["percentiles"] = type_coerce(
+                func.percentile_cont(fractions).within_group(value), ARRAY(Float)
+            )
+        return aggregates
+    
+    columns = {name: getattr(Claim, name) for name in VIEW_DIMENSIONS}
+    columns["time"] = Claim.submitted_at if time_field == "submitted_at" else Claim.departure_date
+    return Claim.__table__, columns, func.count(), {
+        "compensation": measure(Claim.compensation_amount),
+        "delay_hours": measure(Claim.delay_hours),
+    }
+
+
+def _view_source():
+    """Columns and aggregate expressions that re-aggregate the daily view."""
+    view = _view_table()
+    
+    def measure(count, total, minimum, maximum):
+        return {
+            "count": func.sum(view.c[count]),
+            "total": func.sum(view.c[total]),
+            "min": func.min(view.c[minimum]),
+            "max": func.max(view.c[maximum]),
+        }
+    
+    columns = {name: view.c[name] for name in VIEW_DIMENSIONS}
+    columns["time"] = view.c.day
+    return view, columns, func.sum(view.c.claims), {
+        "compensation": measure("compensated", "compensation_total", "compensation_min", "compensation_max"),
+        "delay_hours": measure("delayed", "delay_hours_total", "delay_hours_min", "delay_hours_max"),
+    }
+
+
+def _measure_result(row, prefix: str, percentiles: List[float]) -> Dict[str, Any]:
+    count = int(getattr(row, f"{prefix}_count") or 0)
+    total = getattr(row, f"{prefix}_total")
+    result = {
+        "count": count,
+        "total": total,
+        "avg": round(float(total) / count, 2) if count and total is not None else None,
+        "min": getattr(row, f"{prefix}_min"),
+        "max": getattr(row, f"{prefix}_max"),
+    }
+    values = getattr(row, f"{prefix}_percentiles", None)
+    for fraction, value in zip(percentiles, values or [None] * len(percentiles)):
+        result[f"p{fraction * 100:g}"] = round(value, 2) if value is not None else None
+    return result
+
+
+async def claim_analytics(
+    group_by: Optional[List[str]] = None,
+    time_bucket: Optional[str] = None,
+    time_field: str = "submitted_at",
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    status: Optional[str] = None,
+    airline: Optional[str] = None,
+    percentiles: Optional[List[float]] = None,
+    use_materialized: bool = False,
+    limit: int = 100,
+    use_primary: bool = False
+) -> Dict[str, Any]:
+    """Aggregate claim compensation and delays by dimension and time bucket.
+    
+    Args:
+        group_by: Any of airline, route, departure_airport, arrival_airport,
+            incident_type, status (optional, default: totals only)
+        time_bucket: Also group by day, week, month, quarter or year (optional)
+        time_field: Date used for buckets and date filters: submitted_at or flight_date
+        date_from: Only claims on or after this date, YYYY-MM-DD (optional)
+        date_to: Only claims on or before this date, YYYY-MM-DD (optional)
+        status: Only claims in this status (optional)
+        airline: Only claims of this airline (optional)
+        percentiles: Fractions between 0 and 1 (default: 0.5 and 0.9)
+        use_materialized: Read the pre-aggregated daily view (no percentiles,
+            submitted_at only, as fresh as its last refresh)
+        limit: Maximum number of groups (default: 100, max ANALYTICS_MAX_GROUPS)
+        use_primary: Read from the primary instead of the read replica (optional)
+    
+    Returns:
+        Overall totals and one row per group with claim counts and
+        count/total/avg/min/max/percentiles of compensation and delay hours
+    """
+    group_by = list(dict.fromkeys(group_by or []))
+    unknown = [name for name in group_by if name not in DIMENSIONS]
+    if unknown:
+        return {
+            "success": False,
+            "message": f"Unknown group_by {unknown}, use any of {list(DIMENSIONS)}"
+        }
+    if time_bucket is not None and time_bucket not in TIME_BUCKETS:
+        return {
+            "success": False,
+            "message": f"time_bucket must be one of {list(TIME_BUCKETS)}"
+        }
+    if time_field not in TIME_FIELDS:
+        return {
+            "success": False,
+            "message": f"time_field must be one of {list(TIME_FIELDS)}"
+        }
+    if use_materialized and time_field != "submitted_at":
+        return {
+            "success": False,
+            "message": "The materialized view is bucketed by submitted_at only"
+        }
+    percentiles = list(DEFAULT_PERCENTILES if percentiles is None else percentiles)
+    if any(not 0 <= fraction <= 1 for fraction in percentiles):
+        return {
+            "success": False,
+            "message": "percentiles must be fractions between 0 and 1"
+        }
+    if use_materialized:
+        percentiles = []
+    limit = max(1, min(limit, MCPConfig.ANALYTICS_MAX_GROUPS))
+    
+    try:
+        async with get_read_session("claim_analytics", use_primary=use_primary) as session:
+            refreshed_at = None
+            if use_materialized:
+                view = _view_name()
+                exists = await session.scalar(text("SELECT to_regclass(:name) IS NOT NULL"), {"name": view})
+                if not exists:
+                    return {
+                        "success": False,
+                        "message": f"Materialized view {view} does not exist",
+                        "hint": "Run refresh_claim_analytics to create it"
+                    }
+                # refresh_claim_analytics stores the refresh time as the view comment
+                refreshed_at = await session.scalar(
+                    text("SELECT obj_description(to_regclass(:name), 'pg_class')"), {"name": view}
+                )
+                source, columns, claims_count, measures = _view_source()
+            else:
+                source, columns, claims_count, measures = _live_source(time_field, percentiles)
+            
+            keys = []
+            for name in group_by:
+                if name == "route":
+                    keys.append(columns["departure_airport"].label("route_from"))
+                    keys.append(columns["arrival_airport"].label("route_to"))
+                else:
+                    keys.append(columns[name].label(name))
+            if time_bucket:
+                keys.append(cast(func.date_trunc(time_bucket, columns["time"]), Date).label("bucket"))
+            # Drop duplicate columns (e.g. route together with departure_airport)
+            group_columns = list({str(key.element): key.element for key in keys}.values())
+            
+            aggregates = [claims_count.label("claims")]
+            for prefix, measure in measures.items():
+                aggregates.extend(value.label(f"{prefix}_{name}") for name, value in measure.items())
+            
+            query = select(*keys, *aggregates).select_from(source)
+            if group_columns:
+                is_total = func.grouping(*group_columns)
+                query = query.add_columns(is_total.label("is_total")).group_by(
+                    func.grouping_sets(tuple_(*group_columns), tuple_())
+                )
+                ordering = [is_total.desc()]
+                if time_bucket:
+                    ordering.append(keys[-1].element)
+                ordering.append(claims_count.desc())
+                # The totals row, up to limit groups and one more to detect truncation
+                query = query.order_by(*ordering).limit(limit + 2)
+            
+            # Timestamps compare against the next midnight so date_to is inclusive
+            # and the condition stays usable by an index
+            if date_from:
+                start = datetime.strptime(date_from, "%Y-%m-%d")
+                query = query.where(columns["time"] >= start.date())
+            if date_to:
+                end = datetime.strptime(date_to, "%Y-%m-%d")
+                if isinstance(columns["time"].type, Date):
+                    query = query.where(columns["time"] <= end.date())
+                else:
+                    query = query.where(columns["time"] < end + timedelta(days=1))
+            if status:
+                query = query.where(columns["status"] == status)
+            if airline:
+                query = query.where(columns["airline"] == airline.strip().upper())
+            
+            started = time.perf_counter()
+            result = await session.execute(query)
+            rows = result.all()
+            elapsed_ms = round((time.perf_counter() - started) * 1000, 2)
+        
+        def summarize(row) -> Dict[str, Any]:
+            return {
+                "claims": int(row.claims or 0),
+                "compensation": _measure_result(row, "compensation", percentiles),
+                "delay_hours": _measure_result(row, "delay_hours", percentiles),
+            }
+        
+        totals = summarize(rows[0])
+        group_rows = rows[1:] if group_columns else []
+        groups = []
+        for row in group_rows[:limit]:
+            group = {}
+            for name in group_by:
+                group[name] = f"{row.route_from}-{row.route_to}" if name == "route" else getattr(row, name)
+            if time_bucket:
+                group[time_bucket] = row.bucket
+            group.update(summarize(row))
+            groups.append(group)
+        
+        return {
+            "success": True,
+            "source": "materialized_view" if use_materialized else "claims",
+            "refreshed_at": refreshed_at,
+            "group_by": group_by + ([time_bucket] if time_bucket else []),
+            "totals": totals,
+            "count": len(groups),
+            "groups": groups,
+            "truncated": len(group_rows) > limit,
+            "elapsed_ms": elapsed_ms,
+            "message": f"Aggregated {totals['claims']} claims into {len(groups)} groups"
+        }
+    except Exception as e:
+        return error_response(e, "Failed to compute claim analytics")
+
+
+async def refresh_claim_analytics() -> Dict[str, Any]:
+    """Create the claim analytics materialized view, or refresh it concurrently.
+    
+    Returns:
+        Whether the view was created or refreshed, its row count and the time taken
+    """
+    view = _view_name()
+    
+    try:
+        started = time.perf_counter()
+        async with get_autocommit_connection("refresh_claim_analytics") as conn:
+            exists = await conn.scalar(text("SELECT to_regclass(:name) IS NOT NULL"), {"name": view})
+            if exists:
+                # Needs the unique index; readers keep seeing the old contents meanwhile
+                await conn.execute(text(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {view}"))
+                action = "refreshed"
+            else:
+                await conn.execute(text(f"CREATE MATERIALIZED VIEW {view} AS {_view_definition()}"))
+                await conn.execute(text(
+                    f"CREATE UNIQUE INDEX {view}_key ON {view} (day, {', '.join(VIEW_DIMENSIONS)})"
+                ))
+                action = "created"
+            
+            refreshed_at = datetime.now(timezone.utc).isoformat()
+            await conn.execute(text(f"COMMENT ON MATERIALIZED VIEW {view} IS '{refreshed_at}'"))
+            rows = await conn.scalar(text(f"SELECT count(*) FROM {view}"))
+        
+        return {
+            "success": True,
+            "view": view,
+            "action": action,
+            "rows": rows,
+            "refreshed_at": refreshed_at,
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 2),
+            "message": f"Materialized view {view} {action} ({rows} rows)"
+        }
+    except Exception as e:
+        return error_response(e, "Failed to refresh claim analytics view")
@@ -0,0 +1,81 @@
+"""Fetch many entities by ID with one query."""
+import uuid
+from typing import Dict, Any, Callable, List, Tuple
+from sqlalchemy import any_, bindparam, select
+from sqlalchemy.dialects.postgresql import ARRAY
+from config import MCPConfig
+from database import get_read_session
+from tools.errors import error_response
+
+
+def split_ids(ids: List[str]) -> Tuple[List[str], List[str]]:
+    """Deduplicate IDs (keeping order) and separate the ones that are not UUIDs.
+    
+    Returns:
+        (valid IDs in canonical form, invalid IDs as given)
+    """
+    valid: Dict[str, None] = {}
+    invalid = []
+    for value in ids:
+        try:
+            valid[str(uuid.UUID(str(value)))] = None
+        except ValueError:
+            invalid.append(value)
+    return list(valid), invalid
+
+
+async def get_many(
+    tool: str,
+    model,
+    ids: List[str],
+    serialize: Callable[[Any], Dict[str, Any]],
+    plural: str,
+    use_primary: bool = False
+) -> Dict[str, Any]:
+    """Resolve up to BATCH_GET_MAX_IDS IDs with a single `id = ANY(:ids)` query.
+    
+    The array is sent as one parameter, so the statement is the same for any
+    number of IDs.
+    
+    Args:
+        tool: Tool name (session attribution and timeouts)
+        model: Model class with an `id` column
+        ids: Requested IDs
+        serialize: Same serializer as the single-entity get tool
+        plural: Result key and message noun (e.g. "claims")
+        use_primary: Read from the primary instead of the read replica
+    
+    Returns:
+        Found entities in request order, plus missing and invalid IDs
+    """
+    if len(ids) > MCPConfig.BATCH_GET_MAX_IDS:
+        return {
+            "success": False,
+            "message": f"Too many IDs: {len(ids)} (max {MCPConfig.BATCH_GET_MAX_IDS})"
+        }
+    
+    valid_ids, invalid_ids = split_ids(ids)
+    
+    try:
+        found = {}
+        if valid_ids:
+            async with get_read_session(tool, use_primary=use_primary) as session:
+                result = await session.execute(
+                    select(model).where(
+                        model.id == any_(bindparam("ids", valid_ids, type_=ARRAY(model.id.type)))
+                    )
+                )
+                found = {str(row.id): serialize(row) for row in result.scalars()}
+        
+        missing_ids = [i for i in valid_ids if i not in found]
+        
+        return {
+            "success": True,
+            "count": len(found),
+            plural: [found[i] for i in valid_ids if i in found],
+            "missing_ids": missing_ids,
+            "invalid_ids": invalid_ids,
+            "message": f"Retrieved {len(found)} of {len(valid_ids) + len(invalid_ids)} {plural}"
+        }
+    except Exception as e:
+        return error_response(e, f"Failed to retrieve {plural}")
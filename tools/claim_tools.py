@@ -1,12 +1,18 @@
 """Claim management tools."""
-from typing import Dict, Any, Optional
-from datetime import date, datetime
-from sqlalchemy import select
-from database import get_db_session
-from app.models import Claim, ClaimNote, ClaimStatusHistory
-from app.repositories import ClaimRepository
-from app.services.compensation_service import CompensationService
-from app.services.claim_workflow_service import ClaimWorkflowService
+from typing import Dict, Any, Optional, List
+from datetime import date, datetime, timedelta
+from sqlalchemy import insert, select, update
+from airports import route_band, validate_route
+from cache import CLAIM, cached, result_cache
+from compensation import compensation_calculator
+from config import MCPConfig
+from database import get_db_session, get_read_session
+from tools.batch import get_many, split_ids
+from tools.errors import error_response
+from tools.file_tools import file_summary
+from tools.pagination import keyset_query, next_page
+
+CLAIM_STATUSES = {"submitted", "under_review", "approved", "rejected", "paid"}
 
 
 async def create_claim(
@@ -42,13 +48,48 @@ async def create_claim(
     Returns:
         Created claim details with compensation calculation
     """
+    from app.repositories import ClaimRepository
+    
+    departure_airport = departure_airport.strip().upper()
+    arrival_airport = arrival_airport.strip().upper()
+    warnings = []
+    route = None
+    if MCPConfig.AIRPORT_VALIDATION != "off":
+        errors, unknown = validate_route(departure_airport, arrival_airport)
+        if unknown and MCPConfig.AIRPORT_VALIDATION == "strict":
+            errors.append(f"Unknown airport code(s): {', '.join(unknown)}")
+        if errors:
+            return {
+                "success": False,
+                "errors": errors,
+                "message": "Invalid airports: " + "; ".join(errors)
+            }
+        if unknown:
+            warnings.append(f"Airport(s) not in the reference data: {', '.join(unknown)}")
+        route = route_band(departure_airport, arrival_airport)
+    
     try:
-        async with get_db_session() as session:
+        # Parse flight date
+        flight_date_obj = datetime.strptime(flight_date, "%Y-%m-%d").date()
+        
+        # Calculate compensation before the insert so the claim is written in one commit
+        compensation_amount = None
+        compensation_error = None
+        if delay_minutes and departure_airport and arrival_airport:
+            try:
+                compensation_amount = await compensation_calculator.calculate(
+                    departure_iata=departure_airport,
+                    arrival_iata=arrival_airport,
+                    delay_minutes=delay_minutes,
+                    incident_type=incident_type
+                )
+            except Exception as comp_error:
+                # The claim is still created, without an amount; the caller sees why
+                compensation_error = str(comp_error)
+        
+        async with get_db_session("create_claim") as session:
             repo = ClaimRepository(session)
             
-            # Parse flight date
-            flight_date_obj = datetime.strptime(flight_date, "%Y-%m-%d").date()
-            
             # Infer airline from flight number
             airline = "Unknown"
             if len(flight_number) >= 2:
@@ -65,31 +106,13 @@ async def create_claim(
                 incident_type=incident_type,
                 delay_hours=round(delay_minutes / 60, 2) if delay_minutes else None,
                 notes=description,
+                compensation_amount=compensation_amount,
                 status="submitted"
             )
             
-            # Calculate compensation if enough data
-            compensation_amount = None
-            if delay_minutes and departure_airport and arrival_airport:
-                try:
-                    comp_service = CompensationService()
-                    compensation_amount = await comp_service.calculate_compensation(
-                        departure_iata=departure_airport,
-                        arrival_iata=arrival_airport,
-                        delay_minutes=delay_minutes,
-                        incident_type=incident_type
-                    )
-                    
-                    # Update claim with compensation
-                    claim.compensation_amount = compensation_amount
-                    await session.commit()
-                except Exception as comp_error:
-                    # Compensation calculation failed but claim created
-                    pass
-            
-            return {
+            response = {
                 "success": True,
-                "claim_id": str(claim.id),
+                "claim_id": claim.id,
                 "status": claim.status,
                 "flight_number": claim.flight_number,
                 "flight_date": claim.departure_date.isoformat(),
@@ -97,25 +120,52 @@ async def create_claim(
                 "compensation_amount": compensation_amount,
                 "message": f"Claim created successfully: {claim.id}"
             }
+            if route:
+                response["distance_km"] = route["distance_km"]
+                response["distance_band"] = route["distance_band"]
+            if compensation_error:
+                response["compensation_error"] = compensation_error
+            if warnings:
+                response["warnings"] = warnings
+            return response
     except Exception as e:
-        return {
-            "success": False,
-            "error": str(e),
-            "message": "Failed to create claim"
-        }
+        return error_response(e, "Failed to create claim")
+
+
+def _claim_details(claim) -> Dict[str, Any]:
+    """Serialize a claim for get_claim/get_claims."""
+    return {
+        "id": claim.id,
+        "customer_id": claim.customer_id,
+        "flight_number": claim.flight_number,
+        "flight_date": claim.departure_date,
+        "departure_airport": claim.departure_airport,
+        "arrival_airport": claim.arrival_airport,
+        "incident_type": claim.incident_type,
+        "status": claim.status,
+        "delay_minutes": int(claim.delay_hours * 60) if claim.delay_hours else None,
+        "compensation_amount": claim.compensation_amount,
+        "description": claim.notes,
+        "submitted_at": claim.submitted_at,
+        "updated_at": claim.updated_at
+    }
 
 
-async def get_claim(claim_id: str) -> Dict[str, Any]:
+@cached(CLAIM, "claim_id")
+async def get_claim(claim_id: str, use_primary: bool = False) -> Dict[str, Any]:
     """Get claim by ID with full details.
     
     Args:
         claim_id: Claim ID (UUID)
+        use_primary: Read from the primary instead of the read replica (optional)
     
     Returns:
         Complete claim details
     """
+    from app.repositories import ClaimRepository
+    
     try:
-        async with get_db_session() as session:
+        async with get_read_session("get_claim", use_primary=use_primary) as session:
             repo = ClaimRepository(session)
             claim = await repo.get_by_id(claim_id)
             
@@ -127,36 +177,147 @@ async def get_claim(claim_id: str) -> Dict[str, Any]:
             
             return {
                 "success": True,
-                "claim": {
-                    "id": str(claim.id),
-                    "customer_id": str(claim.customer_id),
-                    "flight_number": claim.flight_number,
-                    "flight_date": claim.departure_date.isoformat() if claim.departure_date else None,
-                    "departure_airport": claim.departure_airport,
-                    "arrival_airport": claim.arrival_airport,
-                    "incident_type": claim.incident_type,
-                    "status": claim.status,
-                    "delay_minutes": int(claim.delay_hours * 60) if claim.delay_hours else None,
-                    "compensation_amount": float(claim.compensation_amount) if claim.compensation_amount else None,
-                    "description": claim.notes,
-                    "submitted_at": claim.submitted_at.isoformat() if claim.submitted_at else None,
-                    "updated_at": claim.updated_at.isoformat() if claim.updated_at else None
-                },
+                "claim": _claim_details(claim),
                 "message": "Claim retrieved successfully"
             }
     except Exception as e:
-        return {
-            "success": False,
-            "error": str(e),
-            "message": "Failed to retrieve claim"
-        }
+        return error_response(e, "Failed to retrieve claim")
+
+
+async def get_claims(claim_ids: List[str], use_primary: bool = False) -> Dict[str, Any]:
+    """Get many claims by ID with one query.
+    
+    Args:
+        claim_ids: Claim IDs (UUIDs, up to BATCH_GET_MAX_IDS)
+        use_primary: Read from the primary instead of the read replica (optional)
+    
+    Returns:
+        Claim details (same fields as get_claim), missing and invalid IDs
+    """
+    from app.models import Claim
+    
+    return await get_many("get_claims", Claim, claim_ids, _claim_details, "claims", use_primary)
+
+
+def _note_details(note) -> Dict[str, Any]:
+    """Serialize a claim note for get_claim_bundle."""
+    return {
+        "id": note.id,
+        "note": note.note,
+        "created_by": note.created_by,
+        "created_at": note.created_at
+    }
+
+
+def _history_details(history) -> Dict[str, Any]:
+    """Serialize a status history entry for get_claim_bundle."""
+    return {
+        "id": history.id,
+        "old_status": history.old_status,
+        "new_status": history.new_status,
+        "changed_by": history.changed_by,
+        "notes": history.notes,
+        "changed_at": history.changed_at
+    }
+
+
+async def get_claim_bundle(
+    claim_id: str,
+    include_customer: bool = True,
+    include_notes: bool = True,
+    include_history: bool = True,
+    include_files: bool = True,
+    section_limit: int = 50,
+    use_primary: bool = False
+) -> Dict[str, Any]:
+    """Get a claim with its customer, notes, status history and files.
+    
+    Uses one query for the claim (joined with its customer) plus one per
+    included section, all on the same connection.
+    
+    Args:
+        claim_id: Claim ID (UUID)
+        include_customer: Include the customer summary (default: True)
+        include_notes: Include admin notes (default: True)
+        include_history: Include the status history (default: True)
+        include_files: Include file summaries (default: True)
+        section_limit: Newest items per section (default: 50, max BUNDLE_MAX_SECTION_ITEMS)
+        use_primary: Read from the primary instead of the read replica (optional)
+    
+    Returns:
+        Claim details and the requested sections, newest first
+    """
+    from app.models import Claim, ClaimFile, ClaimNote, ClaimStatusHistory, Customer
+    
+    section_limit = max(1, min(section_limit, MCPConfig.BUNDLE_MAX_SECTION_ITEMS))
+    sections = []
+    if include_notes:
+        sections.append(("notes", ClaimNote, [ClaimNote.created_at.desc(), ClaimNote.id.desc()], _note_details))
+    if include_history:
+        sections.append((
+            "status_history",
+            ClaimStatusHistory,
+            [ClaimStatusHistory.changed_at.desc(), ClaimStatusHistory.id.desc()],
+            _history_details
+        ))
+    if include_files:
+        sections.append(("files", ClaimFile, [ClaimFile.uploaded_at.desc(), ClaimFile.id.desc()], file_summary))
+    
+    try:
+        async with get_read_session("get_claim_bundle", use_primary=use_primary) as session:
+            if include_customer:
+                query = select(Claim, Customer).outerjoin(Customer, Customer.id == Claim.customer_id)
+            else:
+                query = select(Claim)
+            row = (await session.execute(query.where(Claim.id == claim_id))).first()
+            
+            if not row:
+                return {
+                    "success": False,
+                    "message": f"Claim not found: {claim_id}"
+                }
+            
+            claim = row[0]
+            bundle = {"claim": _claim_details(claim)}
+            if include_customer:
+                customer = row[1]
+                bundle["customer"] = {
+                    "id": customer.id,
+                    "email": customer.email,
+                    "first_name": customer.first_name,
+                    "last_name": customer.last_name
+                } if customer else None
+            
+            truncated = []
+            for name, model, order, serialize in sections:
+                result = await session.execute(
+                    select(model)
+                    .where(model.claim_id == claim.id)
+                    .order_by(*order)
+                    .limit(section_limit + 1)
+                )
+                items = result.scalars().all()
+                if len(items) > section_limit:
+                    truncated.append(name)
+                bundle[name] = [serialize(item) for item in items[:section_limit]]
+            
+            return {
+                "success": True,
+                **bundle,
+                "truncated_sections": truncated,
+                "message": "Claim bundle retrieved successfully"
+            }
+    except Exception as e:
+        return error_response(e, "Failed to retrieve claim bundle")
 
 
 async def list_claims(
     customer_id: Optional[str] = None,
     status: Optional[str] = None,
     limit: int = 10,
-    offset: int = 0
+    offset: int = 0,
+    cursor: Optional[str] = None,
+    use_primary: bool = False
 ) -> Dict[str, Any]:
     """List claims with optional filters.
     
@@ -165,47 +326,50 @@ async def list_claims(
         status: Filter by status (optional)
         limit: Number of results (default: 10)
         offset: Number to skip (default: 0)
+        cursor: next_cursor from the previous page (optional, replaces offset)
+        use_primary: Read from the primary instead of the read replica (optional)
     
     Returns:
-        List of claims
+        List of claims and the cursor of the next page
     """
+    from app.models import Claim
+    
     try:
-        async with get_db_session() as session:
-            query = select(Claim).order_by(Claim.submitted_at.desc())
+        async with get_read_session("list_claims", use_primary=use_primary) as session:
+            query = select(Claim)
             
             if customer_id:
                 query = query.where(Claim.customer_id == customer_id)
             if status:
                 query = query.where(Claim.status == status)
             
-            query = query.limit(limit).offset(offset)
+            query = keyset_query(
+                query, "list_claims", Claim.submitted_at, Claim.id, limit, offset, cursor
+            )
             
             result = await session.execute(query)
-            claims = result.scalars().all()
+            claims, next_cursor = next_page(result.scalars().all(), "list_claims", "submitted_at", limit)
             
             return {
                 "success": True,
                 "count": len(claims),
                 "claims": [
                     {
-                        "id": str(c.id),
-                        "customer_id": str(c.customer_id),
+                        "id": c.id,
+                        "customer_id": c.customer_id,
                         "flight_number": c.flight_number,
-                        "flight_date": c.departure_date.isoformat() if c.departure_date else None,
+                        "flight_date": c.departure_date,
                         "status": c.status,
-                        "compensation_amount": float(c.compensation_amount) if c.compensation_amount else None,
-                        "submitted_at": c.submitted_at.isoformat() if c.submitted_at else None
+                        "compensation_amount": c.compensation_amount,
+                        "submitted_at": c.submitted_at
                     }
                     for c in claims
                 ],
+                "next_cursor": next_cursor,
                 "message": f"Retrieved {len(claims)} claims"
             }
     except Exception as e:
-        return {
-            "success": False,
-            "error": str(e),
-            "message": "Failed to list claims"
-        }
+        return error_response(e, "Failed to list claims")
 
 
 async def transition_claim_status(
@@ -225,8 +389,11 @@ async def transition_claim_status(
     Returns:
         Updated claim status
     """
+    from app.models import ClaimStatusHistory
+    from app.repositories import ClaimRepository
+    
     try:
-        async with get_db_session() as session:
+        async with get_db_session("transition_claim_status") as session:
             repo = ClaimRepository(session)
             claim = await repo.get_by_id(claim_id)
             
@@ -253,20 +420,17 @@ async def transition_claim_status(
                 session.add(history)
             
             await session.commit()
+            result_cache.invalidate(CLAIM, claim_id)
             
             return {
                 "success": True,
-                "claim_id": str(claim.id),
+                "claim_id": claim.id,
                 "old_status": old_status,
                 "new_status": new_status,
                 "message": f"Claim status updated from {old_status} to {new_status}"
             }
     except Exception as e:
-        return {
-            "success": False,
-            "error": str(e),
-            "message": "Failed to update claim status"
-        }
+        return error_response(e, "Failed to update claim status")
 
 
 async def add_claim_note(
@@ -284,8 +448,11 @@ async def add_claim_note(
     Returns:
         Note creation status
     """
+    from app.models import ClaimNote
+    from app.repositories import ClaimRepository
+    
     try:
-        async with get_db_session() as session:
+        async with get_db_session("add_claim_note") as session:
             repo = ClaimRepository(session)
             claim = await repo.get_by_id(claim_id)
             
@@ -303,16 +470,146 @@ async def add_claim_note(
             )
             session.add(claim_note)
             await session.commit()
+            result_cache.invalidate(CLAIM, claim_id)
             
             return {
                 "success": True,
-                "note_id": str(claim_note.id),
-                "claim_id": str(claim.id),
+                "note_id": claim_note.id,
+                "claim_id": claim.id,
                 "message": "Note added successfully"
             }
     except Exception as e:
+        return error_response(e, "Failed to add note")
+
+
+async def bulk_transition_claim_status(
+    new_status: str,
+    claim_ids: Optional[List[str]] = None,
+    status: Optional[str] = None,
+    customer_id: Optional[str] = None,
+    submitted_from: Optional[str] = None,
+    submitted_to: Optional[str] = None,
+    admin_id: Optional[str] = None,
+    note: Optional[str] = None
+) -> Dict[str, Any]:
+    """Transition many claims to a new status in one transaction.
+    
+    Claims are selected by ID list and/or filters. One UPDATE ... RETURNING
+    changes them all (claims already in new_status are left alone) and one
+    batched insert writes their status history rows.
+    
+    Args:
+        new_status: New status (submitted, under_review, approved, rejected, paid)
+        claim_ids: Claim IDs (optional)
+        status: Only claims currently in this status (optional)
+        customer_id: Only claims of this customer (optional)
+        submitted_from: Only claims submitted on or after this date, YYYY-MM-DD (optional)
+        submitted_to: Only claims submitted on or before this date, YYYY-MM-DD (optional)
+        admin_id: Admin user ID performing transition (optional)
+        note: Note stored on every history row (optional)
+    
+    Returns:
+        Per-claim old/new status and counts by previous status
+    """
+    from app.models import Claim, ClaimStatusHistory
+    
+    if new_status not in CLAIM_STATUSES:
+        return {
+            "success": False,
+            "message": f"new_status must be one of {sorted(CLAIM_STATUSES)}"
+        }
+    if not (claim_ids or status or customer_id or submitted_from or submitted_to):
+        return {
+            "success": False,
+            "message": "Provide claim_ids or at least one filter (status, customer_id, submitted_from, submitted_to)"
+        }
+    
+    max_claims = MCPConfig.BULK_TRANSITION_MAX_CLAIMS
+    if claim_ids and len(claim_ids) > max_claims:
+        return {
+            "success": False,
+            "message": f"Too many claim IDs: {len(claim_ids)} (max {max_claims})"
+        }
+    
+    valid_ids, invalid_ids = split_ids(claim_ids or [])
+    if claim_ids and not valid_ids:
         return {
             "success": False,
-            "error": str(e),
-            "message": "Failed to add note"
+            "invalid_ids": invalid_ids,
+            "message": "No valid claim IDs given"
         }
+    
+    try:
+        target = select(Claim.id, Claim.status.label("old_status")).where(Claim.status != new_status)
+        if claim_ids:
+            target = target.where(Claim.id.in_(valid_ids))
+        if status:
+            target = target.where(Claim.status == status)
+        if customer_id:
+            target = target.where(Claim.customer_id == customer_id)
+        if submitted_from:
+            start = datetime.strptime(submitted_from, "%Y-%m-%d")
+            target = target.where(Claim.submitted_at >= start)
+        if submitted_to:
+            end = datetime.strptime(submitted_to, "%Y-%m-%d") + timedelta(days=1)
+            target = target.where(Claim.submitted_at < end)
+        
+        # Lock the selected rows so old_status is the value being replaced
+        target = (
+            target.order_by(Claim.submitted_at, Claim.id)
+            .limit(max_claims)
+            .with_for_update()
+            .cte("target")
+        )
+        
+        async with get_db_session("bulk_transition_claim_status") as session:
+            result = await session.execute(
+                update(Claim)
+                .where(Claim.id == target.c.id)
+                .values(status=new_status)
+                .returning(Claim.id, target.c.old_status),
+                execution_options={"synchronize_session": False}
+            )
+            changed = result.all()
+            
+            if changed:
+                await session.execute(insert(ClaimStatusHistory), [
+                    {
+                        "claim_id": claim_id,
+                        "old_status": old_status,
+                        "new_status": new_status,
+                        "changed_by": admin_id,
+                        "notes": note
+                    }
+                    for claim_id, old_status in changed
+                ])
+            
+            await session.commit()
+        
+        if changed:
+            result_cache.invalidate_entity(CLAIM)
+        
+        by_old_status: Dict[str, int] = {}
+        for _, old_status in changed:
+            by_old_status[old_status] = by_old_status.get(old_status, 0) + 1
+        
+        response = {
+            "success": True,
+            "new_status": new_status,
+            "updated": len(changed),
+            "by_old_status": by_old_status,
+            "claims": [
+                {"claim_id": claim_id, "old_status": old_status, "new_status": new_status}
+                for claim_id, old_status in changed
+            ],
+            "limit_reached": len(changed) == max_claims,
+            "message": f"Moved {len(changed)} claims to {new_status}"
+        }
+        if claim_ids:
+            updated_ids = {str(claim_id) for claim_id, _ in changed}
+            # Not found, or already in new_status
+            response["not_updated_ids"] = [i for i in valid_ids if i not in updated_ids]
+            response["invalid_ids"] = invalid_ids
+        return response
+    except Exception as e:
+        return error_response(e, "Failed to bulk update claim status")
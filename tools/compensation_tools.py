@@ -0,0 +1,173 @@
+"""Bulk compensation recalculation."""
+import time
+from typing import Dict, Any, Optional, List
+import numpy as np
+from sqlalchemy import Numeric, bindparam, func, select, update
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
+from airports import route_band
+from cache import CLAIM, result_cache
+from compensation import calculate_many, compensation_calculator
+from config import MCPConfig
+from database import get_db_session, get_read_session
+from jobs import report_progress
+from tools.errors import error_response
+
+
+def _to_float(values) -> np.ndarray:
+    """Numeric column values (Decimal or None) as floats with NaN for NULL."""
+    return np.array([np.nan if value is None else float(value) for value in values], dtype=float)
+
+
+async def recalculate_compensation(
+    dry_run: bool = True,
+    status: Optional[str] = None,
+    max_changes_listed: int = 50
+) -> Dict[str, Any]:
+    """Recompute compensation_amount for all claims with CompensationService.
+    
+    Claims are streamed in chunks of RECALC_CHUNK_SIZE ordered by ID. Each
+    chunk is grouped with NumPy by route, delay bucket and incident type, and
+    every distinct key is calculated once through the shared compensation
+    calculator, so amounts match create_claim and import_claims exactly.
+    Changed amounts are written back with one UPDATE ... FROM unnest() per
+    chunk, all in one transaction. Claims whose calculation fails keep their
+    amount.
+    
+    Args:
+        dry_run: Only report the differences, write nothing (default: True)
+        status: Only claims in this status (optional)
+        max_changes_listed: Changed claims included in the response (default: 50)
+    
+    Returns:
+        Scanned/changed/failed counts, a sample of old -> new amounts and rows per second
+    """
+    from app.models import Claim
+    
+    chunk_size = MCPConfig.RECALC_CHUNK_SIZE
+    started = time.perf_counter()
+    
+    try:
+        # Ask the service afresh rather than trusting amounts cached before a rules change
+        compensation_calculator.clear()
+        
+        session_context = (
+            get_read_session("recalculate_compensation") if dry_run
+            else get_db_session("recalculate_compensation")
+        )
+        
+        scanned = 0
+        changed = 0
+        failed = 0
+        lookups = 0
+        changes: List[Dict[str, Any]] = []
+        totals = {"old": 0.0, "new": 0.0}
+        
+        async with session_context as session:
+            count_query = select(func.count()).select_from(Claim)
+            if status:
+                count_query = count_query.where(Claim.status == status)
+            total = await session.scalar(count_query)
+            
+            # One UPDATE per chunk, joining the claims to arrays of (id, amount)
+            values = func.unnest(
+                bindparam("ids", type_=ARRAY(UUID(as_uuid=True))),
+                bindparam("amounts", type_=ARRAY(Numeric(10, 2)))
+            ).table_valued("id", "amount").render_derived(name="new_amounts")
+            write = (
+                update(Claim)
+                .where(Claim.id == values.c.id)
+                .values(compensation_amount=values.c.amount)
+                .execution_options(synchronize_session=False)
+            )
+            
+            last_id = None
+            while True:
+                query = select(
+                    Claim.id,
+                    Claim.departure_airport,
+                    Claim.arrival_airport,
+                    Claim.incident_type,
+                    Claim.delay_hours,
+                    Claim.compensation_amount
+                ).order_by(Claim.id).limit(chunk_size)
+                if status:
+                    query = query.where(Claim.status == status)
+                if last_id is not None:
+                    query = query.where(Claim.id > last_id)
+                
+                rows = (await session.execute(query)).all()
+                if not rows:
+                    break
+                last_id = rows[-1].id
+                scanned += len(rows)
+                
+                ids, departures, arrivals, incidents, delay_hours, old = zip(*rows)
+                old_amounts = _to_float(old)
+                new_amounts, errors, distinct = await calculate_many(
+                    departures,
+                    arrivals,
+                    np.round(_to_float(delay_hours) * 60),
+                    incidents
+                )
+                known = ~errors
+                lookups += distinct
+                
+                both_null = np.isnan(old_amounts) & np.isnan(new_amounts)
+                differs = known & ~both_null & ~np.isclose(old_amounts, new_amounts)
+                failed += int(errors.sum())
+                totals["old"] += float(np.nansum(old_amounts[known]))
+                totals["new"] += float(np.nansum(new_amounts[known]))
+                
+                positions = np.flatnonzero(differs)
+                changed += len(positions)
+                for position in positions[:max(0, max_changes_listed - len(changes))]:
+                    band = route_band(departures[position] or "", arrivals[position] or "")
+                    changes.append({
+                        "claim_id": ids[position],
+                        "route": f"{departures[position]}-{arrivals[position]}",
+                        "incident_type": incidents[position],
+                        "delay_hours": delay_hours[position],
+                        "distance_band": band["distance_band"] if band else None,
+                        "old_amount": old[position],
+                        "new_amount": None if np.isnan(new_amounts[position]) else float(new_amounts[position])
+                    })
+                
+                if not dry_run and len(positions):
+                    await session.execute(write, {
+                        "ids": [ids[position] for position in positions],
+                        "amounts": [
+                            None if np.isnan(new_amounts[position]) else round(float(new_amounts[position]), 2)
+                            for position in positions
+                        ]
+                    })
+                
+                await report_progress(scanned, total, f"Recalculated {scanned} of {total} claims")
+            
+            if not dry_run:
+                await session.commit()
+        
+        if not dry_run and changed:
+            result_cache.invalidate_entity(CLAIM)
+        
+        elapsed = time.perf_counter() - started
+        return {
+            "success": True,
+            "dry_run": dry_run,
+            "scanned": scanned,
+            "changed": changed,
+            "unchanged": scanned - changed - failed,
+            "failed": failed,
+            "calculator_lookups": lookups,
+            "total_before": round(totals["old"], 2),
+            "total_after": round(totals["new"], 2),
+            "changes": changes,
+            "changes_truncated": changed > len(changes),
+            "elapsed_ms": round(elapsed * 1000, 2),
+            "rows_per_second": round(scanned / elapsed, 1) if elapsed else None,
+            "message": (
+                f"{'Would change' if dry_run else 'Changed'} {changed} of {scanned} "
+                f"compensation amounts ({failed} failed and left unchanged)"
+            )
+        }
+    except Exception as e:
+        return error_response(e, "Failed to recalculate compensation")
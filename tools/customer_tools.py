@@ -1,9 +1,11 @@
 """Customer management tools."""
 from typing import Dict, Any, Optional, List
 from sqlalchemy import select
-from database import get_db_session
-from app.models import Customer
-from app.repositories import CustomerRepository
+from cache import CLAIM, CUSTOMER, FILE, USER, cached, result_cache
+from database import get_db_session, get_read_session
+from tools.batch import get_many
+from tools.errors import error_response
+from tools.pagination import keyset_query, next_page
 
 
 async def create_customer(
@@ -31,8 +33,10 @@ async def create_customer(
     Returns:
         Created customer details
     """
+    from app.repositories import CustomerRepository
+    
     try:
-        async with get_db_session() as session:
+        async with get_db_session("create_customer") as session:
             repo = CustomerRepository(session)
             
             customer = await repo.create(
@@ -48,30 +52,43 @@ async def create_customer(
             
             return {
                 "success": True,
-                "customer_id": str(customer.id),
+                "customer_id": customer.id,
                 "email": customer.email,
                 "name": f"{customer.first_name} {customer.last_name}",
                 "message": f"Customer created successfully with ID: {customer.id}"
             }
     except Exception as e:
-        return {
-            "success": False,
-            "error": str(e),
-            "message": "Failed to create customer"
-        }
+        return error_response(e, "Failed to create customer")
+
 
+def _customer_details(customer) -> Dict[str, Any]:
+    """Serialize a customer for get_customer/get_customers."""
+    return {
+        "id": customer.id,
+        "email": customer.email,
+        "first_name": customer.first_name,
+        "last_name": customer.last_name,
+        "phone": customer.phone,
+        "address": customer.address,
+        "created_at": customer.created_at
+    }
 
-async def get_customer(customer_id: str) -> Dict[str, Any]:
+
+@cached(CUSTOMER, "customer_id")
+async def get_customer(customer_id: str, use_primary: bool = False) -> Dict[str, Any]:
     """Get customer by ID.
     
     Args:
         customer_id: Customer ID (UUID)
+        use_primary: Read from the primary instead of the read replica (optional)
     
     Returns:
         Customer details
     """
+    from app.repositories import CustomerRepository
+    
     try:
-        async with get_db_session() as session:
+        async with get_read_session("get_customer", use_primary=use_primary) as session:
             repo = CustomerRepository(session)
             customer = await repo.get_by_id(customer_id)
             
@@ -83,36 +100,44 @@ async def get_customer(customer_id: str) -> Dict[str, Any]:
             
             return {
                 "success": True,
-                "customer": {
-                    "id": str(customer.id),
-                    "email": customer.email,
-                    "first_name": customer.first_name,
-                    "last_name": customer.last_name,
-                    "phone": customer.phone,
-                    "address": customer.address,
-                    "created_at": customer.created_at.isoformat() if customer.created_at else None
-                },
+                "customer": _customer_details(customer),
                 "message": "Customer retrieved successfully"
             }
     except Exception as e:
-        return {
-            "success": False,
-            "error": str(e),
-            "message": "Failed to retrieve customer"
-        }
+        return error_response(e, "Failed to retrieve customer")
 
 
-async def get_customer_by_email(email: str) -> Dict[str, Any]:
+async def get_customers(customer_ids: List[str], use_primary: bool = False) -> Dict[str, Any]:
+    """Get many customers by ID with one query.
+    
+    Args:
+        customer_ids: Customer IDs (UUIDs, up to BATCH_GET_MAX_IDS)
+        use_primary: Read from the primary instead of the read replica (optional)
+    
+    Returns:
+        Customer details (same fields as get_customer), missing and invalid IDs
+    """
+    from app.models import Customer
+    
+    return await get_many(
+        "get_customers", Customer, customer_ids, _customer_details, "customers", use_primary
+    )
+
+
+async def get_customer_by_email(email: str, use_primary: bool = False) -> Dict[str, Any]:
     """Get customer by email address.
     
     Args:
         email: Customer email
+        use_primary: Read from the primary instead of the read replica (optional)
     
     Returns:
         Customer details or not found
     """
+    from app.models import Customer
+    
     try:
-        async with get_db_session() as session:
+        async with get_read_session("get_customer_by_email", use_primary=use_primary) as session:
             result = await session.execute(
                 select(Customer).where(Customer.email == email)
             )
@@ -129,65 +154,67 @@ async def get_customer_by_email(email: str) -> Dict[str, Any]:
                 "success": True,
                 "found": True,
                 "customer": {
-                    "id": str(customer.id),
+                    "id": customer.id,
                     "email": customer.email,
                     "first_name": customer.first_name,
                     "last_name": customer.last_name,
                     "phone": customer.phone,
                     "address": customer.address,
-                    "created_at": customer.created_at.isoformat() if customer.created_at else None
+                    "created_at": customer.created_at
                 },
                 "message": f"Customer found: {customer.first_name} {customer.last_name}"
             }
     except Exception as e:
-        return {
-            "success": False,
-            "error": str(e),
-            "message": "Failed to search for customer"
-        }
+        return error_response(e, "Failed to search for customer")
 
 
-async def list_customers(limit: int = 10, offset: int = 0) -> Dict[str, Any]:
+async def list_customers(
+    limit: int = 10,
+    offset: int = 0,
+    cursor: Optional[str] = None,
+    use_primary: bool = False
+) -> Dict[str, Any]:
     """List customers with pagination.
     
     Args:
         limit: Number of results to return (default: 10)
         offset: Number of results to skip (default: 0)
+        cursor: next_cursor from the previous page (optional, replaces offset)
+        use_primary: Read from the primary instead of the read replica (optional)
     
     Returns:
-        List of customers
+        List of customers and the cursor of the next page
     """
+    from app.models import Customer
+    
     try:
-        async with get_db_session() as session:
-            result = await session.execute(
-                select(Customer)
-                .order_by(Customer.created_at.desc())
-                .limit(limit)
-                .offset(offset)
+        async with get_read_session("list_customers", use_primary=use_primary) as session:
+            result = await session.execute(keyset_query(
+                select(Customer), "list_customers", Customer.created_at, Customer.id,
+                limit, offset, cursor
+            ))
+            customers, next_cursor = next_page(
+                result.scalars().all(), "list_customers", "created_at", limit
             )
-            customers = result.scalars().all()
             
             return {
                 "success": True,
                 "count": len(customers),
                 "customers": [
                     {
-                        "id": str(c.id),
+                        "id": c.id,
                         "email": c.email,
                         "name": f"{c.first_name} {c.last_name}",
                         "phone": c.phone,
-                        "created_at": c.created_at.isoformat() if c.created_at else None
+                        "created_at": c.created_at
                     }
                     for c in customers
                 ],
+                "next_cursor": next_cursor,
                 "message": f"Retrieved {len(customers)} customers"
             }
     except Exception as e:
-        return {
-            "success": False,
-            "error": str(e),
-            "message": "Failed to list customers"
-        }
+        return error_response(e, "Failed to list customers")
 
 
 async def delete_customer(customer_id: str) -> Dict[str, Any]:
@@ -199,8 +226,10 @@ async def delete_customer(customer_id: str) -> Dict[str, Any]:
     Returns:
         Deletion status
     """
+    from app.repositories import CustomerRepository
+    
     try:
-        async with get_db_session() as session:
+        async with get_db_session("delete_customer") as session:
             repo = CustomerRepository(session)
             customer = await repo.get_by_id(customer_id)
             
@@ -211,14 +240,17 @@ async def delete_customer(customer_id: str) -> Dict[str, Any]:
                 }
             
             await repo.delete(customer_id)
+            await session.commit()
+            
+            # Customers and users share a table; claims and files may cascade
+            result_cache.invalidate(CUSTOMER, customer_id)
+            result_cache.invalidate(USER, customer_id)
+            result_cache.invalidate_entity(CLAIM)
+            result_cache.invalidate_entity(FILE)
             
             return {
                 "success": True,
                 "message": f"Customer deleted successfully: {customer_id}"
             }
     except Exception as e:
-        return {
-            "success": False,
-            "error": str(e),
-            "message": "Failed to delete customer"
-        }
+        return error_response(e, "Failed to delete customer")
@@ -3,9 +3,12 @@ from typing import Dict, Any, Optional
 from datetime import datetime, date, timedelta
 import random
 import uuid
-from database import get_db_session
-from app.models import Customer, Claim
-from app.repositories import CustomerRepository, ClaimRepository
+from airports import airport_index
+from cache import result_cache
+from compensation import compensation_calculator
+from database import get_db_session, get_read_session
+from jobs import report_progress
+from tools.errors import error_response
 
 
 async def seed_realistic_data(scenario: str = "basic", count: int = 5) -> Dict[str, Any]:
@@ -18,8 +21,10 @@ async def seed_realistic_data(scenario: str = "basic", count: int = 5) -> Dict[s
     Returns:
         Summary of created entities
     """
+    from app.repositories import CustomerRepository, ClaimRepository
+    
     try:
-        async with get_db_session() as session:
+        async with get_db_session("seed_realistic_data") as session:
             customers_created = []
             claims_created = []
             
@@ -32,7 +37,10 @@ async def seed_realistic_data(scenario: str = "basic", count: int = 5) -> Dict[s
             cities = ["Berlin", "London", "Paris", "Madrid", "Rome", "Amsterdam", "Brussels", "Vienna"]
             countries = ["Germany", "UK", "France", "Spain", "Italy", "Netherlands", "Belgium", "Austria"]
             
-            airports = ["FRA", "MUC", "LHR", "CDG", "MAD", "FCO", "AMS", "BRU"]
+            # Departures from airports where EU261 applies, arrivals anywhere in the reference data
+            index = airport_index.ensure_loaded()
+            departures = index.eu261_codes()
+            arrivals = index.codes.tolist()
             airlines = ["LH", "BA", "AF", "IB", "AZ", "KL", "SN"]
             incident_types = ["delay", "cancellation", "denied_boarding", "missed_connection"]
             statuses = ["submitted", "under_review", "approved", "rejected", "paid"]
@@ -61,8 +69,8 @@ async def seed_realistic_data(scenario: str = "basic", count: int = 5) -> Dict[s
                 num_claims = random.randint(1, 3 if scenario == "complex" else 1)
                 
                 for j in range(num_claims):
-                    departure = random.choice(airports)
-                    arrival = random.choice([a for a in airports if a != departure])
+                    departure = random.choice(departures)
+                    arrival = random.choice([a for a in arrivals if a != departure])
                     airline = random.choice(airlines)
                     flight_num = f"{airline}{random.randint(100, 999)}"
                     
@@ -71,22 +79,15 @@ async def seed_realistic_data(scenario: str = "basic", count: int = 5) -> Dict[s
                     incident = random.choice(incident_types)
                     status = random.choice(statuses) if scenario == "mixed" else "submitted"
                     
-                    # Calculate compensation based on distance
-                    distance_map = {
-                        ("FRA", "LHR"): 650,
-                        ("LHR", "CDG"): 350,
-                        ("MAD", "FCO"): 1400,
-                    }
-                    distance = distance_map.get((departure, arrival), 1000)
-                    
-                    if delay >= 180:
-                        if distance <= 1500:
-                            compensation = 250.0
-                        elif distance <= 3500:
-                            compensation = 400.0
-                        else:
-                            compensation = 600.0
-                    else:
+                    # Same calculation as create_claim, so recalculate_compensation leaves seeded claims alone
+                    try:
+                        compensation = await compensation_calculator.calculate(
+                            departure_iata=departure,
+                            arrival_iata=arrival,
+                            delay_minutes=compensation_calculator.bucket(delay),
+                            incident_type=incident
+                        )
+                    except Exception:
                         compensation = None
                     
                     claim = await claim_repo.create(
@@ -102,6 +103,8 @@ async def seed_realistic_data(scenario: str = "basic", count: int = 5) -> Dict[s
                         description=f"Test {incident} on flight {flight_num}"
                     )
                     claims_created.append(str(claim.id))
+                
+                await report_progress(i + 1, count, f"Created {i + 1} of {count} customers")
             
             return {
                 "success": True,
@@ -115,11 +118,7 @@ async def seed_realistic_data(scenario: str = "basic", count: int = 5) -> Dict[s
                 "message": f"Created {len(customers_created)} customers and {len(claims_created)} claims"
             }
     except Exception as e:
-        return {
-            "success": False,
-            "error": str(e),
-            "message": "Failed to seed test data"
-        }
+        return error_response(e, "Failed to seed test data")
 
 
 async def create_test_scenario(
@@ -135,8 +134,10 @@ async def create_test_scenario(
     Returns:
         Created entities
     """
+    from app.repositories import CustomerRepository, ClaimRepository
+    
     try:
-        async with get_db_session() as session:
+        async with get_db_session("create_test_scenario") as session:
             customer_repo = CustomerRepository(session)
             claim_repo = ClaimRepository(session)
             
@@ -198,17 +199,13 @@ async def create_test_scenario(
             return {
                 "success": True,
                 "scenario_type": scenario_type,
-                "customer_id": str(customer.id),
-                "claim_id": str(claim.id),
+                "customer_id": customer.id,
+                "claim_id": claim.id,
                 "email": email,
                 "message": f"Test scenario created: {scenario_type}"
             }
     except Exception as e:
-        return {
-            "success": False,
-            "error": str(e),
-            "message": "Failed to create test scenario"
-        }
+        return error_response(e, "Failed to create test scenario")
 
 
 async def reset_database() -> Dict[str, Any]:
@@ -228,29 +225,31 @@ async def reset_database() -> Dict[str, Any]:
         }
     
     try:
-        async with get_db_session() as session:
+        async with get_db_session("reset_database") as session:
             from sqlalchemy import text
             
             # Delete in order to respect foreign keys
-            await session.execute(text("DELETE FROM claim_events"))
-            await session.execute(text("DELETE FROM claim_notes"))
-            await session.execute(text("DELETE FROM claim_status_history"))
-            await session.execute(text("DELETE FROM claim_files"))
-            await session.execute(text("DELETE FROM claims"))
-            await session.execute(text("DELETE FROM customers WHERE email LIKE '%@test.com'"))
+            statements = [
+                "DELETE FROM claim_events",
+                "DELETE FROM claim_notes",
+                "DELETE FROM claim_status_history",
+                "DELETE FROM claim_files",
+                "DELETE FROM claims",
+                "DELETE FROM customers WHERE email LIKE '%@test.com'",
+            ]
+            for step, statement in enumerate(statements, 1):
+                await session.execute(text(statement))
+                await report_progress(step, len(statements), statement)
             
             await session.commit()
+            result_cache.clear()
             
             return {
                 "success": True,
                 "message": "Database reset successfully (test data cleared)"
             }
     except Exception as e:
-        return {
-            "success": False,
-            "error": str(e),
-            "message": "Failed to reset database"
-        }
+        return error_response(e, "Failed to reset database")
 
 
 async def validate_data_integrity() -> Dict[str, Any]:
@@ -260,7 +259,7 @@ async def validate_data_integrity() -> Dict[str, Any]:
         Validation report
     """
     try:
-        async with get_db_session() as session:
+        async with get_read_session("validate_data_integrity", deferrable=True) as session:
             from sqlalchemy import text
             
             issues = []
@@ -272,6 +271,7 @@ async def validate_data_integrity() -> Dict[str, Any]:
             orphaned_claims = result.scalar()
             if orphaned_claims > 0:
                 issues.append(f"{orphaned_claims} orphaned claims (missing customer)")
+            await report_progress(1, 2, "Checked claims")
             
             # Check for files without claims
             result = await session.execute(text(
@@ -280,6 +280,7 @@ async def validate_data_integrity() -> Dict[str, Any]:
             orphaned_files = result.scalar()
             if orphaned_files > 0:
                 issues.append(f"{orphaned_files} orphaned files (missing claim)")
+            await report_progress(2, 2, "Checked files")
             
             return {
                 "success": True,
@@ -288,8 +289,4 @@ async def validate_data_integrity() -> Dict[str, Any]:
                 "message": "Data integrity check complete"
             }
     except Exception as e:
-        return {
-            "success": False,
-            "error": str(e),
-            "message": "Failed to validate data integrity"
-        }
+        return error_response(e, "Failed to validate data integrity")
@@ -0,0 +1,50 @@
+"""Runtime diagnostics tools (query instrumentation, session and cache statistics)."""
+from typing import Dict, Any
+from admission import get_admission_stats
+from cache import result_cache
+from coalescing import get_coalescing_stats
+from compensation import compensation_calculator
+from config import MCPConfig
+from database import query_stats, get_pool_status, get_session_stats
+from jobs import job_runner
+
+
+async def get_diagnostics(reset: bool = False) -> Dict[str, Any]:
+    """Get runtime statistics and the per-tool SQL statement statistics collected by the engine hooks.
+    
+    Args:
+        reset: Clear the query and cache statistics after reading them (default: False)
+    
+    Returns:
+        Per-tool statement counts, timings, rows and N+1 findings
+        (only with QUERY_INSTRUMENTATION), plus pool, session, admission
+        control, result cache, coalescing, compensation cache and job statistics
+    """
+    instrumented = MCPConfig.QUERY_INSTRUMENTATION
+    queries = query_stats.snapshot() if instrumented else None
+    cache = result_cache.snapshot()
+    compensation = compensation_calculator.snapshot()
+    if reset:
+        if instrumented:
+            query_stats.reset()
+        result_cache.reset_stats()
+        compensation_calculator.reset_stats()
+    
+    response = {
+        "success": True,
+        "query_instrumentation": instrumented,
+        "pool": get_pool_status(),
+        "sessions": get_session_stats(),
+        "admission": get_admission_stats(),
+        "cache": cache,
+        "coalescing": get_coalescing_stats(),
+        "compensation_cache": compensation,
+        "jobs": job_runner.counts(),
+    }
+    if instrumented:
+        response["n_plus_one_threshold"] = MCPConfig.N_PLUS_ONE_THRESHOLD
+        response["queries"] = queries
+        response["message"] = f"Query statistics for {len(queries)} tools"
+    else:
+        response["message"] = "Query instrumentation is disabled. Set QUERY_INSTRUMENTATION=true for per-tool query statistics"
+    return response
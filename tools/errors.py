@@ -0,0 +1,32 @@
+"""Shared failure responses for MCP tools."""
+from typing import Dict, Any
+from database import StatementTimeoutError
+
+
+def error_response(error: Exception, message: str) -> Dict[str, Any]:
+    """Build the failure result returned by a tool.
+    
+    Statement timeouts get a structured "timed_out" result so clients can
+    tell them apart from other failures and retry with a narrower query.
+    
+    Args:
+        error: Exception raised by the tool
+        message: Human-readable failure message
+    
+    Returns:
+        Failure response
+    """
+    if isinstance(error, StatementTimeoutError):
+        return {
+            "success": False,
+            "timed_out": True,
+            "timeout_ms": error.timeout_ms,
+            "error": str(error),
+            "message": f"{message}: query timed out after {error.timeout_ms} ms"
+        }
+    
+    return {
+        "success": False,
+        "error": str(error),
+        "message": message
+    }
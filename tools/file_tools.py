@@ -1,22 +1,41 @@
 """File management tools."""
 from typing import Dict, Any, Optional, List
 from sqlalchemy import select
-from database import get_db_session
-from app.models import ClaimFile, Claim
-from app.repositories.file_repository import FileRepository
+from cache import FILE, cached, result_cache
+from database import get_db_session, get_read_session
+from tools.batch import get_many
+from tools.errors import error_response
+from tools.pagination import keyset_query, next_page
 
 
-async def list_claim_files(claim_id: str) -> Dict[str, Any]:
+def file_summary(file) -> Dict[str, Any]:
+    """Serialize a file for list_claim_files/get_claim_bundle."""
+    return {
+        "id": file.id,
+        "filename": file.filename,
+        "document_type": file.document_type,
+        "file_size": int(file.file_size) if file.file_size else 0,
+        "mime_type": file.mime_type,
+        "encryption_status": file.encryption_status,
+        "status": file.status,
+        "uploaded_at": file.uploaded_at
+    }
+
+
+async def list_claim_files(claim_id: str, use_primary: bool = False) -> Dict[str, Any]:
     """List all files for a claim.
     
     Args:
         claim_id: Claim ID (UUID)
+        use_primary: Read from the primary instead of the read replica (optional)
     
     Returns:
         List of files with metadata
     """
+    from app.models import ClaimFile
+    
     try:
-        async with get_db_session() as session:
+        async with get_read_session("list_claim_files", use_primary=use_primary) as session:
             result = await session.execute(
                 select(ClaimFile)
                 .where(ClaimFile.claim_id == claim_id)
@@ -28,40 +47,48 @@ async def list_claim_files(claim_id: str) -> Dict[str, Any]:
                 "success": True,
                 "claim_id": claim_id,
                 "count": len(files),
-                "files": [
-                    {
-                        "id": str(f.id),
-                        "filename": f.filename,
-                        "document_type": f.document_type,
-                        "file_size": int(f.file_size) if f.file_size else 0,
-                        "mime_type": f.mime_type,
-                        "encryption_status": f.encryption_status,
-                        "status": f.status,
-                        "uploaded_at": f.uploaded_at.isoformat() if f.uploaded_at else None
-                    }
-                    for f in files
-                ],
+                "files": [file_summary(f) for f in files],
                 "message": f"Found {len(files)} files for claim {claim_id}"
             }
     except Exception as e:
-        return {
-            "success": False,
-            "error": str(e),
-            "message": "Failed to list claim files"
-        }
+        return error_response(e, "Failed to list claim files")
+
+
+def _file_metadata(file) -> Dict[str, Any]:
+    """Serialize a file for get_file_metadata/get_files_metadata."""
+    return {
+        "id": file.id,
+        "claim_id": file.claim_id,
+        "filename": file.filename,
+        "original_filename": file.original_filename,
+        "document_type": file.document_type,
+        "file_size": int(file.file_size) if file.file_size else 0,
+        "mime_type": file.mime_type,
+        "storage_path": file.storage_path,
+        "encryption_status": file.encryption_status,
+        "file_hash": file.file_hash,
+        "status": file.status,
+        "validation_status": file.validation_status,
+        "uploaded_at": file.uploaded_at,
+        "uploaded_by": file.uploaded_by
+    }
 
 
-async def get_file_metadata(file_id: str) -> Dict[str, Any]:
+@cached(FILE, "file_id")
+async def get_file_metadata(file_id: str, use_primary: bool = False) -> Dict[str, Any]:
     """Get detailed file metadata.
     
     Args:
         file_id: File ID (UUID)
+        use_primary: Read from the primary instead of the read replica (optional)
     
     Returns:
         Complete file metadata
     """
+    from app.repositories.file_repository import FileRepository
+    
     try:
-        async with get_db_session() as session:
+        async with get_read_session("get_file_metadata", use_primary=use_primary) as session:
             repo = FileRepository(session)
             file = await repo.get_by_id(file_id)
             
@@ -73,43 +100,44 @@ async def get_file_metadata(file_id: str) -> Dict[str, Any]:
             
             return {
                 "success": True,
-                "file": {
-                    "id": str(file.id),
-                    "claim_id": str(file.claim_id),
-                    "filename": file.filename,
-                    "original_filename": file.original_filename,
-                    "document_type": file.document_type,
-                    "file_size": int(file.file_size) if file.file_size else 0,
-                    "mime_type": file.mime_type,
-                    "storage_path": file.storage_path,
-                    "encryption_status": file.encryption_status,
-                    "file_hash": file.file_hash,
-                    "status": file.status,
-                    "validation_status": file.validation_status,
-                    "uploaded_at": file.uploaded_at.isoformat() if file.uploaded_at else None,
-                    "uploaded_by": str(file.uploaded_by) if file.uploaded_by else None
-                },
+                "file": _file_metadata(file),
                 "message": "File metadata retrieved successfully"
             }
     except Exception as e:
-        return {
-            "success": False,
-            "error": str(e),
-            "message": "Failed to retrieve file metadata"
-        }
+        return error_response(e, "Failed to retrieve file metadata")
 
 
-async def get_file_validation_status(file_id: str) -> Dict[str, Any]:
+async def get_files_metadata(file_ids: List[str], use_primary: bool = False) -> Dict[str, Any]:
+    """Get metadata of many files by ID with one query.
+    
+    Args:
+        file_ids: File IDs (UUIDs, up to BATCH_GET_MAX_IDS)
+        use_primary: Read from the primary instead of the read replica (optional)
+    
+    Returns:
+        File metadata (same fields as get_file_metadata), missing and invalid IDs
+    """
+    from app.models import ClaimFile
+    
+    return await get_many(
+        "get_files_metadata", ClaimFile, file_ids, _file_metadata, "files", use_primary
+    )
+
+
+async def get_file_validation_status(file_id: str, use_primary: bool = False) -> Dict[str, Any]:
     """Get file validation and security scan status.
     
     Args:
         file_id: File ID (UUID)
+        use_primary: Read from the primary instead of the read replica (optional)
     
     Returns:
         Validation and scan results
     """
+    from app.repositories.file_repository import FileRepository
+    
     try:
-        async with get_db_session() as session:
+        async with get_read_session("get_file_validation_status", use_primary=use_primary) as session:
             repo = FileRepository(session)
             file = await repo.get_by_id(file_id)
             
@@ -121,7 +149,7 @@ async def get_file_validation_status(file_id: str) -> Dict[str, Any]:
             
             return {
                 "success": True,
-                "file_id": str(file.id),
+                "file_id": file.id,
                 "filename": file.filename,
                 "validation": {
                     "status": file.validation_status,
@@ -136,11 +164,7 @@ async def get_file_validation_status(file_id: str) -> Dict[str, Any]:
                 "message": f"File validation status: {file.validation_status}"
             }
     except Exception as e:
-        return {
-            "success": False,
-            "error": str(e),
-            "message": "Failed to get file validation status"
-        }
+        return error_response(e, "Failed to get file validation status")
 
 
 async def approve_file(file_id: str, admin_id: Optional[str] = None) -> Dict[str, Any]:
@@ -153,8 +177,10 @@ async def approve_file(file_id: str, admin_id: Optional[str] = None) -> Dict[str
     Returns:
         Approval status
     """
+    from app.repositories.file_repository import FileRepository
+    
     try:
-        async with get_db_session() as session:
+        async with get_db_session("approve_file") as session:
             repo = FileRepository(session)
             file = await repo.get_by_id(file_id)
             
@@ -168,21 +194,18 @@ async def approve_file(file_id: str, admin_id: Optional[str] = None) -> Dict[str
             file.validation_status = "approved"
             file.status = "approved"
             await session.commit()
+            result_cache.invalidate(FILE, file_id)
             
             return {
                 "success": True,
-                "file_id": str(file.id),
+                "file_id": file.id,
                 "filename": file.filename,
                 "validation_status": "approved",
                 "approved_by": admin_id,
                 "message": f"File approved: {file.filename}"
             }
     except Exception as e:
-        return {
-            "success": False,
-            "error": str(e),
-            "message": "Failed to approve file"
-        }
+        return error_response(e, "Failed to approve file")
 
 
 async def reject_file(
@@ -200,8 +223,10 @@ async def reject_file(
     Returns:
         Rejection status
     """
+    from app.repositories.file_repository import FileRepository
+    
     try:
-        async with get_db_session() as session:
+        async with get_db_session("reject_file") as session:
             repo = FileRepository(session)
             file = await repo.get_by_id(file_id)
             
@@ -216,10 +241,11 @@ async def reject_file(
             file.status = "rejected"
             file.rejection_reason = reason
             await session.commit()
+            result_cache.invalidate(FILE, file_id)
             
             return {
                 "success": True,
-                "file_id": str(file.id),
+                "file_id": file.id,
                 "filename": file.filename,
                 "validation_status": "rejected",
                 "reason": reason,
@@ -227,11 +253,7 @@ async def reject_file(
                 "message": f"File rejected: {file.filename}"
             }
     except Exception as e:
-        return {
-            "success": False,
-            "error": str(e),
-            "message": "Failed to reject file"
-        }
+        return error_response(e, "Failed to reject file")
 
 
 async def delete_file(file_id: str) -> Dict[str, Any]:
@@ -243,8 +265,10 @@ async def delete_file(file_id: str) -> Dict[str, Any]:
     Returns:
         Deletion status
     """
+    from app.repositories.file_repository import FileRepository
+    
     try:
-        async with get_db_session() as session:
+        async with get_db_session("delete_file") as session:
             repo = FileRepository(session)
             file = await repo.get_by_id(file_id)
             
@@ -256,6 +280,8 @@ async def delete_file(file_id: str) -> Dict[str, Any]:
             
             filename = file.filename
             await repo.delete(file_id)
+            await session.commit()
+            result_cache.invalidate(FILE, file_id)
             
             return {
                 "success": True,
@@ -264,17 +290,15 @@ async def delete_file(file_id: str) -> Dict[str, Any]:
                 "message": f"File deleted: {filename}"
             }
     except Exception as e:
-        return {
-            "success": False,
-            "error": str(e),
-            "message": "Failed to delete file"
-        }
+        return error_response(e, "Failed to delete file")
 
 
 async def get_files_by_status(
     validation_status: str,
     limit: int = 10,
-    offset: int = 0
+    offset: int = 0,
+    cursor: Optional[str] = None,
+    use_primary: bool = False
 ) -> Dict[str, Any]:
     """Get files by validation status.
     
@@ -282,20 +306,24 @@ async def get_files_by_status(
         validation_status: Status (pending, approved, rejected)
         limit: Number of results (default: 10)
         offset: Number to skip (default: 0)
+        cursor: next_cursor from the previous page (optional, replaces offset)
+        use_primary: Read from the primary instead of the read replica (optional)
     
     Returns:
-        List of files with given status
+        List of files with given status and the cursor of the next page
     """
+    from app.models import ClaimFile
+    
     try:
-        async with get_db_session() as session:
-            result = await session.execute(
-                select(ClaimFile)
-                .where(ClaimFile.validation_status == validation_status)
-                .order_by(ClaimFile.uploaded_at.desc())
-                .limit(limit)
-                .offset(offset)
+        async with get_read_session("get_files_by_status", use_primary=use_primary) as session:
+            result = await session.execute(keyset_query(
+                select(ClaimFile).where(ClaimFile.validation_status == validation_status),
+                "get_files_by_status", ClaimFile.uploaded_at, ClaimFile.id,
+                limit, offset, cursor
+            ))
+            files, next_cursor = next_page(
+                result.scalars().all(), "get_files_by_status", "uploaded_at", limit
             )
-            files = result.scalars().all()
             
             return {
                 "success": True,
@@ -303,20 +331,17 @@ async def get_files_by_status(
                 "count": len(files),
                 "files": [
                     {
-                        "id": str(f.id),
-                        "claim_id": str(f.claim_id),
+                        "id": f.id,
+                        "claim_id": f.claim_id,
                         "filename": f.filename,
                         "document_type": f.document_type,
                         "file_size": f.file_size,
-                        "uploaded_at": f.uploaded_at.isoformat() if f.uploaded_at else None
+                        "uploaded_at": f.uploaded_at
                     }
                     for f in files
                 ],
+                "next_cursor": next_cursor,
                 "message": f"Found {len(files)} files with status '{validation_status}'"
             }
     except Exception as e:
-        return {
-            "success": False,
-            "error": str(e),
-            "message": "Failed to get files by status"
-        }
+        return error_response(e, "Failed to get files by status")
@@ -1,8 +1,9 @@
 """Health check and system information tools."""
 from typing import Dict, Any
 from sqlalchemy import select, func, text
-from database import get_db_session
-from app.models import Customer, Claim, ClaimFile
+from database import get_read_session, get_pool_status, get_session_stats
+from tools.errors import error_response
+from lifecycle import app_context
 
 
 async def health_check() -> Dict[str, Any]:
@@ -12,18 +13,19 @@ async def health_check() -> Dict[str, Any]:
         Health status with database connection info
     """
     try:
-        async with get_db_session() as session:
-            # Test database connection
-            result = await session.execute(text("SELECT version()"))
-            db_version = result.scalar()
+        async with get_read_session("health_check", use_primary=True) as session:
+            # Test database connection (the version is read once at startup)
+            await session.execute(text("SELECT 1"))
             
             return {
                 "success": True,
                 "status": "healthy",
                 "database": {
                     "connected": True,
-                    "version": db_version
+                    "version": app_context.reference.get("db_version")
                 },
+                "pool": get_pool_status(),
+                "sessions": get_session_stats(),
                 "message": "MCP server is running and database is connected"
             }
     except Exception as e:
@@ -31,18 +33,26 @@ async def health_check() -> Dict[str, Any]:
             "success": False,
             "status": "unhealthy",
             "error": str(e),
+            "pool": get_pool_status(),
             "message": "Database connection failed"
         }
 
 
-async def get_database_stats() -> Dict[str, Any]:
+async def get_database_stats(use_primary: bool = False) -> Dict[str, Any]:
     """Get database statistics (counts of various entities).
     
+    Args:
+        use_primary: Read from the primary instead of the read replica (optional)
+    
     Returns:
         Counts of customers, claims, files
     """
+    from app.models import Customer, Claim, ClaimFile
+    
     try:
-        async with get_db_session() as session:
+        async with get_read_session(
+            "get_database_stats", deferrable=True, use_primary=use_primary
+        ) as session:
             # Count customers
             customers_count = await session.scalar(select(func.count(Customer.id)))
             
@@ -72,11 +82,7 @@ async def get_database_stats() -> Dict[str, Any]:
                 "message": "Database statistics retrieved successfully"
             }
     except Exception as e:
-        return {
-            "success": False,
-            "error": str(e),
-            "message": "Failed to retrieve database statistics"
-        }
+        return error_response(e, "Failed to retrieve database statistics")
 
 
 async def get_environment_info() -> Dict[str, Any]:
@@ -94,9 +100,27 @@ async def get_environment_info() -> Dict[str, Any]:
             "mode": MCPConfig.ENVIRONMENT,
             "python_version": sys.version,
             "database_url": MCPConfig.DATABASE_URL.split("@")[-1] if "@" in MCPConfig.DATABASE_URL else "***",
+            "read_replica_url": MCPConfig.DATABASE_READ_URL.split("@")[-1] if MCPConfig.DATABASE_READ_URL else None,
             "mcp_port": MCPConfig.MCP_PORT,
             "dashboard_port": MCPConfig.DASHBOARD_PORT,
+            "db_pool": {
+                "mode": MCPConfig.DB_POOL_MODE,
+                "size": MCPConfig.DB_POOL_SIZE,
+                "max_overflow": MCPConfig.DB_MAX_OVERFLOW,
+                "timeout": MCPConfig.DB_POOL_TIMEOUT,
+                "recycle": MCPConfig.DB_POOL_RECYCLE,
+                "pre_ping": MCPConfig.DB_POOL_PRE_PING,
+                "connect_timeout": MCPConfig.DB_CONNECT_TIMEOUT
+            },
             "destructive_ops_enabled": MCPConfig.ENABLE_DESTRUCTIVE_OPS
         },
+        "startup": {
+            "db_ready": app_context.db_ready,
+            "startup_ms": app_context.startup_ms,
+            "warmed_connections": app_context.warmed_connections,
+            "db_version": app_context.reference.get("db_version"),
+            "airports": app_context.reference.get("airports"),
+            "main_app_import_ms": app_context.import_report
+        },
         "message": "Environment information retrieved successfully"
     }
@@ -0,0 +1,328 @@
+"""Bulk claim import from JSONL or CSV."""
+import asyncio
+import csv
+import io
+import time
+import uuid
+from datetime import datetime
+from typing import Dict, Any, Optional, List, Tuple
+import orjson
+from sqlalchemy import any_, bindparam, insert, select
+from sqlalchemy.dialects.postgresql import ARRAY
+from compensation import compensation_calculator
+from config import MCPConfig
+from database import get_db_session
+from jobs import report_progress
+from tools.claim_tools import CLAIM_STATUSES
+from tools.errors import error_response
+
+REQUIRED_FIELDS = (
+    "customer_id", "flight_number", "flight_date",
+    "departure_airport", "arrival_airport", "incident_type",
+)
+INCIDENT_TYPES = {"delay", "cancellation", "denied_boarding", "missed_connection"}
+IMPORT_METHODS = ("insert", "copy")
+
+
+def _parse_rows(text: str, fmt: str) -> List[Tuple[int, Optional[Dict[str, Any]], Optional[str]]]:
+    """Split input into (row number, fields, parse error) tuples."""
+    rows = []
+    if fmt == "csv":
+        reader = csv.DictReader(io.StringIO(text))
+        for number, record in enumerate(reader, 1):
+            fields = {key.strip(): (value or "").strip() or None for key, value in record.items() if key}
+            rows.append((number, fields, None))
+        return rows
+    
+    number = 0
+    for line in text.splitlines():
+        if not line.strip():
+            continue
+        number += 1
+        try:
+            record = orjson.loads(line)
+        except orjson.JSONDecodeError as e:
+            rows.append((number, None, f"invalid JSON: {e}"))
+            continue
+        if not isinstance(record, dict):
+            rows.append((number, None, "expected a JSON object"))
+            continue
+        rows.append((number, record, None))
+    return rows
+
+
+def _validate(record: Dict[str, Any]) -> Tuple[Optional[Dict[str, Any]], List[str]]:
+    """Check one row and convert it to claim column values (as create_claim does)."""
+    errors = [f"missing {name}" for name in REQUIRED_FIELDS if not record.get(name)]
+    if errors:
+        return None, errors
+    
+    try:
+        customer_id = str(uuid.UUID(str(record["customer_id"])))
+    except ValueError:
+        errors.append("customer_id is not a UUID")
+        customer_id = None
+    
+    try:
+        flight_date = datetime.strptime(str(record["flight_date"]), "%Y-%m-%d").date()
+    except ValueError:
+        errors.append("flight_date must be YYYY-MM-DD")
+        flight_date = None
+    
+    departure = str(record["departure_airport"]).strip().upper()
+    arrival = str(record["arrival_airport"]).strip().upper()
+    for label, code in (("departure_airport", departure), ("arrival_airport", arrival)):
+        if len(code) != 3 or not code.isalpha():
+            errors.append(f"{label} must be a 3-letter IATA code")
+    
+    incident_type = str(record["incident_type"]).strip()
+    if incident_type not in INCIDENT_TYPES:
+        errors.append(f"incident_type must be one of {sorted(INCIDENT_TYPES)}")
+    
+    delay_minutes = record.get("delay_minutes")
+    if delay_minutes is not None:
+        # JSON true would pass int() as 1 and 90.7 would be cut to 90
+        try:
+            if isinstance(delay_minutes, bool):
+                raise TypeError
+            if isinstance(delay_minutes, float):
+                if not delay_minutes.is_integer():
+                    raise ValueError
+                delay_minutes = int(delay_minutes)
+            elif isinstance(delay_minutes, str):
+                delay_minutes = int(delay_minutes)
+            elif not isinstance(delay_minutes, int):
+                raise TypeError
+            if delay_minutes < 0:
+                raise ValueError
+        except (TypeError, ValueError):
+            errors.append("delay_minutes must be a non-negative integer")
+    
+    status = record.get("status") or "submitted"
+    if not isinstance(status, str) or status not in CLAIM_STATUSES:
+        errors.append(f"status must be one of {sorted(CLAIM_STATUSES)}")
+    
+    description = record.get("description")
+    if description is not None and not isinstance(description, str):
+        errors.append("description must be a string")
+    
+    if errors:
+        return None, errors
+    
+    flight_number = str(record["flight_number"]).strip().upper()
+    return {
+        "customer_id": customer_id,
+        "flight_number": flight_number,
+        "airline": flight_number[:2] if len(flight_number) >= 2 else "Unknown",
+        "departure_date": flight_date,
+        "departure_airport": departure,
+        "arrival_airport": arrival,
+        "incident_type": incident_type,
+        "delay_hours": round(delay_minutes / 60, 2) if delay_minutes else None,
+        "notes": description,
+        "status": status,
+        "_delay_minutes": delay_minutes,
+    }, []
+
+
+async def _compute_compensation(rows: List[Dict[str, Any]]) -> int:
+    """Fill compensation_amount, looking up each distinct route/delay bucket/incident once."""
+    amounts: Dict[Tuple, Any] = {}
+    for row in rows:
+        delay_minutes = row.pop("_delay_minutes")
+        if not delay_minutes:
+            row["compensation_amount"] = None
+            continue
+        key = (
+            row["departure_airport"], row["arrival_airport"],
+            compensation_calculator.bucket(delay_minutes), row["incident_type"]
+        )
+        if key not in amounts:
+            try:
+                amounts[key] = await compensation_calculator.calculate(
+                    departure_iata=key[0],
+                    arrival_iata=key[1],
+                    delay_minutes=key[2],
+                    incident_type=key[3]
+                )
+            except Exception:
+                # As in create_claim, the claim is still created without an amount
+                amounts[key] = None
+        row["compensation_amount"] = amounts[key]
+    return len(amounts)
+
+
+def _copy_columns(model, rows: List[Dict[str, Any]]) -> Tuple[List[str], List[tuple]]:
+    """Map attribute rows to column records for COPY.
+    
+    COPY bypasses SQLAlchemy, so Python-side column defaults (e.g. a uuid4
+    primary key) are evaluated here; server defaults still apply in Postgres.
+    """
+    table = model.__table__
+    mapper = model.__mapper__
+    columns = {mapper.attrs[key].columns[0].name: key for key in rows[0]}
+    defaults = {
+        column.name: column.default
+        for column in table.columns
+        if column.name not in columns and column.default is not None
+        and (column.default.is_scalar or column.default.is_callable)
+    }
+    names = list(columns) + list(defaults)
+    records = []
+    for row in rows:
+        values = [row[key] for key in columns.values()]
+        for default in defaults.values():
+            values.append(default.arg if default.is_scalar else default.arg(None))
+        records.append(tuple(values))
+    return names, records
+
+
+def _read_file(file_path: str) -> str:
+    with open(file_path, encoding="utf-8-sig") as f:
+        return f.read()
+
+
+def _detect_format(file_path: Optional[str], data: str) -> str:
+    if file_path:
+        extension = file_path.rsplit(".", 1)[-1].lower()
+        if extension in ("jsonl", "ndjson", "json"):
+            return "jsonl"
+        if extension == "csv":
+            return "csv"
+    return "jsonl" if data.lstrip().startswith("{") else "csv"
+
+
+async def import_claims(
+    data: Optional[str] = None,
+    file_path: Optional[str] = None,
+    data_format: Optional[str] = None,
+    method: str = "insert"
+) -> Dict[str, Any]:
+    """Bulk import claims from JSONL or CSV.
+    
+    Rows use the create_claim fields: customer_id, flight_number, flight_date,
+    departure_airport, arrival_airport, incident_type, and optionally
+    delay_minutes, description and status. Invalid rows are skipped and
+    reported; valid rows are loaded in chunks within one transaction.
+    
+    Args:
+        data: Inline JSONL or CSV content (optional if file_path is given)
+        file_path: Path of a local JSONL or CSV file (optional)
+        data_format: "jsonl" or "csv" (default: from the file extension or content)
+        method: "insert" (executemany, applies model defaults) or "copy" (COPY)
+    
+    Returns:
+        Imported/failed counts, per-row errors and rows per second
+    """
+    from app.models import Claim, Customer
+    
+    if (data is None) == (file_path is None):
+        return {
+            "success": False,
+            "message": "Provide exactly one of data or file_path"
+        }
+    if method not in IMPORT_METHODS:
+        return {
+            "success": False,
+            "message": f"method must be one of {list(IMPORT_METHODS)}"
+        }
+    
+    started = time.perf_counter()
+    
+    try:
+        if file_path is not None:
+            data = await asyncio.to_thread(_read_file, file_path)
+        fmt = (data_format or _detect_format(file_path, data)).lower()
+        if fmt not in ("jsonl", "csv"):
+            return {
+                "success": False,
+                "message": f"Unsupported format: {fmt} (use jsonl or csv)"
+            }
+        
+        parsed = _parse_rows(data, fmt)
+        if len(parsed) > MCPConfig.BULK_IMPORT_MAX_ROWS:
+            return {
+                "success": False,
+                "message": f"Too many rows: {len(parsed)} (max {MCPConfig.BULK_IMPORT_MAX_ROWS})"
+            }
+        
+        errors: List[Dict[str, Any]] = []
+        valid: List[Tuple[int, Dict[str, Any]]] = []
+        for number, record, parse_error in parsed:
+            if parse_error:
+                errors.append({"row": number, "errors": [parse_error]})
+                continue
+            row, row_errors = _validate(record)
+            if row_errors:
+                errors.append({"row": number, "errors": row_errors})
+            else:
+                valid.append((number, row))
+        
+        imported = 0
+        compensation_lookups = 0
+        load_seconds = 0.0
+        
+        async with get_db_session("import_claims") as session:
+            # Reject rows whose customer does not exist instead of failing the whole load
+            customer_ids = list({row["customer_id"] for _, row in valid})
+            existing = set()
+            if customer_ids:
+                result = await session.execute(
+                    select(Customer.id).where(
+                        Customer.id == any_(bindparam("ids", customer_ids, type_=ARRAY(Customer.id.type)))
+                    )
+                )
+                existing = {str(customer_id) for customer_id in result.scalars()}
+            rows = []
+            for number, row in valid:
+                if row["customer_id"] in existing:
+                    rows.append(row)
+                else:
+                    errors.append({"row": number, "errors": [f"customer not found: {row['customer_id']}"]})
+            
+            compensation_lookups = await _compute_compensation(rows) if rows else 0
+            
+            load_started = time.perf_counter()
+            chunk_size = MCPConfig.BULK_IMPORT_CHUNK_SIZE
+            for start in range(0, len(rows), chunk_size):
+                chunk = rows[start:start + chunk_size]
+                if method == "copy":
+                    columns, records = _copy_columns(Claim, chunk)
+                    connection = await session.connection()
+                    raw = await connection.get_raw_connection()
+                    await raw.driver_connection.copy_records_to_table(
+                        Claim.__table__.name,
+                        schema_name=Claim.__table__.schema,
+                        columns=columns,
+                        records=records
+                    )
+                else:
+                    await session.execute(insert(Claim), chunk)
+                imported += len(chunk)
+                await report_progress(imported, len(rows), f"Loaded {imported} of {len(rows)} claims")
+            
+            await session.commit()
+            load_seconds = time.perf_counter() - load_started
+        
+        elapsed = time.perf_counter() - started
+        errors.sort(key=lambda error: error["row"])
+        max_errors = MCPConfig.BULK_IMPORT_MAX_ERRORS
+        
+        return {
+            "success": True,
+            "format": fmt,
+            "method": method,
+            "rows_total": len(parsed),
+            "imported": imported,
+            "failed": len(errors),
+            "errors": errors[:max_errors],
+            "errors_truncated": len(errors) > max_errors,
+            "compensation_lookups": compensation_lookups,
+            "elapsed_ms": round(elapsed * 1000, 2),
+            "rows_per_second": round(imported / elapsed, 1) if elapsed else None,
+            "load_rows_per_second": round(imported / load_seconds, 1) if load_seconds else None,
+            "message": f"Imported {imported} of {len(parsed)} claims ({len(errors)} failed)"
+        }
+    except Exception as e:
+        return error_response(e, "Failed to import claims")
+
@@ -0,0 +1,85 @@
+"""Background job tools (poll, list, cancel)."""
+from typing import Dict, Any, Optional
+from config import MCPConfig
+from jobs import job_runner
+
+
+async def get_job(job_id: str, wait_seconds: float = 0) -> Dict[str, Any]:
+    """Get the status, progress and result of a background job.
+    
+    Args:
+        job_id: Job ID returned when the job was submitted
+        wait_seconds: Wait up to this long for the job to finish (default: 0)
+    
+    Returns:
+        Job status, progress and, once finished, the tool result
+    """
+    job = job_runner.get(job_id)
+    if not job:
+        return {
+            "success": False,
+            "message": f"Job not found: {job_id}"
+        }
+    
+    if wait_seconds > 0:
+        await job_runner.wait(job, min(wait_seconds, MCPConfig.JOB_MAX_WAIT))
+    
+    return {
+        "success": True,
+        "job": job.snapshot(),
+        "message": f"Job {job.status}"
+    }
+
+
+async def list_jobs(status: Optional[str] = None, limit: int = 20) -> Dict[str, Any]:
+    """List recent background jobs.
+    
+    Args:
+        status: Filter by status (queued, running, succeeded, failed, cancelled)
+        limit: Number of results (default: 20)
+    
+    Returns:
+        Most recent jobs first, without their results
+    """
+    jobs = job_runner.list(status=status, limit=limit)
+    
+    return {
+        "success": True,
+        "count": len(jobs),
+        "counts": job_runner.counts(),
+        "jobs": [job.snapshot(include_result=False) for job in jobs],
+        "message": f"Retrieved {len(jobs)} jobs"
+    }
+
+
+async def cancel_job(job_id: str) -> Dict[str, Any]:
+    """Cancel a queued or running background job.
+    
+    Args:
+        job_id: Job ID
+    
+    Returns:
+        Cancellation status
+    """
+    job = job_runner.get(job_id)
+    if not job:
+        return {
+            "success": False,
+            "message": f"Job not found: {job_id}"
+        }
+    
+    previous_status = job.status
+    if not job_runner.cancel(job):
+        return {
+            "success": False,
+            "job_id": job_id,
+            "status": job.status,
+            "message": f"Job already {job.status}"
+        }
+    
+    return {
+        "success": True,
+        "job_id": job_id,
+        "previous_status": previous_status,
+        "message": f"Cancellation requested for {previous_status} job {job_id}"
+    }
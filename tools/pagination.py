@@ -0,0 +1,90 @@
+"""Keyset (cursor) pagination for list tools.
+
+Lists are ordered by a timestamp column descending with the row ID as tie
+breaker. A cursor encodes the (timestamp, id) of the last row returned, so
+the next page is a range scan on an index over (timestamp, id) instead of
+counting past `offset` rows, and rows inserted meanwhile cause no
+duplicates or gaps.
+"""
+import base64
+import binascii
+from datetime import datetime
+from typing import Any, List, Optional, Sequence, Tuple
+
+import orjson
+from sqlalchemy import and_, literal, or_, tuple_
+
+
+class InvalidCursor(ValueError):
+    """A cursor could not be decoded or belongs to another list."""
+
+
+def encode_cursor(scope: str, sort_value: Optional[datetime], row_id: Any) -> str:
+    """Build the opaque cursor pointing after a row."""
+    payload = orjson.dumps([scope, sort_value, str(row_id)])
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(scope: str, cursor: str) -> Tuple[Optional[datetime], str]:
+    """Decode a cursor built by encode_cursor for the same list."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cursor_scope, sort_value, row_id = orjson.loads(base64.urlsafe_b64decode(padded))
+        if sort_value is not None:
+            sort_value = datetime.fromisoformat(sort_value)
+    except (binascii.Error, orjson.JSONDecodeError, TypeError, ValueError):
+        raise InvalidCursor("Invalid cursor") from None
+    if cursor_scope != scope:
+        raise InvalidCursor(f"Cursor belongs to {cursor_scope}, not {scope}")
+    return sort_value, row_id
+
+
+def keyset_query(
+    query,
+    scope: str,
+    sort_column,
+    id_column,
+    limit: int,
+    offset: int = 0,
+    cursor: Optional[str] = None
+):
+    """Order, position and limit a list query.
+    
+    With a cursor the page starts after the cursor row (offset is ignored);
+    otherwise `offset` rows are skipped as before. One extra row is fetched
+    so next_page can tell whether another page exists.
+    
+    Order is DESC with NULL timestamps first (the PostgreSQL default), which
+    matches a backward scan of a plain (sort_column, id) index.
+    """
+    query = query.order_by(sort_column.desc(), id_column.desc())
+    
+    if cursor:
+        sort_value, row_id = decode_cursor(scope, cursor)
+        if sort_value is None:
+            query = query.where(or_(
+                and_(sort_column.is_(None), id_column < row_id),
+                sort_column.is_not(None)
+            ))
+        else:
+            query = query.where(tuple_(sort_column, id_column) < tuple_(
+                literal(sort_value, sort_column.type), literal(row_id, id_column.type)
+            ))
+    elif offset:
+        query = query.offset(offset)
+    
+    return query.limit(limit + 1)
+
+
+def next_page(
+    rows: Sequence[Any],
+    scope: str,
+    sort_attr: str,
+    limit: int
+) -> Tuple[List[Any], Optional[str]]:
+    """Trim the extra row fetched by keyset_query and build the next cursor."""
+    page = list(rows[:limit])
+    if len(rows) <= limit or not page:
+        return page, None
+    last = page[-1]
+    return page, encode_cursor(scope, getattr(last, sort_attr), last.id)
@@ -0,0 +1,296 @@
+"""Claim search: flight number prefix/fuzzy matching and full-text search.
+
+Flight numbers are matched by prefix (ILIKE) and, when the pg_trgm extension
+is installed, by trigram similarity. Free text is matched against the claim
+description and its admin notes with PostgreSQL full-text search using the
+"simple" configuration (no stemming, so it works for any language).
+
+create_search_indexes builds the GIN indexes that back these predicates.
+search_claims works without them, but falls back to sequential scans.
+"""
+import time
+from typing import Dict, Any, List, Optional, Tuple
+from sqlalchemy import case, func, literal, literal_column, or_, select, text, union
+from sqlalchemy.exc import DBAPIError
+from config import MCPConfig
+from database import get_autocommit_connection, get_read_session
+from jobs import report_progress
+from tools.errors import error_response
+
+TEXT_SEARCH_CONFIG = "simple"
+
+# Extension and index presence, looked up at most every SEARCH_CAPABILITIES_TTL_SECONDS
+# (create_search_indexes resets it)
+_capabilities: Optional[Dict[str, Any]] = None
+_capabilities_checked_at = 0.0
+
+
+def _search_indexes() -> List[Tuple[str, str, bool]]:
+    """(index name, CREATE INDEX statement, needs pg_trgm) for claim search.
+    
+    The expressions must stay identical to _document() so the planner can
+    match them.
+    """
+    from app.models import Claim, ClaimNote
+    
+    claims = Claim.__table__
+    notes = ClaimNote.__table__
+    return [
+        (
+            f"ix_{claims.name}_flight_number_trgm",
+            f"ON {claims.fullname} USING gin (flight_number gin_trgm_ops)",
+            True
+        ),
+        (
+            f"ix_{claims.name}_notes_fts",
+            f"ON {claims.fullname} USING gin "
+            f"(to_tsvector('{TEXT_SEARCH_CONFIG}'::regconfig, coalesce(notes, '')))",
+            False
+        ),
+        (
+            f"ix_{notes.name}_note_fts",
+            f"ON {notes.fullname} USING gin "
+            f"(to_tsvector('{TEXT_SEARCH_CONFIG}'::regconfig, coalesce(note, '')))",
+            False
+        ),
+    ]
+
+
+async def _index_validity(conn, names: List[str]) -> Dict[str, bool]:
+    """Map existing index names to whether they are valid (a failed
+    CREATE INDEX CONCURRENTLY leaves an invalid index behind)."""
+    result = await conn.execute(
+        text(
+            "SELECT c.relname, i.indisvalid FROM pg_index i "
+            "JOIN pg_class c ON c.oid = i.indexrelid WHERE c.relname = ANY(:names)"
+        ),
+        {"names": names}
+    )
+    return {name: valid for name, valid in result.all()}
+
+
+async def _search_capabilities(session) -> Dict[str, Any]:
+    """Whether fuzzy matching is available and which search indexes are missing."""
+    global _capabilities, _capabilities_checked_at
+    
+    expired = time.monotonic() - _capabilities_checked_at >= MCPConfig.SEARCH_CAPABILITIES_TTL_SECONDS
+    if _capabilities is None or expired:
+        result = await session.execute(
+            text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+        )
+        fuzzy = result.scalar() is not None
+        names = [name for name, _, _ in _search_indexes()]
+        validity = await _index_validity(session, names)
+        _capabilities = {
+            "fuzzy": fuzzy,
+            "missing_indexes": [name for name in names if not validity.get(name)],
+        }
+        _capabilities_checked_at = time.monotonic()
+    return _capabilities
+
+
+def _regconfig():
+    return literal_column(f"'{TEXT_SEARCH_CONFIG}'::regconfig")
+
+
+def _document(column):
+    """tsvector of a text column, as indexed by create_search_indexes."""
+    return func.to_tsvector(_regconfig(), func.coalesce(column, literal_column("''")))
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+async def search_claims(
+    query: Optional[str] = None,
+    flight_number: Optional[str] = None,
+    airline: Optional[str] = None,
+    departure_airport: Optional[str] = None,
+    arrival_airport: Optional[str] = None,
+    status: Optional[str] = None,
+    limit: int = 20,
+    use_primary: bool = False
+) -> Dict[str, Any]:
+    """Search claims by flight number, route, airline and free text.
+    
+    Results are ranked by relevance: flight number prefix matches score 1,
+    fuzzy matches their trigram similarity, and text matches add their
+    ts_rank over the description and notes. Ties are broken by newest first.
+    
+    Args:
+        query: Words to find in the claim description or notes (web search
+            syntax: "quoted phrase", -excluded, or) (optional)
+        flight_number: Flight number prefix, or approximate flight number
+            when pg_trgm is installed (optional)
+        airline: Airline code (optional)
+        departure_airport: Departure airport IATA code (optional)
+        arrival_airport: Arrival airport IATA code (optional)
+        status: Claim status (optional)
+        limit: Number of results (default: 20, max SEARCH_MAX_RESULTS)
+        use_primary: Read from the primary instead of the read replica (optional)
+    
+    Returns:
+        Ranked claims with their scores, query latency and index availability
+    """
+    from app.models import Claim, ClaimNote
+    
+    if not any((query, flight_number, airline, departure_airport, arrival_airport)):
+        return {
+            "success": False,
+            "message": "Provide at least one of query, flight_number, airline, departure_airport or arrival_airport"
+        }
+    limit = max(1, min(limit, MCPConfig.SEARCH_MAX_RESULTS))
+    
+    try:
+        async with get_read_session("search_claims", use_primary=use_primary) as session:
+            capabilities = await _search_capabilities(session)
+            started = time.perf_counter()
+            
+            stmt = select(Claim)
+            scores = []
+            
+            if flight_number:
+                value = flight_number.strip().upper()
+                prefix = Claim.flight_number.ilike(_escape_like(value) + "%", escape="\\")
+                if capabilities["fuzzy"]:
+                    stmt = stmt.where(or_(prefix, Claim.flight_number.op("%")(value)))
+                    scores.append(case((prefix, 1.0), else_=func.similarity(Claim.flight_number, value)))
+                else:
+                    stmt = stmt.where(prefix)
+                    scores.append(literal(1.0))
+            
+            if query:
+                tsquery = func.websearch_to_tsquery(_regconfig(), query)
+                claim_document = _document(Claim.notes)
+                note_document = _document(ClaimNote.note)
+                # A union of both index scans instead of an OR, so each side can use its GIN index
+                matches = union(
+                    select(Claim.id).where(claim_document.op("@@")(tsquery)),
+                    select(ClaimNote.claim_id).where(note_document.op("@@")(tsquery))
+                )
+                # Best note rank per claim, aggregated once rather than per result row
+                note_ranks = (
+                    select(ClaimNote.claim_id, func.max(func.ts_rank(note_document, tsquery)).label("rank"))
+                    .where(note_document.op("@@")(tsquery))
+                    .group_by(ClaimNote.claim_id)
+                    .subquery()
+                )
+                stmt = (
+                    stmt.outerjoin(note_ranks, note_ranks.c.claim_id == Claim.id)
+                    .where(Claim.id.in_(matches))
+                )
+                scores.append(func.ts_rank(claim_document, tsquery) + func.coalesce(note_ranks.c.rank, 0))
+            
+            if airline:
+                stmt = stmt.where(Claim.airline == airline.strip().upper())
+            if departure_airport:
+                stmt = stmt.where(Claim.departure_airport == departure_airport.strip().upper())
+            if arrival_airport:
+                stmt = stmt.where(Claim.arrival_airport == arrival_airport.strip().upper())
+            if status:
+                stmt = stmt.where(Claim.status == status)
+            
+            score = literal(0.0)
+            for component in scores:
+                score = score + component
+            score = score.label("score")
+            
+            stmt = (
+                stmt.add_columns(score)
+                .order_by(score.desc(), Claim.submitted_at.desc(), Claim.id.desc())
+                .limit(limit)
+            )
+            result = await session.execute(stmt)
+            rows = result.all()
+            elapsed_ms = round((time.perf_counter() - started) * 1000, 2)
+            
+            response = {
+                "success": True,
+                "count": len(rows),
+                "claims": [
+                    {
+                        "id": c.id,
+                        "customer_id": c.customer_id,
+                        "flight_number": c.flight_number,
+                        "airline": c.airline,
+                        "flight_date": c.departure_date,
+                        "departure_airport": c.departure_airport,
+                        "arrival_airport": c.arrival_airport,
+                        "incident_type": c.incident_type,
+                        "status": c.status,
+                        "compensation_amount": c.compensation_amount,
+                        "submitted_at": c.submitted_at,
+                        "score": round(float(s), 4)
+                    }
+                    for c, s in rows
+                ],
+                "elapsed_ms": elapsed_ms,
+                "fuzzy_matching": capabilities["fuzzy"],
+                "missing_indexes": capabilities["missing_indexes"],
+                "message": f"Found {len(rows)} claims in {elapsed_ms} ms"
+            }
+            if capabilities["missing_indexes"]:
+                response["hint"] = "Run create_search_indexes to index flight numbers and notes"
+            return response
+    except Exception as e:
+        return error_response(e, "Failed to search claims")
+
+
+async def create_search_indexes() -> Dict[str, Any]:
+    """Create the pg_trgm extension and the GIN indexes used by search_claims.
+    
+    Indexes are built with CREATE INDEX CONCURRENTLY so claims stay writable;
+    existing valid indexes are kept and invalid leftovers of an interrupted
+    build are rebuilt. The trigram index is skipped if pg_trgm cannot be
+    installed (search_claims then uses prefix matching only).
+    
+    Returns:
+        Created, existing and skipped indexes with build times
+    """
+    global _capabilities
+    
+    indexes = _search_indexes()
+    created: List[Dict[str, Any]] = []
+    existing: List[str] = []
+    skipped: List[Dict[str, str]] = []
+    
+    try:
+        async with get_autocommit_connection("create_search_indexes") as conn:
+            fuzzy = True
+            try:
+                await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+            except DBAPIError as e:
+                fuzzy = False
+                extension_error = str(e.orig)
+            
+            validity = await _index_validity(conn, [name for name, _, _ in indexes])
+            for number, (name, definition, needs_trgm) in enumerate(indexes, 1):
+                if validity.get(name):
+                    existing.append(name)
+                elif needs_trgm and not fuzzy:
+                    skipped.append({"index": name, "reason": f"pg_trgm unavailable: {extension_error}"})
+                else:
+                    started = time.perf_counter()
+                    if name in validity:
+                        await conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {name}"))
+                    await conn.execute(text(f"CREATE INDEX CONCURRENTLY {name} {definition}"))
+                    created.append({
+                        "index": name,
+                        "elapsed_ms": round((time.perf_counter() - started) * 1000, 2)
+                    })
+                await report_progress(number, len(indexes), f"Checked {number} of {len(indexes)} indexes")
+        
+        _capabilities = None
+        
+        return {
+            "success": True,
+            "fuzzy_matching": fuzzy,
+            "created": created,
+            "existing": existing,
+            "skipped": skipped,
+            "message": f"Created {len(created)} search indexes ({len(existing)} already existed, {len(skipped)} skipped)"
+        }
+    except Exception as e:
+        _capabilities = None
+        return error_response(e, "Failed to create search indexes")
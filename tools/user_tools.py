@@ -1,9 +1,11 @@
 """User and admin management tools."""
 from typing import Dict, Any, Optional, List
 from sqlalchemy import select
-from database import get_db_session
-from app.models import Customer
-from app.repositories import CustomerRepository
+from cache import CLAIM, CUSTOMER, FILE, USER, cached, result_cache
+from database import get_db_session, get_read_session
+from tools.batch import get_many
+from tools.errors import error_response
+from tools.pagination import keyset_query, next_page
 # from app.services.password_service import PasswordService
 
 
@@ -26,8 +28,10 @@ async def create_user(
     Returns:
         Created user details
     """
+    from app.repositories import CustomerRepository
+    
     try:
-        async with get_db_session() as session:
+        async with get_db_session("create_user") as session:
             customer_repo = CustomerRepository(session)
             
             # Hash password
@@ -48,18 +52,14 @@ async def create_user(
             
             return {
                 "success": True,
-                "user_id": str(customer.id),
+                "user_id": customer.id,
                 "email": customer.email,
                 "role": customer.role,
                 "name": f"{customer.first_name} {customer.last_name}",
                 "message": f"User created successfully: {email}"
             }
     except Exception as e:
-        return {
-            "success": False,
-            "error": str(e),
-            "message": "Failed to create user"
-        }
+        return error_response(e, "Failed to create user")
 
 
 async def create_admin(
@@ -88,17 +88,36 @@ async def create_admin(
     )
 
 
-async def get_user(user_id: str) -> Dict[str, Any]:
+def _user_details(customer) -> Dict[str, Any]:
+    """Serialize a user for get_user/get_users."""
+    return {
+        "id": customer.id,
+        "email": customer.email,
+        "first_name": customer.first_name,
+        "last_name": customer.last_name,
+        "role": customer.role,
+        "is_email_verified": customer.is_email_verified,
+        "is_active": customer.is_active,
+        "created_at": customer.created_at,
+        "last_login_at": customer.last_login_at
+    }
+
+
+@cached(USER, "user_id")
+async def get_user(user_id: str, use_primary: bool = False) -> Dict[str, Any]:
     """Get user by ID.
     
     Args:
         user_id: User ID (UUID)
+        use_primary: Read from the primary instead of the read replica (optional)
     
     Returns:
         User details
     """
+    from app.repositories import CustomerRepository
+    
     try:
-        async with get_db_session() as session:
+        async with get_read_session("get_user", use_primary=use_primary) as session:
             customer_repo = CustomerRepository(session)
             customer = await customer_repo.get_by_id(user_id)
             
@@ -110,38 +129,42 @@ async def get_user(user_id: str) -> Dict[str, Any]:
             
             return {
                 "success": True,
-                "user": {
-                    "id": str(customer.id),
-                    "email": customer.email,
-                    "first_name": customer.first_name,
-                    "last_name": customer.last_name,
-                    "role": customer.role,
-                    "is_email_verified": customer.is_email_verified,
-                    "is_active": customer.is_active,
-                    "created_at": customer.created_at.isoformat() if customer.created_at else None,
-                    "last_login_at": customer.last_login_at.isoformat() if customer.last_login_at else None
-                },
+                "user": _user_details(customer),
                 "message": "User retrieved successfully"
             }
     except Exception as e:
-        return {
-            "success": False,
-            "error": str(e),
-            "message": "Failed to retrieve user"
-        }
+        return error_response(e, "Failed to retrieve user")
+
+
+async def get_users(user_ids: List[str], use_primary: bool = False) -> Dict[str, Any]:
+    """Get many users by ID with one query.
+    
+    Args:
+        user_ids: User IDs (UUIDs, up to BATCH_GET_MAX_IDS)
+        use_primary: Read from the primary instead of the read replica (optional)
+    
+    Returns:
+        User details (same fields as get_user), missing and invalid IDs
+    """
+    from app.models import Customer
+    
+    return await get_many("get_users", Customer, user_ids, _user_details, "users", use_primary)
 
 
-async def get_user_by_email(email: str) -> Dict[str, Any]:
+async def get_user_by_email(email: str, use_primary: bool = False) -> Dict[str, Any]:
     """Get user by email address.
     
     Args:
         email: User email
+        use_primary: Read from the primary instead of the read replica (optional)
     
     Returns:
         User details or not found
     """
+    from app.repositories import CustomerRepository
+    
     try:
-        async with get_db_session() as session:
+        async with get_read_session("get_user_by_email", use_primary=use_primary) as session:
             customer_repo = CustomerRepository(session)
             customer = await customer_repo.get_by_email(email)
             
@@ -156,29 +179,27 @@ async def get_user_by_email(email: str) -> Dict[str, Any]:
                 "success": True,
                 "found": True,
                 "user": {
-                    "id": str(customer.id),
+                    "id": customer.id,
                     "email": customer.email,
                     "first_name": customer.first_name,
                     "last_name": customer.last_name,
                     "role": customer.role,
                     "is_email_verified": customer.is_email_verified,
                     "is_active": customer.is_active,
-                    "created_at": customer.created_at.isoformat() if customer.created_at else None
+                    "created_at": customer.created_at
                 },
                 "message": f"User found: {customer.first_name} {customer.last_name}"
             }
     except Exception as e:
-        return {
-            "success": False,
-            "error": str(e),
-            "message": "Failed to search for user"
-        }
+        return error_response(e, "Failed to search for user")
 
 
 async def list_users(
     role: Optional[str] = None,
     limit: int = 10,
-    offset: int = 0
+    offset: int = 0,
+    cursor: Optional[str] = None,
+    use_primary: bool = False
 ) -> Dict[str, Any]:
     """List users with optional role filter.
     
@@ -186,21 +207,27 @@ async def list_users(
         role: Filter by role (customer, admin, support)
         limit: Number of results (default: 10)
         offset: Number to skip (default: 0)
+        cursor: next_cursor from the previous page (optional, replaces offset)
+        use_primary: Read from the primary instead of the read replica (optional)
     
     Returns:
-        List of users
+        List of users and the cursor of the next page
     """
+    from app.models import Customer
+    
     try:
-        async with get_db_session() as session:
-            query = select(Customer).order_by(Customer.created_at.desc())
+        async with get_read_session("list_users", use_primary=use_primary) as session:
+            query = select(Customer)
             
             if role:
                 query = query.where(Customer.role == role)
             
-            query = query.limit(limit).offset(offset)
+            query = keyset_query(
+                query, "list_users", Customer.created_at, Customer.id, limit, offset, cursor
+            )
             
             result = await session.execute(query)
-            users = result.scalars().all()
+            users, next_cursor = next_page(result.scalars().all(), "list_users", "created_at", limit)
             
             return {
                 "success": True,
@@ -208,23 +235,20 @@ async def list_users(
                 "role_filter": role,
                 "users": [
                     {
-                        "id": str(u.id),
+                        "id": u.id,
                         "email": u.email,
                         "name": f"{u.first_name} {u.last_name}",
                         "role": u.role,
                         "is_active": u.is_active,
-                        "created_at": u.created_at.isoformat() if u.created_at else None
+                        "created_at": u.created_at
                     }
                     for u in users
                 ],
+                "next_cursor": next_cursor,
                 "message": f"Retrieved {len(users)} users"
             }
     except Exception as e:
-        return {
-            "success": False,
-            "error": str(e),
-            "message": "Failed to list users"
-        }
+        return error_response(e, "Failed to list users")
 
 
 async def update_user(
@@ -250,8 +274,10 @@ async def update_user(
     Returns:
         Updated user details
     """
+    from app.repositories import CustomerRepository
+    
     try:
-        async with get_db_session() as session:
+        async with get_db_session("update_user") as session:
             customer_repo = CustomerRepository(session)
             customer = await customer_repo.get_by_id(user_id)
             
@@ -276,10 +302,12 @@ async def update_user(
                 customer.is_email_verified = is_email_verified
             
             await session.commit()
+            result_cache.invalidate(USER, user_id)
+            result_cache.invalidate(CUSTOMER, user_id)
             
             return {
                 "success": True,
-                "user_id": str(customer.id),
+                "user_id": customer.id,
                 "email": customer.email,
                 "name": f"{customer.first_name} {customer.last_name}",
                 "role": customer.role,
@@ -287,11 +315,7 @@ async def update_user(
                 "message": "User updated successfully"
             }
     except Exception as e:
-        return {
-            "success": False,
-            "error": str(e),
-            "message": "Failed to update user"
-        }
+        return error_response(e, "Failed to update user")
 
 
 async def delete_user(user_id: str) -> Dict[str, Any]:
@@ -303,8 +327,10 @@ async def delete_user(user_id: str) -> Dict[str, Any]:
     Returns:
         Deletion status
     """
+    from app.repositories import CustomerRepository
+    
     try:
-        async with get_db_session() as session:
+        async with get_db_session("delete_user") as session:
             customer_repo = CustomerRepository(session)
             customer = await customer_repo.get_by_id(user_id)
             
@@ -318,6 +344,12 @@ async def delete_user(user_id: str) -> Dict[str, Any]:
             await customer_repo.delete(user_id)
             await session.commit()
             
+            # Users and customers share a table; claims and files may cascade
+            result_cache.invalidate(USER, user_id)
+            result_cache.invalidate(CUSTOMER, user_id)
+            result_cache.invalidate_entity(CLAIM)
+            result_cache.invalidate_entity(FILE)
+            
             return {
                 "success": True,
                 "user_id": user_id,
@@ -325,11 +357,7 @@ async def delete_user(user_id: str) -> Dict[str, Any]:
                 "message": f"User deleted: {email}"
             }
     except Exception as e:
-        return {
-            "success": False,
-            "error": str(e),
-            "message": "Failed to delete user"
-        }
+        return error_response(e, "Failed to delete user")
 
 
 async def activate_user(user_id: str) -> Dict[str, Any]: